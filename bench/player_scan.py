@@ -0,0 +1,104 @@
+"""Single-player scan latency against league size.
+
+Builds a synthetic league at each size and times "regular season,
+2024-2025, one pitcher" lookups three ways:
+
+    flat     one unsorted Parquet file (every lookup scans everything)
+    store    PitchStore as appended (season/game_type/bucket partitions,
+             each append sorted by player and date)
+    compact  the same store after compact() (one sorted file per partition)
+
+The number of pitches per pitcher is held fixed, so a larger league means
+more pitchers. With partition pruning plus row-group min/max skipping
+the store lookups should stay roughly flat while ``flat`` grows with the
+league. Results are appended to bench_output.txt like bench.run.
+
+    python -m bench.player_scan --rows 1000000 3000000 10000000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import duckdb
+import numpy as np
+
+from bench.run import OUTPUT, git_commit, record
+from bench.synthetic import synthetic_statcast
+from statcast_tools.store import PitchStore
+
+PITCHES_PER_PITCHER = 1_500  # over the three synthetic seasons
+
+
+def _time_lookups(fn, players, repeat):
+    fn(players[0])  # warm the metadata / file-handle caches once
+    times = []
+    for _ in range(repeat):
+        for p in players:
+            start = time.perf_counter()
+            fn(p)
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def run(rows=(1_000_000, 3_000_000), lookups=20, repeat=3, seed=0):
+    meta = {'commit': git_commit(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'seed': seed}
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in rows:
+        raw = synthetic_statcast(n, seed=seed, n_pitchers=max(1, n // PITCHES_PER_PITCHER))
+        players = rng.choice(raw['pitcher'].unique(), size=lookups, replace=False)
+        with tempfile.TemporaryDirectory() as tmp:
+            con = duckdb.connect()
+            flat = os.path.join(tmp, 'flat.parquet')
+            con.register('_raw', raw)
+            con.execute(f"COPY _raw TO '{flat}' (FORMAT parquet, COMPRESSION zstd)")
+            con.unregister('_raw')
+
+            store = PitchStore(os.path.join(tmp, 'store'), key='pitcher')
+            for season in sorted(raw['season'].unique()):
+                store.write(raw[raw['season'] == season])
+
+            def flat_lookup(p):
+                return con.execute(f"""
+                    SELECT * FROM read_parquet('{flat}')
+                    WHERE season IN (2024, 2025) AND game_type = 'R' AND pitcher = {int(p)}
+                """).df()
+
+            def store_lookup(p):
+                return store.scan([2024, 2025], ['R'], [int(p)])
+
+            variants = [('flat', flat_lookup), ('store', store_lookup)]
+            timings = {name: _time_lookups(fn, players, repeat) for name, fn in variants}
+            store.compact()
+            timings['compact'] = _time_lookups(store_lookup, players, repeat)
+            con.close()
+            shutil.rmtree(os.path.join(tmp, 'store'), ignore_errors=True)
+
+        print(f'\n=== {n:,} rows, {raw["pitcher"].nunique():,} pitchers ===')
+        for name, times in timings.items():
+            median = float(np.median(times))
+            results.append({**meta, 'rows': n, 'stage': f'player_scan_{name}', 'seconds': median,
+                            'p95_seconds': float(np.percentile(times, 95)), 'lookups': len(times)})
+            print(f'  {name:<8} median {median * 1000:8.1f} ms   p95 {np.percentile(times, 95) * 1000:8.1f} ms')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Per-player scan latency vs league size.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000_000, 3_000_000])
+    parser.add_argument('--lookups', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=OUTPUT)
+    parser.add_argument('--no-record', action='store_true')
+    args = parser.parse_args(argv)
+    results = run(args.rows, args.lookups, args.repeat, args.seed)
+    if not args.no_record:
+        record(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+"""Stage benchmarks on synthetic Statcast data.
+
+Runs the pipeline stages the analysis scripts are built from (load,
+period tagging, count columns, arsenal, TTO, whiff, cube, game rollup,
+plotting) against seeded synthetic pitches at several sizes, fully
+offline. Each run appends one JSON line per (size, stage) to
+bench_output.txt with the git commit, so a change in timing between
+commits shows up in ``--compare``.
+
+    python -m bench.run                       # 10k, 100k, 1M
+    python -m bench.run --rows 10000000 --repeat 1
+    python -m bench.run --stages tto cube --compare
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import duckdb
+import matplotlib
+import numpy as np
+
+matplotlib.use('Agg')  # headless; imported up front so the plot stage does not time the import
+import matplotlib.pyplot as plt  # noqa: E402
+
+from bench.synthetic import synthetic_statcast
+from statcast_tools.counts import add_count_columns
+from statcast_tools.cube import PitchCube
+from statcast_tools.raster import dense_scatter
+from statcast_tools.rollup import GameRollup
+from statcast_tools.sql import IS_SWING, IS_WHIFF
+
+DEFAULT_ROWS = (10_000, 100_000, 1_000_000)
+OUTPUT = 'bench_output.txt'
+SPLIT_DATE = '2025-06-13'
+
+
+def _load(ctx):
+    return ctx['con'].execute(f"SELECT * FROM read_parquet('{ctx['parquet']}')").df()
+
+
+def _period(ctx):
+    ctx['con'].register('df_raw', ctx['raw'])
+    try:
+        return ctx['con'].execute(f"""
+            SELECT *,
+                CASE
+                    WHEN season = 2023 THEN '2023'
+                    WHEN season = 2024 THEN '2024'
+                    WHEN season = 2025 AND game_date < '{SPLIT_DATE}' THEN '2025-Pre'
+                    ELSE '2025-Post'
+                END as period
+            FROM df_raw
+            WHERE game_type = 'R'
+        """).df()
+    finally:
+        ctx['con'].unregister('df_raw')
+
+
+def _counts(ctx):
+    return add_count_columns(ctx['df'].copy())
+
+
+def _arsenal(ctx):
+    return ctx['con'].execute("""
+        SELECT
+            pitcher,
+            period,
+            pitch_type,
+            COUNT(*) as count,
+            ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY pitcher, period), 1) as pct,
+            ROUND(AVG(release_speed), 1) as avg_velo,
+            ROUND(AVG(release_spin_rate), 0) as avg_spin,
+            ROUND(AVG(pfx_x * 12), 1) as h_break_in,
+            ROUND(AVG(pfx_z * 12), 1) as v_break_in
+        FROM df
+        WHERE pitch_type IS NOT NULL
+        GROUP BY pitcher, period, pitch_type
+    """).df()
+
+
+def _tto(ctx):
+    return ctx['con'].execute(f"""
+        WITH batter_pa AS (
+            SELECT
+                game_pk,
+                pitcher,
+                batter,
+                at_bat_number,
+                DENSE_RANK() OVER(PARTITION BY game_pk, pitcher, batter ORDER BY at_bat_number) as pa_num
+            FROM df
+            GROUP BY game_pk, pitcher, batter, at_bat_number
+        )
+        SELECT
+            d.pitcher,
+            d.period,
+            CASE WHEN b.pa_num = 1 THEN '1st' WHEN b.pa_num = 2 THEN '2nd' ELSE '3rd+' END as tto,
+            COUNT(*) as pitches,
+            100.0 * SUM({IS_WHIFF}) / NULLIF(SUM({IS_SWING}), 0) as whiff_rate
+        FROM df d
+        JOIN batter_pa b ON d.game_pk = b.game_pk AND d.pitcher = b.pitcher
+            AND d.batter = b.batter AND d.at_bat_number = b.at_bat_number
+        GROUP BY ALL
+    """).df()
+
+
+def _whiff(ctx):
+    return ctx['con'].execute(f"""
+        SELECT
+            pitcher,
+            period,
+            pitch_type,
+            COUNT(*) as total_pitches,
+            SUM({IS_WHIFF}) as whiffs,
+            SUM({IS_SWING}) as total_swings,
+            ROUND(100.0 * SUM({IS_WHIFF}) / NULLIF(SUM({IS_SWING}), 0), 1) as whiff_rate
+        FROM df
+        WHERE pitch_type IS NOT NULL
+        GROUP BY pitcher, period, pitch_type
+    """).df()
+
+
+def _cube(ctx):
+    cube = PitchCube.from_pitches(ctx['con'], ctx['df'])
+    cube.rollup(['pitcher', 'period', 'tto'])
+    return cube.rollup(['period', 'pitch_type'], pct_within=['period'])
+
+
+def _rollup(ctx):
+    con = duckdb.connect()
+    try:
+        return len(GameRollup(con).update(ctx['df']))
+    finally:
+        con.close()
+
+
+def _plot(ctx):
+    df = ctx['df']
+    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    try:
+        dense_scatter(axes[0], df['pfx_x'] * 12, df['pfx_z'] * 12, c='C0', s=10, alpha=0.4)
+        dense_scatter(axes[1], df['plate_x'], df['plate_z'], c='C1', s=10, alpha=0.4,
+                      extent=(-2.5, 2.5, -0.5, 5.0))
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=72)
+        return buf.tell()
+    finally:
+        plt.close(fig)
+
+
+# stage name -> function(ctx); run in this order
+STAGES = {
+    'load': _load,
+    'period': _period,
+    'counts': _counts,
+    'arsenal': _arsenal,
+    'tto': _tto,
+    'whiff': _whiff,
+    'cube': _cube,
+    'rollup': _rollup,
+    'plot': _plot,
+}
+
+
+def git_commit():
+    """Short hash of the checked-out commit (None outside a git checkout)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time(fn, ctx, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ctx)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def run(rows=DEFAULT_ROWS, stages=tuple(STAGES), repeat=3, seed=0, threads=None):
+    """Time each stage at each size. Returns a list of result dicts."""
+    results = []
+    meta = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'duckdb': duckdb.__version__,
+        'seed': seed,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in rows:
+            start = time.perf_counter()
+            raw = synthetic_statcast(n, seed=seed)
+            gen_s = time.perf_counter() - start
+            parquet = os.path.join(tmp, f'statcast_{n}.parquet')
+            raw.to_parquet(parquet, index=False)
+
+            con = duckdb.connect()
+            if threads:
+                con.execute(f'SET threads = {int(threads)}')
+            ctx = {'con': con, 'raw': raw, 'parquet': parquet}
+            ctx['df'] = _period(ctx)
+            con.register('df', ctx['df'])
+            print(f'\n=== {n:,} rows (generated in {gen_s:.2f}s) ===')
+            for name in stages:
+                times = _time(STAGES[name], ctx, repeat)
+                best = min(times)
+                results.append({**meta, 'rows': n, 'stage': name, 'seconds': best,
+                                'median_seconds': float(np.median(times)), 'repeat': repeat,
+                                'rows_per_sec': n / best if best > 0 else None})
+                print(f'  {name:<8} {best * 1000:10.1f} ms   ({n / best / 1e6:7.2f} M rows/s)')
+            con.close()
+    return results
+
+
+def record(results, path=OUTPUT):
+    """Append results as JSON lines."""
+    with open(path, 'a', encoding='utf-8') as fh:
+        for r in results:
+            fh.write(json.dumps(r) + '\n')
+
+
+def compare(results, path=OUTPUT):
+    """Print each stage's time against the latest earlier run at the same size."""
+    if not os.path.exists(path):
+        return
+    current = results[0]['timestamp'] if results else None
+    previous = {}
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            r = json.loads(line)
+            if r['timestamp'] != current:
+                previous[(r['rows'], r['stage'])] = r
+    print('\n=== Compared with previous run ===')
+    for r in results:
+        prev = previous.get((r['rows'], r['stage']))
+        if prev is None:
+            continue
+        ratio = r['seconds'] / prev['seconds'] if prev['seconds'] > 0 else float('nan')
+        flag = '  <-- slower' if ratio > 1.2 else ''
+        print(f"  {r['rows']:>10,} {r['stage']:<8} {prev['seconds'] * 1000:9.1f} -> "
+              f"{r['seconds'] * 1000:9.1f} ms  x{ratio:.2f} (vs {prev['commit']}){flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark analysis stages on synthetic Statcast data.')
+    parser.add_argument('--rows', type=int, nargs='+', default=list(DEFAULT_ROWS))
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--threads', type=int, default=None, help='DuckDB threads (default: all)')
+    parser.add_argument('--output', default=OUTPUT, help='JSON-lines results file to append to')
+    parser.add_argument('--no-record', action='store_true', help='do not append to the output file')
+    parser.add_argument('--compare', action='store_true', help='compare with the previous recorded run')
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.stages, args.repeat, args.seed, args.threads)
+    if args.compare:
+        compare(results, args.output)
+    if not args.no_record:
+        record(results, args.output)
+
+
+if __name__ == '__main__':
+    main()
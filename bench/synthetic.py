@@ -0,0 +1,168 @@
+"""Seeded synthetic Statcast pitches for offline benchmarks.
+
+``synthetic_statcast(n_rows, seed)`` returns a DataFrame with the columns
+the analysis scripts read, at realistic shapes: games of ~95 pitches per
+pitcher, plate appearances of 1-7 pitches with consistent ball/strike
+counts, per-pitcher arsenals with distinct movement/velocity, batted-ball
+fields on balls in play only, and kinematic fit columns consistent with
+plate_x/plate_z. Values are plausible, not realistic; they exist to
+exercise the same code paths at 10k-10M rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+PITCH_TYPES = ('FF', 'SI', 'FC', 'SL', 'ST', 'CU', 'CH', 'FS', 'FO')
+# pitch type -> (velo, spin, pfx_x, pfx_z) means for a right-hander (feet for pfx)
+PITCH_SHAPES = {
+    'FF': (94.5, 2300, -0.6, 1.3), 'SI': (93.5, 2150, -1.3, 0.7), 'FC': (89.0, 2400, 0.2, 0.7),
+    'SL': (85.5, 2450, 0.4, 0.2), 'ST': (82.5, 2600, 1.2, 0.1), 'CU': (79.0, 2600, 0.7, -0.8),
+    'CH': (85.5, 1750, -1.2, 0.4), 'FS': (86.5, 1300, -0.8, 0.2), 'FO': (84.0, 1100, -0.5, -0.1),
+}
+PITCHES_PER_GAME = 95
+SEASONS = (2023, 2024, 2025)
+
+_TAKE = ('ball', 'called_strike', 'blocked_ball', 'hit_by_pitch')
+_SWING = ('swinging_strike', 'swinging_strike_blocked', 'foul', 'foul_tip',
+          'hit_into_play')
+_DESC = _TAKE + _SWING
+_DESC_P = np.array([0.33, 0.16, 0.02, 0.01, 0.10, 0.01, 0.17, 0.02, 0.18])
+
+
+def _pa_layout(n, rng):
+    """PA ids and pitch numbers for n pitches (PA lengths 1-7)."""
+    lengths = rng.choice(np.arange(1, 8), size=n // 2 + 8, p=[.2, .18, .18, .16, .13, .1, .05])
+    lengths = lengths[:np.searchsorted(np.cumsum(lengths), n) + 1]
+    pa = np.repeat(np.arange(len(lengths)), lengths)[:n]
+    starts = np.r_[0, np.cumsum(lengths)[:-1]]
+    pitch_number = (np.arange(n) - np.repeat(starts, lengths)[:n] + 1)
+    return pa, pitch_number
+
+
+def synthetic_statcast(n_rows, seed=0, n_pitchers=None, seasons=SEASONS):
+    """Generate ``n_rows`` synthetic pitches (deterministic for a given seed)."""
+    rng = np.random.default_rng(seed)
+    n = int(n_rows)
+    n_games = max(1, n // PITCHES_PER_GAME)
+    n_pitchers = n_pitchers or max(1, min(800, n_games // 25))
+
+    pa, pitch_number = _pa_layout(n, rng)
+    game = np.minimum(np.arange(n) // PITCHES_PER_GAME, n_games - 1)
+    game_pk = 700_000 + game
+    pitcher_ids = 600_000 + np.arange(n_pitchers)
+    pitcher = pitcher_ids[game % n_pitchers]
+    pitcher_idx = game % n_pitchers
+    season = np.asarray(seasons)[(game * len(seasons)) // n_games]
+    day = (game // max(1, n_pitchers // 5)) % 180
+    game_date = (pd.to_datetime(season.astype(str) + '-03-28')
+                 + pd.to_timedelta(day, unit='D')).strftime('%Y-%m-%d')
+    # at_bat_number restarts per game
+    pa_game_start = pd.Series(pa).groupby(game).transform('min').to_numpy()
+    at_bat_number = pa - pa_game_start + 1
+    batter = 500_000 + (at_bat_number * 7919 + game * 31) % 9 + (game % 30) * 9
+
+    # per-pitcher arsenal: 4-6 pitch types with skewed usage
+    k = len(PITCH_TYPES)
+    usage = rng.dirichlet(np.full(k, 0.6), size=n_pitchers)
+    usage[:, 0] += 0.3
+    usage /= usage.sum(axis=1, keepdims=True)
+    cum = np.cumsum(usage, axis=1)
+    type_idx = (rng.random(n)[:, None] > cum[pitcher_idx]).sum(axis=1).clip(0, k - 1)
+    pitch_type = np.asarray(PITCH_TYPES, dtype=object)[type_idx]
+    lefty = (pitcher_idx % 4 == 0)
+    p_throws = np.where(lefty, 'L', 'R')
+    hand = np.where(lefty, -1.0, 1.0)
+
+    shapes = np.array([PITCH_SHAPES[t] for t in PITCH_TYPES])
+    offset = rng.normal(0, [1.2, 120, 0.15, 0.12], size=(n_pitchers, 4))
+    mean = shapes[type_idx] + offset[pitcher_idx]
+    release_speed = mean[:, 0] + rng.normal(0, 0.9, n)
+    release_spin_rate = mean[:, 1] + rng.normal(0, 60, n)
+    pfx_x = hand * (mean[:, 2] + rng.normal(0, 0.12, n))
+    pfx_z = mean[:, 3] + rng.normal(0, 0.12, n)
+    spin_axis = (np.degrees(np.arctan2(pfx_x, pfx_z)) + 180) % 360
+
+    release_pos_x = hand * -1.8 + rng.normal(0, 0.15, n) + offset[pitcher_idx, 2]
+    release_pos_z = 5.9 + rng.normal(0, 0.12, n) + offset[pitcher_idx, 3]
+    release_extension = 6.3 + rng.normal(0, 0.2, n)
+    plate_x = rng.normal(0, 0.75, n)
+    plate_z = rng.normal(2.4, 0.8, n)
+
+    # constant-acceleration fit at y=50 consistent with the plate location
+    vy0 = -release_speed * 1.467
+    ay = rng.normal(27, 2, n)
+    ax = pfx_x * 2 * 32.174 / 0.16 * 0.08 + rng.normal(0, 1, n)
+    az = pfx_z * 2 * 32.174 / 0.16 * 0.08 - 32.174
+    disc = np.sqrt(vy0 ** 2 - 2 * ay * (50 - 17 / 12))
+    t_plate = (-vy0 - disc) / ay
+    vx0 = (plate_x - release_pos_x - 0.5 * ax * t_plate ** 2) / t_plate
+    vz0 = (plate_z - release_pos_z - 0.5 * az * t_plate ** 2) / t_plate
+
+    in_x = np.abs(plate_x) <= 0.83
+    in_z = (plate_z >= 1.5) & (plate_z <= 3.5)
+    col = np.clip(((plate_x + 0.83) / (1.66 / 3)).astype(int), 0, 2)
+    row = np.clip(((3.5 - plate_z) / (2.0 / 3)).astype(int), 0, 2)
+    zone = np.where(in_x & in_z, 1 + row * 3 + col,
+                    11 + (plate_x > 0).astype(int) + 2 * (plate_z < 2.5).astype(int))
+
+    # counts: walk the PA with ball/strike increments from the previous pitch
+    description = np.asarray(_DESC, dtype=object)[rng.choice(len(_DESC), n, p=_DESC_P)]
+    is_ball = np.isin(description, ('ball', 'blocked_ball'))
+    is_strike = np.isin(description, ('called_strike', 'swinging_strike', 'swinging_strike_blocked',
+                                      'foul', 'foul_tip'))
+    first = pitch_number == 1
+    prev_ball = np.r_[0, is_ball[:-1]].astype(int)
+    prev_strike = np.r_[0, is_strike[:-1]].astype(int)
+    balls = pd.Series(np.where(first, 0, prev_ball)).groupby(pa).cumsum().clip(upper=3).to_numpy()
+    strikes = pd.Series(np.where(first, 0, prev_strike)).groupby(pa).cumsum().clip(upper=2).to_numpy()
+
+    in_play = description == 'hit_into_play'
+    launch_speed = np.where(in_play, rng.normal(88, 14, n).clip(30, 118), np.nan)
+    launch_angle = np.where(in_play, rng.normal(12, 26, n).clip(-80, 85), np.nan)
+    xwoba = np.where(in_play, np.clip(rng.gamma(1.6, 0.22, n), 0, 2.0), np.nan)
+    xba = np.where(in_play, np.clip(xwoba * 0.8, 0, 1), np.nan)
+    spray = np.radians(rng.normal(0, 28, n))
+    dist = np.where(in_play, launch_speed * 2.4, np.nan)
+    hc_x = 125.42 + np.sin(spray) * dist / 2.5
+    hc_y = 198.27 - np.cos(spray) * dist / 2.5
+
+    inning = np.minimum(1 + (at_bat_number - 1) // 4, 9)
+    game_type = np.where(rng.random(n_games) < 0.92, 'R', np.where(rng.random(n_games) < 0.5, 'S', 'F'))[game]
+
+    return pd.DataFrame({
+        'pitch_type': pitch_type,
+        'game_date': game_date,
+        'release_speed': release_speed,
+        'release_pos_x': release_pos_x,
+        'release_pos_z': release_pos_z,
+        'batter': batter,
+        'pitcher': pitcher,
+        'events': np.where(in_play, 'field_out', None),
+        'description': description,
+        'zone': zone.astype(float),
+        'game_type': game_type,
+        'stand': np.where(batter % 3 == 0, 'L', 'R'),
+        'p_throws': p_throws,
+        'balls': balls,
+        'strikes': strikes,
+        'pfx_x': pfx_x,
+        'pfx_z': pfx_z,
+        'plate_x': plate_x,
+        'plate_z': plate_z,
+        'hc_x': hc_x,
+        'hc_y': hc_y,
+        'vx0': vx0, 'vy0': vy0, 'vz0': vz0,
+        'ax': ax, 'ay': ay, 'az': az,
+        'launch_speed': launch_speed,
+        'launch_angle': launch_angle,
+        'release_spin_rate': release_spin_rate,
+        'release_extension': release_extension,
+        'game_pk': game_pk,
+        'estimated_ba_using_speedangle': xba,
+        'estimated_woba_using_speedangle': xwoba,
+        'inning': inning,
+        'at_bat_number': at_bat_number,
+        'pitch_number': pitch_number,
+        'spin_axis': spin_axis,
+        'season': season,
+    })
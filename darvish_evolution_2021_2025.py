@@ -2,39 +2,74 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pybaseball import statcast_pitcher
 import duckdb
 
-plt.style.use('ggplot')
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 12
+from statcast_tools.counts import COUNT_STATE_LABEL, add_count_columns
+from statcast_tools.cube import PitchCube
+from statcast_tools.deltas import pair_changes, period_deltas
+from statcast_tools.fatigue import fatigue_curves
+from statcast_tools.lazy import lazy_import
+from statcast_tools.profiling import Tracer
+from statcast_tools.report import ReportSink
+from statcast_tools.shared import SharedDataset
+from statcast_tools.store import PitchStore
+
+
+def apply_style(plt):
+    plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (12, 6)
+    plt.rcParams['font.size'] = 12
+
+
+# Plotting and fetching libraries load on first use, so text-only runs skip their import cost
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+statcast_pitcher = lazy_import('pybaseball', 'statcast_pitcher')
 
 # ====== Settings ======
 PITCHER_ID = 506433  # Yu Darvish MLBAM ID
 YEARS = [2021, 2022, 2023, 2024, 2025]
 GAME_TYPE = 'R'  # Regular season only
+REPORT_PATH = None  # e.g. 'reports/darvish.jsonl' (or .parquet): one structured record per section
+TRACE_PATH = None  # e.g. 'traces/darvish.jsonl': per-section time / rows / memory, one file per run
+PROFILE_QUERIES = False  # with TRACE_PATH: also record DuckDB's JSON profile for every query
+STORE_PATH = None  # e.g. 'data/statcast': Hive-partitioned local store; stored seasons are read, not re-fetched
+SHARED_PATH = None  # e.g. '/dev/shm/statcast.arrow' from `python -m statcast_tools.shared`: attach zero-copy instead of loading
+PLOTS = True  # False = text-only run: figures are skipped and matplotlib / seaborn are never imported
 # ======================
 
+tracer = Tracer(TRACE_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS}, profile=PROFILE_QUERIES)
+tracer.mark('fetch')
+store = PitchStore(STORE_PATH, key='pitcher') if STORE_PATH else None
+source = SharedDataset(SHARED_PATH) if SHARED_PATH else store  # shared copy first, then the local store
 dfs = []
 for year in YEARS:
-    print(f'Fetching {year}...')
-    df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
-    df_year['season'] = year
+    if source is not None and source.has(year, PITCHER_ID):
+        # only this season / game type / pitcher is read (from shared memory or the store's partitions)
+        print(f'Loading {year} from {SHARED_PATH or STORE_PATH}...')
+        df_year = source.scan([year], [GAME_TYPE], [PITCHER_ID])
+    else:
+        print(f'Fetching {year}...')
+        df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
+        df_year['season'] = year
+        if store is not None:
+            store.write(df_year)
     dfs.append(df_year)
     print(f'  {year}: {len(df_year):,} pitches')
 
 df_raw = pd.concat(dfs, ignore_index=True)
 print(f'\nTotal (raw): {len(df_raw):,} pitches')
 
+tracer.mark('filter')
 # Filter regular season only
-con = duckdb.connect()
+con = tracer.connect(duckdb.connect())  # records each query while tracing
 df = con.execute(f"""
     SELECT * FROM df_raw WHERE game_type = '{GAME_TYPE}'
 """).df()
 print(f'Total (regular season): {len(df):,} pitches')
+add_count_columns(df)  # int8 count_idx (0-0 ... 3-2) and count_state, used by the count queries
 
+tracer.mark('summary')
 # === Text Summary (for Claude Code review) ===
 summary = con.execute("""
     SELECT
@@ -54,6 +89,7 @@ print('=== Season-by-Season Overview ===')
 print(summary.to_string(index=False))
 print(f'\nTotal: {len(df):,} pitches across {len(YEARS)} seasons')
 
+tracer.mark('arsenal')
 # Which pitch types were used each year?
 arsenal = con.execute("""
     SELECT
@@ -79,29 +115,36 @@ for year in YEARS:
 mix_pivot = arsenal.pivot_table(index='season', columns='pitch_type', values='pct', fill_value=0)
 
 # Chart
-mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
-plt.title('Yu Darvish - Pitch Mix Evolution (2021-2025)')
-plt.xlabel('Season')
-plt.ylabel('Usage %')
-plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    apply_style(plt)  # before the first figure: DataFrame.plot builds its axes without going through plt
+    mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
+    plt.title('Yu Darvish - Pitch Mix Evolution (2021-2025)')
+    plt.xlabel('Season')
+    plt.ylabel('Usage %')
+    plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Pitch Mix Changes (% usage) ===')
 print(mix_pivot.round(1).to_string())
 
+# Usage / velocity / whiff / movement deltas for every season pair in one broadcast
+season_profile = PitchCube.from_pitches(con, df, axes=('season', 'pitch_type')).rollup(
+    ['season', 'pitch_type'], pct_within=['season'], dropna=('pitch_type',))
+deltas = period_deltas(season_profile, YEARS, period_col='season', min_pitches=30)
+
 # Year-over-year biggest changes
 if len(YEARS) >= 2:
-    first = mix_pivot.loc[YEARS[0]]
-    last = mix_pivot.loc[YEARS[-1]]
-    diff = (last - first).sort_values()
     print(f'\n=== Biggest Changes ({YEARS[0]} → {YEARS[-1]}) ===')
-    for pitch, change in diff.items():
-        if abs(change) >= 1.0:
-            direction = '↑' if change > 0 else '↓'
-            print(f'  {pitch}: {first[pitch]:.1f}% → {last[pitch]:.1f}% ({direction}{abs(change):.1f}%)')
+    for _, row in pair_changes(deltas, YEARS[0], YEARS[-1], min_abs=1.0).iterrows():
+        direction = '↑' if row['delta'] > 0 else '↓'
+        print(f"  {row['pitch_type']}: {row['before']:.1f}% → {row['after']:.1f}% ({direction}{abs(row['delta']):.1f}%)")
+
+print('\n=== Largest Shifts, All Season Pairs (score = change / notable change) ===')
+print(deltas.head(15).round(2).to_string(index=False))
 
+tracer.mark('velocity')
 # Fastball (FF) velocity trend across years
 velo_by_year = con.execute("""
     SELECT
@@ -125,26 +168,27 @@ top_pitches = con.execute("""
     LIMIT 4
 """).df()['pitch_type'].tolist()
 
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
-for pitch in top_pitches:
-    data = velo_by_year[velo_by_year['pitch_type'] == pitch]
-    axes[0].plot(data['season'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
-    axes[1].plot(data['season'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
+    for pitch in top_pitches:
+        data = velo_by_year[velo_by_year['pitch_type'] == pitch]
+        axes[0].plot(data['season'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
+        axes[1].plot(data['season'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
 
-axes[0].set_title('Average Velocity by Season')
-axes[0].set_xlabel('Season')
-axes[0].set_ylabel('Velocity (mph)')
-axes[0].legend()
+    axes[0].set_title('Average Velocity by Season')
+    axes[0].set_xlabel('Season')
+    axes[0].set_ylabel('Velocity (mph)')
+    axes[0].legend()
 
-axes[1].set_title('Average Spin Rate by Season')
-axes[1].set_xlabel('Season')
-axes[1].set_ylabel('Spin Rate (rpm)')
-axes[1].legend()
+    axes[1].set_title('Average Spin Rate by Season')
+    axes[1].set_xlabel('Season')
+    axes[1].set_ylabel('Spin Rate (rpm)')
+    axes[1].legend()
 
-plt.suptitle('Yu Darvish - Velocity & Spin Trends (2021-2025)')
-plt.tight_layout()
-plt.show()
+    plt.suptitle('Yu Darvish - Velocity & Spin Trends (2021-2025)')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Velocity & Spin by Year (Top 4 Pitches) ===')
@@ -156,6 +200,7 @@ for pitch in top_pitches:
 # Fastball velocity by inning, per season
 ff_type = 'FF' if 'FF' in top_pitches else top_pitches[0]
 
+tracer.mark('fatigue')
 fatigue = con.execute(f"""
     SELECT
         season,
@@ -169,20 +214,21 @@ fatigue = con.execute(f"""
     ORDER BY season, inning
 """).df()
 
-fig, ax = plt.subplots(figsize=(12, 6))
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-for year in YEARS:
-    data = fatigue[fatigue['season'] == year]
-    if len(data) > 0:
-        ax.plot(data['inning'], data['avg_velo'], marker='o', label=str(year), linewidth=2)
+    for year in YEARS:
+        data = fatigue[fatigue['season'] == year]
+        if len(data) > 0:
+            ax.plot(data['inning'], data['avg_velo'], marker='o', label=str(year), linewidth=2)
 
-ax.set_xlabel('Inning')
-ax.set_ylabel(f'{ff_type} Velocity (mph)')
-ax.set_title(f'Yu Darvish - {ff_type} Velocity by Inning (2021-2025)')
-ax.set_xticks(range(1, 9))
-ax.legend()
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel('Inning')
+    ax.set_ylabel(f'{ff_type} Velocity (mph)')
+    ax.set_title(f'Yu Darvish - {ff_type} Velocity by Inning (2021-2025)')
+    ax.set_xticks(range(1, 9))
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print(f'\n=== {ff_type} Velocity by Inning ===')
@@ -201,31 +247,8 @@ for year in YEARS:
         print(f'  {year}: {first_velo} → {last_velo} (inn {last_inn}) = {drop:+.1f} mph')
 
 # Velocity by pitch count within game, per season
-pitch_count_effect = con.execute(f"""
-    WITH pitch_seq AS (
-        SELECT
-            season,
-            game_pk,
-            release_speed,
-            ROW_NUMBER() OVER(PARTITION BY game_pk ORDER BY at_bat_number, pitch_number) as pitch_num
-        FROM df
-        WHERE pitch_type = '{ff_type}'
-    )
-    SELECT
-        season,
-        CASE
-            WHEN pitch_num <= 25 THEN '1-25'
-            WHEN pitch_num <= 50 THEN '26-50'
-            WHEN pitch_num <= 75 THEN '51-75'
-            WHEN pitch_num <= 100 THEN '76-100'
-            ELSE '100+'
-        END as pitch_range,
-        COUNT(*) as pitches,
-        ROUND(AVG(release_speed), 1) as avg_velo
-    FROM pitch_seq
-    GROUP BY season, pitch_range
-    ORDER BY season, pitch_range
-""").df()
+# (one windowed pass numbers every pitch per pitcher/game; same call works on league-wide data)
+pitch_count_effect, fatigue_slopes = fatigue_curves(con, df, pitch_types=(ff_type,), by=('season',))
 
 print('=== Velocity by Pitch Count in Game ===')
 for year in YEARS:
@@ -233,6 +256,10 @@ for year in YEARS:
     print(f'\n--- {year} ---')
     print(data[['pitch_range', 'pitches', 'avg_velo']].to_string(index=False))
 
+print(f'\n=== {ff_type} Within-Game Decay (per 100 pitches) ===')
+print(fatigue_slopes[['season', 'pitches', 'games', 'velo_per_100', 'spin_per_100']].to_string(index=False))
+
+tracer.mark('whiff')
 # Whiff rate by pitch type by season (FIXED: includes hit_into_play in denominator)
 whiff = con.execute("""
     SELECT
@@ -262,19 +289,20 @@ whiff = con.execute("""
 """).df()
 
 # Chart: whiff rate for top pitches across years
-fig, ax = plt.subplots(figsize=(12, 6))
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
 
-for pitch in top_pitches:
-    data = whiff[whiff['pitch_type'] == pitch]
-    if len(data) > 0:
-        ax.plot(data['season'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
+    for pitch in top_pitches:
+        data = whiff[whiff['pitch_type'] == pitch]
+        if len(data) > 0:
+            ax.plot(data['season'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
 
-ax.set_xlabel('Season')
-ax.set_ylabel('Whiff Rate (%)')
-ax.set_title('Yu Darvish - Whiff Rate Evolution by Pitch Type (2021-2025)')
-ax.legend()
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel('Season')
+    ax.set_ylabel('Whiff Rate (%)')
+    ax.set_title('Yu Darvish - Whiff Rate Evolution by Pitch Type (2021-2025)')
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Whiff Rate by Pitch Type by Season ===')
@@ -292,6 +320,7 @@ for pitch in top_pitches:
             change = last_val[0] - first_val[0]
             print(f'  {pitch}: {first_val[0]:.1f}% → {last_val[0]:.1f}% ({change:+.1f}%)')
 
+tracer.mark('two_strike')
 # Two-strike pitch selection by season
 two_strike = con.execute("""
     SELECT
@@ -322,43 +351,32 @@ for year in YEARS:
 # Two-strike pitch mix change chart
 ts_pivot = two_strike.pivot_table(index='season', columns='pitch_type', values='pct', fill_value=0)
 
-ts_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set2')
-plt.title('Yu Darvish - Two-Strike Pitch Mix (2021-2025)')
-plt.xlabel('Season')
-plt.ylabel('Usage %')
-plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    ts_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set2')
+    plt.title('Yu Darvish - Two-Strike Pitch Mix (2021-2025)')
+    plt.xlabel('Season')
+    plt.ylabel('Usage %')
+    plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Two-Strike Mix Changes ===')
 print(ts_pivot.round(1).to_string())
 
+tracer.mark('counts')
 # Count-based pitch selection (FIXED: Full Count checked before Behind)
-count_analysis = con.execute("""
+count_analysis = con.execute(f"""
     SELECT
         season,
-        CASE
-            WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-            WHEN balls > strikes THEN 'Behind'
-            WHEN strikes > balls THEN 'Ahead'
-            ELSE 'Even'
-        END as count_situation,
+        {COUNT_STATE_LABEL} as count_situation,
         pitch_type,
         COUNT(*) as pitches,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(
-            PARTITION BY season,
-            CASE
-                WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-                WHEN balls > strikes THEN 'Behind'
-                WHEN strikes > balls THEN 'Ahead'
-                ELSE 'Even'
-            END
-        ), 1) as pct
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY season, count_state), 1) as pct
     FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY season, count_situation, pitch_type
-    ORDER BY season, count_situation, pitches DESC
+    WHERE pitch_type IS NOT NULL AND count_state >= 0
+    GROUP BY season, count_state, pitch_type
+    ORDER BY season, count_state, pitches DESC
 """).df()
 
 # Show top 3 pitches per situation per year
@@ -386,13 +404,9 @@ for _, row in summary.iterrows():
 # Pitch mix biggest changes
 print(f'\n[Pitch Mix Changes ({YEARS[0]} → {YEARS[-1]})]')
 if len(YEARS) >= 2:
-    first = mix_pivot.loc[YEARS[0]]
-    last = mix_pivot.loc[YEARS[-1]]
-    diff = (last - first).sort_values()
-    for pitch, change in diff.items():
-        if abs(change) >= 2.0:
-            direction = 'increased' if change > 0 else 'decreased'
-            print(f'  {pitch}: {direction} by {abs(change):.1f}% ({first[pitch]:.1f}% → {last[pitch]:.1f}%)')
+    for _, row in pair_changes(deltas, YEARS[0], YEARS[-1], min_abs=2.0).iterrows():
+        direction = 'increased' if row['delta'] > 0 else 'decreased'
+        print(f"  {row['pitch_type']}: {direction} by {abs(row['delta']):.1f}% ({row['before']:.1f}% → {row['after']:.1f}%)")
 
 # Velocity trend
 print(f'\n[Fastball Velocity Trend]')
@@ -409,3 +423,22 @@ for year in YEARS:
         print(f'  {year}: {best["pitch_type"]} ({best["whiff_rate"]}%)')
 
 print('\n' + '=' * 60)
+
+tracer.mark('report')
+# Structured output: one record (section id, run parameters, result table) per section
+with ReportSink(REPORT_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS, 'game_type': GAME_TYPE}) as report:
+    for section, table in [
+        ('summary', summary),
+        ('arsenal', arsenal),
+        ('velo_by_year', velo_by_year),
+        ('fatigue', fatigue),
+        ('pitch_count_effect', pitch_count_effect),
+        ('fatigue_slopes', fatigue_slopes),
+        ('whiff', whiff),
+        ('two_strike', two_strike),
+        ('count_analysis', count_analysis),
+        ('deltas', deltas),
+    ]:
+        report.emit(section, table)
+
+tracer.close()
@@ -2,35 +2,69 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pybaseball import statcast_pitcher
 import duckdb
 
-plt.style.use('ggplot')
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 12
+from statcast_tools.changepoint import game_series, propose_splits
+from statcast_tools.counts import COUNT_STATE_LABEL, add_count_columns
+from statcast_tools.lazy import lazy_import
+from statcast_tools.profiling import Tracer
+from statcast_tools.raster import dense_scatter  # aggregates to one image above a point-count threshold
+from statcast_tools.report import ReportSink
+from statcast_tools.rollup import GameRollup, avg_sql
+from statcast_tools.shared import SharedDataset
+from statcast_tools.split_sweep import split_sweep
+from statcast_tools.store import PitchStore
+
+
+def apply_style(plt):
+    plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (12, 6)
+    plt.rcParams['font.size'] = 12
+
+
+# Plotting and fetching libraries load on first use, so text-only runs skip their import cost
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+statcast_pitcher = lazy_import('pybaseball', 'statcast_pitcher')
 
 # ====== Settings ======
 PITCHER_ID = 684007  # Shota Imanaga MLBAM ID
 YEARS = [2024, 2025]
 GAME_TYPE = 'R'  # Regular season only
 ASB_DATE = '2025-07-15'  # All-Star Break cutoff for 1H/2H split
+REPORT_PATH = None  # e.g. 'reports/imanaga.jsonl' (or .parquet): one structured record per section
+TRACE_PATH = None  # e.g. 'traces/imanaga.jsonl': per-section time / rows / memory, one file per run
+PROFILE_QUERIES = False  # with TRACE_PATH: also record DuckDB's JSON profile for every query
+STORE_PATH = None  # e.g. 'data/statcast': Hive-partitioned local store; stored seasons are read, not re-fetched
+SHARED_PATH = None  # e.g. '/dev/shm/statcast.arrow' from `python -m statcast_tools.shared`: attach zero-copy instead of loading
+PLOTS = True  # False = text-only run: figures are skipped and matplotlib / seaborn are never imported
 # ======================
 
+tracer = Tracer(TRACE_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS}, profile=PROFILE_QUERIES)
+tracer.mark('fetch')
+store = PitchStore(STORE_PATH, key='pitcher') if STORE_PATH else None
+source = SharedDataset(SHARED_PATH) if SHARED_PATH else store  # shared copy first, then the local store
 dfs = []
 for year in YEARS:
-    print(f'Fetching {year}...')
-    df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
-    df_year['season'] = year
+    if source is not None and source.has(year, PITCHER_ID):
+        # only this season / game type / pitcher is read (from shared memory or the store's partitions)
+        print(f'Loading {year} from {SHARED_PATH or STORE_PATH}...')
+        df_year = source.scan([year], [GAME_TYPE], [PITCHER_ID])
+    else:
+        print(f'Fetching {year}...')
+        df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
+        df_year['season'] = year
+        if store is not None:
+            store.write(df_year)
     dfs.append(df_year)
     print(f'  {year}: {len(df_year):,} pitches')
 
 df_raw = pd.concat(dfs, ignore_index=True)
 print(f'\nTotal (raw): {len(df_raw):,} pitches')
 
+tracer.mark('filter')
 # Filter regular season only
-con = duckdb.connect()
+con = tracer.connect(duckdb.connect())  # records each query while tracing
 df = con.execute(f"""
     SELECT *,
         CASE
@@ -43,6 +77,12 @@ df = con.execute(f"""
 """).df()
 
 print(f'Total (regular season): {len(df):,} pitches')
+add_count_columns(df)  # int8 count_idx (0-0 ... 3-2) and count_state, used by the count queries
+
+tracer.mark('rollup')
+# Per-(pitcher, game, pitch_type) rollup: monthly/season trends scan this instead of every pitch
+rollup = GameRollup(con).update(df)
+
 print(f'\nPeriod breakdown:')
 for period in ['2024', '2025-1H', '2025-2H']:
     n = len(df[df['period'] == period])
@@ -50,6 +90,21 @@ for period in ['2024', '2025-1H', '2025-2H']:
 
 PERIODS = ['2024', '2025-1H', '2025-2H']
 
+tracer.mark('change_points')
+# CUSUM change-point scan over the per-game series: compare proposed breaks with ASB_DATE
+change_points = propose_splits(game_series(con, df), max_splits=2)
+print(f'\n=== Proposed split dates (manual ASB_DATE: {ASB_DATE}) ===')
+print(change_points.drop(columns='pitcher').to_string(index=False))
+
+# Sensitivity of the 2025 pre/post comparison to the split date (every game date at once)
+sweep = split_sweep(df[df['season'] == 2025])
+near = (sweep['split_date'] - pd.Timestamp(ASB_DATE)).abs() <= pd.Timedelta(days=21)
+print(f'\n=== Split-date sensitivity around ASB_DATE ({ASB_DATE}) ===')
+print(sweep.loc[near, ['split_date', 'pre_pitches', 'post_pitches', 'whiff_rate_delta',
+                       'velo_delta', 'xwOBA_delta', 'mix_shift']]
+      .round({'whiff_rate_delta': 3, 'velo_delta': 3, 'xwOBA_delta': 3, 'mix_shift': 3}).to_string(index=False))
+
+tracer.mark('summary')
 summary = con.execute("""
     SELECT
         period,
@@ -68,6 +123,7 @@ print('=== Period Overview ===')
 print(summary.to_string(index=False))
 print(f'\nTotal: {len(df):,} pitches')
 
+tracer.mark('arsenal')
 arsenal = con.execute("""
     SELECT
         period,
@@ -91,13 +147,15 @@ for period in PERIODS:
 mix_pivot = arsenal.pivot_table(index='period', columns='pitch_type', values='pct', fill_value=0)
 mix_pivot = mix_pivot.reindex(PERIODS)
 
-mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
-plt.title('Shota Imanaga - Pitch Mix by Period')
-plt.xlabel('Period')
-plt.ylabel('Usage %')
-plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    apply_style(plt)  # before the first figure: DataFrame.plot builds its axes without going through plt
+    mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
+    plt.title('Shota Imanaga - Pitch Mix by Period')
+    plt.xlabel('Period')
+    plt.ylabel('Usage %')
+    plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Pitch Mix (% usage) ===')
@@ -114,6 +172,7 @@ if '2024' in mix_pivot.index and '2025-2H' in mix_pivot.index:
             direction = '↑' if change > 0 else '↓'
             print(f'  {pitch}: {first[pitch]:.1f}% → {last[pitch]:.1f}% ({direction}{abs(change):.1f}%)')
 
+tracer.mark('velocity')
 velo_by_period = con.execute("""
     SELECT
         period,
@@ -135,27 +194,28 @@ top_pitches = con.execute("""
     LIMIT 4
 """).df()['pitch_type'].tolist()
 
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
-period_order = {p: i for i, p in enumerate(PERIODS)}
-for pitch in top_pitches:
-    data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
-    data['period_idx'] = data['period'].map(period_order)
-    data = data.sort_values('period_idx')
-    axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
-    axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
+    period_order = {p: i for i, p in enumerate(PERIODS)}
+    for pitch in top_pitches:
+        data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
+        data['period_idx'] = data['period'].map(period_order)
+        data = data.sort_values('period_idx')
+        axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
+        axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
 
-axes[0].set_title('Average Velocity by Period')
-axes[0].set_ylabel('Velocity (mph)')
-axes[0].legend()
+    axes[0].set_title('Average Velocity by Period')
+    axes[0].set_ylabel('Velocity (mph)')
+    axes[0].legend()
 
-axes[1].set_title('Average Spin Rate by Period')
-axes[1].set_ylabel('Spin Rate (rpm)')
-axes[1].legend()
+    axes[1].set_title('Average Spin Rate by Period')
+    axes[1].set_ylabel('Spin Rate (rpm)')
+    axes[1].legend()
 
-plt.suptitle('Shota Imanaga - Velocity & Spin Trends')
-plt.tight_layout()
-plt.show()
+    plt.suptitle('Shota Imanaga - Velocity & Spin Trends')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Velocity & Spin by Period (Top Pitches) ===')
@@ -164,36 +224,42 @@ for pitch in top_pitches:
     print(f'\n{pitch}:')
     print(data[['period', 'avg_velo', 'avg_spin', 'count']].to_string(index=False))
 
-monthly_velo = con.execute("""
+tracer.mark('monthly')
+monthly_velo = con.execute(f"""
     SELECT
         season,
-        EXTRACT(MONTH FROM game_date::DATE) as month,
+        EXTRACT(MONTH FROM game_date) as month,
         pitch_type,
-        ROUND(AVG(release_speed), 1) as avg_velo,
-        COUNT(*) as pitches
-    FROM df
-    WHERE pitch_type IN (SELECT pitch_type FROM df GROUP BY pitch_type ORDER BY COUNT(*) DESC LIMIT 3)
+        ROUND({avg_sql('velo')}, 1) as avg_velo,
+        SUM(pitches) as pitches
+    FROM pitch_game_rollup
+    WHERE pitcher = {PITCHER_ID}
+      AND pitch_type IN (
+        SELECT pitch_type FROM pitch_game_rollup WHERE pitcher = {PITCHER_ID}
+        GROUP BY pitch_type ORDER BY SUM(pitches) DESC LIMIT 3
+      )
     GROUP BY season, month, pitch_type
-    HAVING COUNT(*) >= 10
+    HAVING SUM(pitches) >= 10
     ORDER BY season, month
 """).df()
 
 # Plot 2025 monthly trend
-fig, ax = plt.subplots(figsize=(12, 6))
 df_2025_monthly = monthly_velo[monthly_velo['season'] == 2025]
-for pitch in df_2025_monthly['pitch_type'].unique():
-    data = df_2025_monthly[df_2025_monthly['pitch_type'] == pitch]
-    ax.plot(data['month'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
-
-ax.axvline(x=7, color='gray', linestyle='--', alpha=0.5, label='ASB')
-ax.set_xlabel('Month')
-ax.set_ylabel('Velocity (mph)')
-ax.set_title('Shota Imanaga - 2025 Monthly Velocity Trend')
-ax.set_xticks(range(3, 11))
-ax.set_xticklabels(['Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct'])
-ax.legend()
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for pitch in df_2025_monthly['pitch_type'].unique():
+        data = df_2025_monthly[df_2025_monthly['pitch_type'] == pitch]
+        ax.plot(data['month'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
+
+    ax.axvline(x=7, color='gray', linestyle='--', alpha=0.5, label='ASB')
+    ax.set_xlabel('Month')
+    ax.set_ylabel('Velocity (mph)')
+    ax.set_title('Shota Imanaga - 2025 Monthly Velocity Trend')
+    ax.set_xticks(range(3, 11))
+    ax.set_xticklabels(['Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct'])
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('=== 2025 Monthly Velocity ===')
@@ -212,6 +278,7 @@ for pitch in df_2024_monthly['pitch_type'].unique():
 
 ff_type = 'FF' if 'FF' in top_pitches else top_pitches[0]
 
+tracer.mark('fatigue')
 fatigue = con.execute(f"""
     SELECT
         period,
@@ -225,19 +292,20 @@ fatigue = con.execute(f"""
     ORDER BY period, inning
 """).df()
 
-fig, ax = plt.subplots(figsize=(12, 6))
-for period in PERIODS:
-    data = fatigue[fatigue['period'] == period]
-    if len(data) > 0:
-        ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for period in PERIODS:
+        data = fatigue[fatigue['period'] == period]
+        if len(data) > 0:
+            ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
 
-ax.set_xlabel('Inning')
-ax.set_ylabel(f'{ff_type} Velocity (mph)')
-ax.set_title(f'Shota Imanaga - {ff_type} Velocity by Inning')
-ax.set_xticks(range(1, 9))
-ax.legend()
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel('Inning')
+    ax.set_ylabel(f'{ff_type} Velocity (mph)')
+    ax.set_title(f'Shota Imanaga - {ff_type} Velocity by Inning')
+    ax.set_xticks(range(1, 9))
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print(f'\n=== {ff_type} Velocity by Inning ===')
@@ -256,6 +324,7 @@ for period in PERIODS:
         drop = last_velo - first_velo
         print(f'  {period}: {first_velo} → {last_velo} (inn {last_inn}) = {drop:+.1f} mph')
 
+tracer.mark('whiff')
 whiff = con.execute("""
     SELECT
         period,
@@ -283,20 +352,21 @@ whiff = con.execute("""
     ORDER BY period, total_pitches DESC
 """).df()
 
-fig, ax = plt.subplots(figsize=(12, 6))
-period_order = {p: i for i, p in enumerate(PERIODS)}
-for pitch in top_pitches:
-    data = whiff[whiff['pitch_type'] == pitch].copy()
-    data['period_idx'] = data['period'].map(period_order)
-    data = data.sort_values('period_idx')
-    if len(data) > 0:
-        ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
-
-ax.set_ylabel('Whiff Rate (%)')
-ax.set_title('Shota Imanaga - Whiff Rate by Pitch Type')
-ax.legend()
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    period_order = {p: i for i, p in enumerate(PERIODS)}
+    for pitch in top_pitches:
+        data = whiff[whiff['pitch_type'] == pitch].copy()
+        data['period_idx'] = data['period'].map(period_order)
+        data = data.sort_values('period_idx')
+        if len(data) > 0:
+            ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
+
+    ax.set_ylabel('Whiff Rate (%)')
+    ax.set_title('Shota Imanaga - Whiff Rate by Pitch Type')
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Whiff Rate by Pitch Type ===')
@@ -305,6 +375,7 @@ if len(whiff_pivot.columns) > 0:
     whiff_pivot = whiff_pivot.reindex(columns=PERIODS)
 print(whiff_pivot.round(1).to_string())
 
+tracer.mark('two_strike')
 two_strike = con.execute("""
     SELECT
         period,
@@ -331,30 +402,18 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['pitch_type', 'pitches', 'pct', 'whiff_rate']].to_string(index=False))
 
-count_analysis = con.execute("""
+tracer.mark('counts')
+count_analysis = con.execute(f"""
     SELECT
         period,
-        CASE
-            WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-            WHEN balls > strikes THEN 'Behind'
-            WHEN strikes > balls THEN 'Ahead'
-            ELSE 'Even'
-        END as count_situation,
+        {COUNT_STATE_LABEL} as count_situation,
         pitch_type,
         COUNT(*) as pitches,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(
-            PARTITION BY period,
-            CASE
-                WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-                WHEN balls > strikes THEN 'Behind'
-                WHEN strikes > balls THEN 'Ahead'
-                ELSE 'Even'
-            END
-        ), 1) as pct
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period, count_state), 1) as pct
     FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, count_situation, pitch_type
-    ORDER BY period, count_situation, pitches DESC
+    WHERE pitch_type IS NOT NULL AND count_state >= 0
+    GROUP BY period, count_state, pitch_type
+    ORDER BY period, count_state, pitches DESC
 """).df()
 
 print('=== Pitch Selection by Count Situation ===')
@@ -369,6 +428,7 @@ for period in PERIODS:
             top_str = ', '.join([f"{r['pitch_type']} {r['pct']}%" for _, r in data.iterrows()])
             print(f'  {situation}: {top_str}')
 
+tracer.mark('batted')
 batted = con.execute("""
     SELECT
         period,
@@ -408,6 +468,7 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['pitch_type', 'batted_balls', 'avg_exit_velo', 'avg_xBA']].to_string(index=False))
 
+tracer.mark('tto')
 # Time Through Order analysis
 # at_bat_number resets per game, we approximate TTO by grouping at_bat_number
 tto = con.execute("""
@@ -495,6 +556,7 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['tto', 'batted_balls', 'avg_exit_velo', 'avg_xwOBA']].to_string(index=False))
 
+tracer.mark('lr_splits')
 # L/R splits - pitch usage and effectiveness
 lr_arsenal = con.execute("""
     SELECT
@@ -568,45 +630,47 @@ lr_st = con.execute("""
 print('\n=== ST (Sweeper) Left/Right Splits ===')
 print(lr_st.to_string(index=False))
 
+tracer.mark('monthly_batted')
 # Monthly batted ball metrics
-monthly_batted = con.execute("""
+monthly_batted = con.execute(f"""
     SELECT
         season,
-        EXTRACT(MONTH FROM game_date::DATE) as month,
-        COUNT(*) as batted_balls,
-        ROUND(AVG(launch_speed), 1) as avg_exit_velo,
-        ROUND(100.0 * SUM(CASE WHEN launch_speed >= 95 THEN 1 ELSE 0 END) / COUNT(*), 1) as hard_hit_pct,
-        ROUND(AVG(estimated_woba_using_speedangle), 3) as avg_xwOBA
-    FROM df
-    WHERE launch_speed IS NOT NULL
+        EXTRACT(MONTH FROM game_date) as month,
+        SUM(ev_n) as batted_balls,
+        ROUND({avg_sql('ev')}, 1) as avg_exit_velo,
+        ROUND(100.0 * SUM(hard_hit) / NULLIF(SUM(ev_n), 0), 1) as hard_hit_pct,
+        ROUND({avg_sql('xwoba')}, 3) as avg_xwOBA
+    FROM pitch_game_rollup
+    WHERE pitcher = {PITCHER_ID}
     GROUP BY season, month
-    HAVING COUNT(*) >= 20
+    HAVING SUM(ev_n) >= 20
     ORDER BY season, month
 """).df()
 
 # Plot xwOBA monthly
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-
-for year in YEARS:
-    data = monthly_batted[monthly_batted['season'] == year]
-    axes[0].plot(data['month'], data['avg_xwOBA'], marker='o', label=str(year), linewidth=2)
-    axes[1].plot(data['month'], data['hard_hit_pct'], marker='o', label=str(year), linewidth=2)
-
-axes[0].axvline(x=7, color='gray', linestyle='--', alpha=0.5)
-axes[0].set_xlabel('Month')
-axes[0].set_ylabel('xwOBA')
-axes[0].set_title('Monthly xwOBA (lower = better)')
-axes[0].legend()
-
-axes[1].axvline(x=7, color='gray', linestyle='--', alpha=0.5)
-axes[1].set_xlabel('Month')
-axes[1].set_ylabel('Hard Hit %')
-axes[1].set_title('Monthly Hard Hit % (lower = better)')
-axes[1].legend()
-
-plt.suptitle('Shota Imanaga - Monthly Batted Ball Quality')
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+
+    for year in YEARS:
+        data = monthly_batted[monthly_batted['season'] == year]
+        axes[0].plot(data['month'], data['avg_xwOBA'], marker='o', label=str(year), linewidth=2)
+        axes[1].plot(data['month'], data['hard_hit_pct'], marker='o', label=str(year), linewidth=2)
+
+    axes[0].axvline(x=7, color='gray', linestyle='--', alpha=0.5)
+    axes[0].set_xlabel('Month')
+    axes[0].set_ylabel('xwOBA')
+    axes[0].set_title('Monthly xwOBA (lower = better)')
+    axes[0].legend()
+
+    axes[1].axvline(x=7, color='gray', linestyle='--', alpha=0.5)
+    axes[1].set_xlabel('Month')
+    axes[1].set_ylabel('Hard Hit %')
+    axes[1].set_title('Monthly Hard Hit % (lower = better)')
+    axes[1].legend()
+
+    plt.suptitle('Shota Imanaga - Monthly Batted Ball Quality')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('=== Monthly Batted Ball Metrics ===')
@@ -615,6 +679,7 @@ for year in YEARS:
     print(f'\n--- {year} ---')
     print(data[['month', 'batted_balls', 'avg_exit_velo', 'hard_hit_pct', 'avg_xwOBA']].to_string(index=False))
 
+tracer.mark('fs_zone')
 # FS zone analysis
 # zone 1-9 = strike zone, 11-14 = chase/waste zones
 fs_zone = con.execute("""
@@ -653,37 +718,38 @@ for period in PERIODS:
     print(data[['zone_type', 'pitches', 'pct', 'swing_rate', 'whiff_rate']].to_string(index=False))
 
 # FS location scatter by period
-fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-
-for i, period in enumerate(PERIODS):
-    fs_data = con.execute(f"""
-        SELECT plate_x, plate_z, description
-        FROM df
-        WHERE pitch_type = 'FS' AND period = '{period}'
-          AND plate_x IS NOT NULL AND plate_z IS NOT NULL
-    """).df()
-
-    whiff_mask = fs_data['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
-
-    axes[i].scatter(fs_data[~whiff_mask]['plate_x'], fs_data[~whiff_mask]['plate_z'],
-                    alpha=0.3, s=20, c='gray', label='Other')
-    axes[i].scatter(fs_data[whiff_mask]['plate_x'], fs_data[whiff_mask]['plate_z'],
-                    alpha=0.7, s=30, c='red', label='Whiff')
-
-    # Strike zone box (approximate)
-    axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
-                 [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
-    axes[i].set_xlim(-2.5, 2.5)
-    axes[i].set_ylim(0, 5)
-    axes[i].set_title(f'FS Location - {period}')
-    axes[i].set_xlabel('Plate X')
-    axes[i].set_ylabel('Plate Z')
-    axes[i].legend(fontsize=8)
-    axes[i].set_aspect('equal')
-
-plt.suptitle('Shota Imanaga - FS (Split-finger) Location by Period')
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+
+    for i, period in enumerate(PERIODS):
+        fs_data = con.execute(f"""
+            SELECT plate_x, plate_z, description
+            FROM df
+            WHERE pitch_type = 'FS' AND period = '{period}'
+              AND plate_x IS NOT NULL AND plate_z IS NOT NULL
+        """).df()
+
+        whiff_mask = fs_data['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
+
+        dense_scatter(axes[i], fs_data[~whiff_mask]['plate_x'], fs_data[~whiff_mask]['plate_z'],
+                      alpha=0.3, s=20, c='gray', label='Other')
+        dense_scatter(axes[i], fs_data[whiff_mask]['plate_x'], fs_data[whiff_mask]['plate_z'],
+                      alpha=0.7, s=30, c='red', label='Whiff')
+
+        # Strike zone box (approximate)
+        axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
+                     [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
+        axes[i].set_xlim(-2.5, 2.5)
+        axes[i].set_ylim(0, 5)
+        axes[i].set_title(f'FS Location - {period}')
+        axes[i].set_xlabel('Plate X')
+        axes[i].set_ylabel('Plate Z')
+        axes[i].legend(fontsize=8)
+        axes[i].set_aspect('equal')
+
+    plt.suptitle('Shota Imanaga - FS (Split-finger) Location by Period')
+    plt.tight_layout()
+    plt.show()
 
 # Average FS location
 fs_location = con.execute("""
@@ -703,6 +769,7 @@ fs_location = con.execute("""
 print('\n=== FS Average Location & Movement ===')
 print(fs_location.to_string(index=False))
 
+tracer.mark('summary_text')
 print('=' * 60)
 print('SHOTA IMANAGA 2024-2025 ANALYSIS SUMMARY')
 print('=' * 60)
@@ -747,3 +814,32 @@ for _, row in batted.iterrows():
     print(f'  {row["period"]}: xwOBA {row["avg_xwOBA"]}, Hard Hit {row["hard_hit_pct"]}%, Exit Velo {row["avg_exit_velo"]} mph')
 
 print('\n' + '=' * 60)
+
+tracer.mark('report')
+# Structured output: one record (section id, run parameters, result table) per section
+with ReportSink(REPORT_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS, 'game_type': GAME_TYPE, 'asb_date': ASB_DATE}) as report:
+    for section, table in [
+        ('change_points', change_points),
+        ('sweep', sweep),
+        ('summary', summary),
+        ('arsenal', arsenal),
+        ('velo_by_period', velo_by_period),
+        ('monthly_velo', monthly_velo),
+        ('fatigue', fatigue),
+        ('whiff', whiff),
+        ('two_strike', two_strike),
+        ('count_analysis', count_analysis),
+        ('batted', batted),
+        ('batted_by_pitch', batted_by_pitch),
+        ('tto', tto),
+        ('tto_batted', tto_batted),
+        ('lr_arsenal', lr_arsenal),
+        ('lr_batted', lr_batted),
+        ('lr_st', lr_st),
+        ('monthly_batted', monthly_batted),
+        ('fs_zone', fs_zone),
+        ('fs_location', fs_location),
+    ]:
+        report.emit(section, table)
+
+tracer.close()
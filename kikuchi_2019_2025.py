@@ -2,20 +2,44 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pybaseball import statcast_pitcher
 import duckdb
 
-plt.style.use('ggplot')
-plt.rcParams['figure.figsize'] = (14, 6)
-plt.rcParams['font.size'] = 12
+from statcast_tools.bootstrap import bootstrap_rates
+from statcast_tools.changepoint import game_series, propose_splits
+from statcast_tools.cube import PitchCube
+from statcast_tools.deltas import pair_changes, period_deltas
+from statcast_tools.lazy import lazy_import
+from statcast_tools.pitch_classes import classify_pitches
+from statcast_tools.profiling import Tracer
+from statcast_tools.raster import dense_scatter  # aggregates to one image above a point-count threshold
+from statcast_tools.report import ReportSink
+from statcast_tools.shared import SharedDataset
+from statcast_tools.split_sweep import split_sweep
+from statcast_tools.store import PitchStore
+
+
+def apply_style(plt):
+    plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (14, 6)
+    plt.rcParams['font.size'] = 12
+
+
+# Plotting and fetching libraries load on first use, so text-only runs skip their import cost
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+statcast_pitcher = lazy_import('pybaseball', 'statcast_pitcher')
 
 # ====== Settings ======
 PITCHER_ID = 579328  # Yusei Kikuchi MLBAM ID
 YEARS = list(range(2019, 2026))
 GAME_TYPE = 'R'  # Regular season only
 TRADE_DATE = '2024-07-30'  # Traded to Astros on Jul 29
+REPORT_PATH = None  # e.g. 'reports/kikuchi.jsonl' (or .parquet): one structured record per section
+TRACE_PATH = None  # e.g. 'traces/kikuchi.jsonl': per-section time / rows / memory, one file per run
+PROFILE_QUERIES = False  # with TRACE_PATH: also record DuckDB's JSON profile for every query
+STORE_PATH = None  # e.g. 'data/statcast': Hive-partitioned local store; stored seasons are read, not re-fetched
+SHARED_PATH = None  # e.g. '/dev/shm/statcast.arrow' from `python -m statcast_tools.shared`: attach zero-copy instead of loading
+PLOTS = True  # False = text-only run: figures are skipped and matplotlib / seaborn are never imported
 # ======================
 
 PERIOD_ORDER = ['2019', '2020', '2021', '2022', '2023', '2024-TOR', '2024-HOU', '2025']
@@ -27,19 +51,31 @@ TEAM_MAP = {
     '2024-HOU': 'HOU', '2025': 'LAA'
 }
 
+tracer = Tracer(TRACE_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS}, profile=PROFILE_QUERIES)
+tracer.mark('fetch')
+store = PitchStore(STORE_PATH, key='pitcher') if STORE_PATH else None
+source = SharedDataset(SHARED_PATH) if SHARED_PATH else store  # shared copy first, then the local store
 dfs = []
 for year in YEARS:
-    print(f'Fetching {year}...')
-    df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
-    df_year['season'] = year
+    if source is not None and source.has(year, PITCHER_ID):
+        # only this season / game type / pitcher is read (from shared memory or the store's partitions)
+        print(f'Loading {year} from {SHARED_PATH or STORE_PATH}...')
+        df_year = source.scan([year], [GAME_TYPE], [PITCHER_ID])
+    else:
+        print(f'Fetching {year}...')
+        df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
+        df_year['season'] = year
+        if store is not None:
+            store.write(df_year)
     dfs.append(df_year)
     print(f'  {year}: {len(df_year):,} pitches')
 
 df_raw = pd.concat(dfs, ignore_index=True)
 print(f'\nTotal (raw): {len(df_raw):,} pitches')
 
+tracer.mark('filter')
 # Filter regular season + add period column
-con = duckdb.connect()
+con = tracer.connect(duckdb.connect())  # records each query while tracing
 df = con.execute(f"""
     SELECT *,
         CASE
@@ -58,12 +94,27 @@ for period in PERIOD_ORDER:
     if n > 0:
         print(f'  {period} ({TEAM_MAP.get(period, "?")}): {n:,} pitches')
 
+tracer.mark('change_points')
+# CUSUM change-point scan over the per-game series: compare proposed breaks with TRADE_DATE
+change_points = propose_splits(game_series(con, df), max_splits=3)
+print(f'\n=== Proposed split dates (manual TRADE_DATE: {TRADE_DATE}) ===')
+print(change_points.drop(columns='pitcher').to_string(index=False))
+
+# Sensitivity of the 2024 pre/post comparison to the split date (every game date at once)
+sweep = split_sweep(df[df['season'] == 2024])
+near = (sweep['split_date'] - pd.Timestamp(TRADE_DATE)).abs() <= pd.Timedelta(days=21)
+print(f'\n=== Split-date sensitivity around TRADE_DATE ({TRADE_DATE}) ===')
+print(sweep.loc[near, ['split_date', 'pre_pitches', 'post_pitches', 'whiff_rate_delta',
+                       'velo_delta', 'xwOBA_delta', 'mix_shift']]
+      .round({'whiff_rate_delta': 3, 'velo_delta': 3, 'xwOBA_delta': 3, 'mix_shift': 3}).to_string(index=False))
+
 PERIOD_SORT = """CASE period
     WHEN '2019' THEN 1 WHEN '2020' THEN 2 WHEN '2021' THEN 3
     WHEN '2022' THEN 4 WHEN '2023' THEN 5 WHEN '2024-TOR' THEN 6
     WHEN '2024-HOU' THEN 7 WHEN '2025' THEN 8
 END"""
 
+tracer.mark('summary')
 summary = con.execute(f"""
     SELECT
         period,
@@ -85,6 +136,7 @@ for _, row in summary.iterrows():
     team = TEAM_MAP.get(row['period'], '?')
     print(f'  {row["period"]} ({team}): {int(row["games"])} GS, {int(row["pitches"]):,} pitches')
 
+tracer.mark('arsenal')
 arsenal = con.execute(f"""
     SELECT
         period,
@@ -119,32 +171,40 @@ available_periods = [p for p in PERIOD_ORDER if p in mix_pivot.index]
 mix_pivot = mix_pivot.reindex(available_periods)
 
 plot_cols = [col for col in top_pitches_overall if col in mix_pivot.columns]
-mix_pivot[plot_cols].plot(kind='bar', stacked=True, figsize=(14, 7), colormap='Set2')
-plt.title('Yusei Kikuchi - Pitch Mix Evolution (2019-2025)')
-plt.xlabel('Period')
-plt.ylabel('Usage %')
-plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    apply_style(plt)  # before the first figure: DataFrame.plot builds its axes without going through plt
+    mix_pivot[plot_cols].plot(kind='bar', stacked=True, figsize=(14, 7), colormap='Set2')
+    plt.title('Yusei Kikuchi - Pitch Mix Evolution (2019-2025)')
+    plt.xlabel('Period')
+    plt.ylabel('Usage %')
+    plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Pitch Mix (% usage) ===')
 print(mix_pivot[plot_cols].round(1).to_string())
 
+# Usage / velocity / whiff / movement deltas for all period pairs (28 for 8 periods) in one broadcast
+period_profile = PitchCube.from_pitches(con, df, axes=('period', 'pitch_type')).rollup(
+    ['period', 'pitch_type'], pct_within=['period'], dropna=('pitch_type',))
+deltas = period_deltas(period_profile, available_periods, min_pitches=30)
+
 print(f'\n=== Key Changes ===')
 for pair in [('2023', '2024-TOR'), ('2024-TOR', '2024-HOU'), ('2024-HOU', '2025')]:
     p1, p2 = pair
     if p1 in mix_pivot.index and p2 in mix_pivot.index:
-        first = mix_pivot.loc[p1]
-        last = mix_pivot.loc[p2]
-        diff = (last - first).sort_values()
-        changes = [(p, c) for p, c in diff.items() if abs(c) >= 3.0]
-        if changes:
+        changes = pair_changes(deltas, p1, p2, min_abs=3.0)
+        if len(changes) > 0:
             print(f'\n  {p1} -> {p2}:')
-            for pitch, change in changes:
-                direction = '+' if change > 0 else ''
-                print(f'    {pitch}: {first[pitch]:.1f}% -> {last[pitch]:.1f}% ({direction}{change:.1f}%)')
+            for _, row in changes.iterrows():
+                direction = '+' if row['delta'] > 0 else ''
+                print(f"    {row['pitch_type']}: {row['before']:.1f}% -> {row['after']:.1f}% ({direction}{row['delta']:.1f}%)")
+
+print('\n=== Largest Shifts, All Period Pairs (score = change / notable change) ===')
+print(deltas.head(15).round(2).to_string(index=False))
 
+tracer.mark('slider')
 # Identify slider pitch type(s) - could be SL or ST
 slider_types = con.execute("""
     SELECT pitch_type, COUNT(*) as cnt
@@ -159,6 +219,26 @@ print(slider_types.to_string(index=False))
 slider_type = slider_types.iloc[0]['pitch_type'] if len(slider_types) > 0 else 'SL'
 print(f'\nPrimary slider type: {slider_type}')
 
+# Label-independent pitch classes (clustered on movement/velo/spin over all seasons),
+# so SL-vs-ST relabelling does not split the same slider across years
+df['pitch_class'], pitch_class_centroids = classify_pitches(df)
+print('\n=== Pitch Classes (clustered) ===')
+print(pitch_class_centroids[['pitch_class', 'pitches', 'release_speed', 'pfx_x', 'pfx_z', 'labels']]
+      .round(2).to_string(index=False))
+
+class_by_period = con.execute(f"""
+    SELECT period, pitch_class, pitch_type, COUNT(*) as pitches
+    FROM df
+    WHERE pitch_class IS NOT NULL
+    GROUP BY period, pitch_class, pitch_type
+    ORDER BY {PERIOD_SORT}, pitch_class, pitches DESC
+""").df()
+print('\n=== Statcast Label → Pitch Class by Period ===')
+print(class_by_period.pivot_table(index=['pitch_class', 'pitch_type'], columns='period',
+                                  values='pitches', fill_value=0)
+      .reindex(columns=[p for p in PERIOD_ORDER if p in class_by_period['period'].unique()])
+      .to_string())
+
 # Slider analysis by period
 sl_analysis = con.execute(f"""
     SELECT
@@ -187,36 +267,47 @@ sl_analysis = con.execute(f"""
 print(f'\n=== {slider_type} Analysis by Period ===')
 print(sl_analysis.to_string(index=False))
 
-# Slider location scatter: 2024-TOR vs 2024-HOU vs 2025
-fig, axes = plt.subplots(1, 3, figsize=(15, 5))
-compare_periods = ['2024-TOR', '2024-HOU', '2025']
-for i, period in enumerate(compare_periods):
-    sl_data = con.execute(f"""
-        SELECT plate_x, plate_z, description
-        FROM df
-        WHERE pitch_type = '{slider_type}' AND period = '{period}'
-          AND plate_x IS NOT NULL AND plate_z IS NOT NULL
-    """).df()
-    if len(sl_data) > 0:
-        whiff_mask = sl_data['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
-        axes[i].scatter(sl_data[~whiff_mask]['plate_x'], sl_data[~whiff_mask]['plate_z'],
-                        alpha=0.3, s=20, c='gray', label='Other')
-        axes[i].scatter(sl_data[whiff_mask]['plate_x'], sl_data[whiff_mask]['plate_z'],
-                        alpha=0.7, s=30, c='red', label='Whiff')
-    axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
-                 [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
-    axes[i].set_xlim(-2.5, 2.5)
-    axes[i].set_ylim(0, 5)
-    axes[i].set_title(f'{slider_type} - {period}')
-    axes[i].set_xlabel('Plate X')
-    axes[i].set_ylabel('Plate Z')
-    axes[i].legend(fontsize=8)
-    axes[i].set_aspect('equal')
-
-plt.suptitle(f'Yusei Kikuchi - {slider_type} Location: Before & After Trade')
-plt.tight_layout()
-plt.show()
+# 95% bootstrap CIs for the slider rates (resampling plate appearances)
+sl_ci = bootstrap_rates(df[df['pitch_type'] == slider_type], ['period'], unit='pa', n_boot=2000)
+print(f'\n=== {slider_type} Rates with 95% CI (PA bootstrap) ===')
+for period in KEY_PERIODS:
+    data = sl_ci[sl_ci['period'] == period]
+    if len(data) > 0:
+        parts = [f"{r['metric']} {r['estimate']:.3f} [{r['lo']:.3f}, {r['hi']:.3f}]" for _, r in data.iterrows()]
+        print(f'  {period}: ' + ', '.join(parts))
 
+# Slider location scatter: 2024-TOR vs 2024-HOU vs 2025
+if PLOTS:
+    fig, axes = plt.subplots(1, 3, figsize=(15, 5))
+    compare_periods = ['2024-TOR', '2024-HOU', '2025']
+    for i, period in enumerate(compare_periods):
+        sl_data = con.execute(f"""
+            SELECT plate_x, plate_z, description
+            FROM df
+            WHERE pitch_type = '{slider_type}' AND period = '{period}'
+              AND plate_x IS NOT NULL AND plate_z IS NOT NULL
+        """).df()
+        if len(sl_data) > 0:
+            whiff_mask = sl_data['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
+            dense_scatter(axes[i], sl_data[~whiff_mask]['plate_x'], sl_data[~whiff_mask]['plate_z'],
+                          alpha=0.3, s=20, c='gray', label='Other')
+            dense_scatter(axes[i], sl_data[whiff_mask]['plate_x'], sl_data[whiff_mask]['plate_z'],
+                          alpha=0.7, s=30, c='red', label='Whiff')
+        axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
+                     [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
+        axes[i].set_xlim(-2.5, 2.5)
+        axes[i].set_ylim(0, 5)
+        axes[i].set_title(f'{slider_type} - {period}')
+        axes[i].set_xlabel('Plate X')
+        axes[i].set_ylabel('Plate Z')
+        axes[i].legend(fontsize=8)
+        axes[i].set_aspect('equal')
+
+    plt.suptitle(f'Yusei Kikuchi - {slider_type} Location: Before & After Trade')
+    plt.tight_layout()
+    plt.show()
+
+tracer.mark('velocity')
 velo_by_period = con.execute("""
     SELECT
         period,
@@ -238,26 +329,27 @@ top_pitches = con.execute("""
     LIMIT 4
 """).df()['pitch_type'].tolist()
 
-fig, axes = plt.subplots(1, 2, figsize=(16, 6))
-period_idx = {p: i for i, p in enumerate(PERIOD_ORDER)}
-for pitch in top_pitches:
-    data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
-    data['idx'] = data['period'].map(period_idx)
-    data = data.dropna(subset=['idx']).sort_values('idx')
-    if len(data) >= 2:
-        axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
-        axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
-
-for ax in axes:
-    ax.tick_params(axis='x', rotation=45)
-    ax.legend()
-axes[0].set_title('Average Velocity by Period')
-axes[0].set_ylabel('Velocity (mph)')
-axes[1].set_title('Average Spin Rate by Period')
-axes[1].set_ylabel('Spin Rate (rpm)')
-plt.suptitle('Yusei Kikuchi - Velocity & Spin Trends (2019-2025)')
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+    period_idx = {p: i for i, p in enumerate(PERIOD_ORDER)}
+    for pitch in top_pitches:
+        data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
+        data['idx'] = data['period'].map(period_idx)
+        data = data.dropna(subset=['idx']).sort_values('idx')
+        if len(data) >= 2:
+            axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
+            axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
+
+    for ax in axes:
+        ax.tick_params(axis='x', rotation=45)
+        ax.legend()
+    axes[0].set_title('Average Velocity by Period')
+    axes[0].set_ylabel('Velocity (mph)')
+    axes[1].set_title('Average Spin Rate by Period')
+    axes[1].set_ylabel('Spin Rate (rpm)')
+    plt.suptitle('Yusei Kikuchi - Velocity & Spin Trends (2019-2025)')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Velocity & Spin by Period (Top Pitches) ===')
@@ -270,6 +362,7 @@ for pitch in top_pitches:
 ff_type = 'FF' if 'FF' in top_pitches else top_pitches[0]
 fatigue_periods = ['2023', '2024-TOR', '2024-HOU', '2025']
 
+tracer.mark('fatigue')
 fatigue = con.execute(f"""
     SELECT
         period,
@@ -284,19 +377,20 @@ fatigue = con.execute(f"""
     ORDER BY period, inning
 """).df()
 
-fig, ax = plt.subplots(figsize=(12, 6))
-for period in fatigue_periods:
-    data = fatigue[fatigue['period'] == period]
-    if len(data) > 0:
-        ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for period in fatigue_periods:
+        data = fatigue[fatigue['period'] == period]
+        if len(data) > 0:
+            ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
 
-ax.set_xlabel('Inning')
-ax.set_ylabel(f'{ff_type} Velocity (mph)')
-ax.set_title(f'Yusei Kikuchi - {ff_type} Velocity by Inning')
-ax.set_xticks(range(1, 9))
-ax.legend()
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel('Inning')
+    ax.set_ylabel(f'{ff_type} Velocity (mph)')
+    ax.set_title(f'Yusei Kikuchi - {ff_type} Velocity by Inning')
+    ax.set_xticks(range(1, 9))
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print(f'\n=== {ff_type} Velocity by Inning ===')
@@ -314,6 +408,7 @@ for period in fatigue_periods:
         drop = last_velo - first_velo
         print(f'  {period}: {first_velo} -> {last_velo} (inn {last_inn}) = {drop:+.1f} mph')
 
+tracer.mark('whiff')
 whiff = con.execute(f"""
     SELECT
         period,
@@ -341,21 +436,22 @@ whiff = con.execute(f"""
     ORDER BY {PERIOD_SORT}, total_pitches DESC
 """).df()
 
-fig, ax = plt.subplots(figsize=(14, 6))
-period_idx = {p: i for i, p in enumerate(KEY_PERIODS)}
-for pitch in top_pitches:
-    data = whiff[(whiff['pitch_type'] == pitch) & (whiff['period'].isin(KEY_PERIODS))].copy()
-    data['idx'] = data['period'].map(period_idx)
-    data = data.dropna(subset=['idx']).sort_values('idx')
-    if len(data) >= 2:
-        ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
-
-ax.set_ylabel('Whiff Rate (%)')
-ax.set_title('Yusei Kikuchi - Whiff Rate by Pitch Type (Key Periods)')
-ax.tick_params(axis='x', rotation=45)
-ax.legend()
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(14, 6))
+    period_idx = {p: i for i, p in enumerate(KEY_PERIODS)}
+    for pitch in top_pitches:
+        data = whiff[(whiff['pitch_type'] == pitch) & (whiff['period'].isin(KEY_PERIODS))].copy()
+        data['idx'] = data['period'].map(period_idx)
+        data = data.dropna(subset=['idx']).sort_values('idx')
+        if len(data) >= 2:
+            ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
+
+    ax.set_ylabel('Whiff Rate (%)')
+    ax.set_title('Yusei Kikuchi - Whiff Rate by Pitch Type (Key Periods)')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Whiff Rate by Pitch Type (Key Periods) ===')
@@ -364,6 +460,7 @@ whiff_pivot = whiff_key.pivot_table(index='pitch_type', columns='period', values
 whiff_pivot = whiff_pivot.reindex(columns=KEY_PERIODS)
 print(whiff_pivot.round(1).to_string())
 
+tracer.mark('two_strike')
 two_strike = con.execute(f"""
     SELECT
         period,
@@ -392,6 +489,7 @@ for period in ['2023', '2024-TOR', '2024-HOU', '2025']:
         print(f'\n--- {period} ({TEAM_MAP.get(period, "?")}) ---')
         print(data[['pitch_type', 'pitches', 'pct', 'whiff_rate']].to_string(index=False))
 
+tracer.mark('batted')
 batted = con.execute(f"""
     SELECT
         period,
@@ -433,6 +531,7 @@ for period in ['2023', '2024-TOR', '2024-HOU', '2025']:
         print(f'\n--- {period} ---')
         print(data[['pitch_type', 'batted_balls', 'avg_exit_velo', 'avg_xBA']].to_string(index=False))
 
+tracer.mark('release')
 release = con.execute(f"""
     SELECT
         period,
@@ -452,68 +551,71 @@ release = con.execute(f"""
 
 ff_release = release[release['pitch_type'] == ff_type]
 
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
-colors = plt.cm.Set2(np.linspace(0, 1, len(KEY_PERIODS)))
-for i, period in enumerate(KEY_PERIODS):
-    data = ff_release[ff_release['period'] == period]
-    if len(data) > 0:
-        axes[0].scatter(data['avg_rel_x'], data['avg_rel_z'], s=200, c=[colors[i]],
-                       label=period, zorder=5, edgecolors='black')
-
-axes[0].set_xlabel('Release X (ft, + = 1B side)')
-axes[0].set_ylabel('Release Z (ft)')
-axes[0].set_title(f'{ff_type} Release Point by Period')
-axes[0].legend()
-
-# Extension comparison
-ext_data = ff_release[['period', 'avg_extension']].set_index('period')
-ext_data = ext_data.reindex([p for p in KEY_PERIODS if p in ext_data.index])
-if len(ext_data) > 0:
-    axes[1].bar(ext_data.index, ext_data['avg_extension'], color=colors[:len(ext_data)])
-    axes[1].set_ylabel('Extension (ft)')
-    axes[1].set_title(f'{ff_type} Release Extension')
-    axes[1].tick_params(axis='x', rotation=45)
-
-plt.suptitle('Yusei Kikuchi - Release Point Analysis')
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    colors = plt.cm.Set2(np.linspace(0, 1, len(KEY_PERIODS)))
+    for i, period in enumerate(KEY_PERIODS):
+        data = ff_release[ff_release['period'] == period]
+        if len(data) > 0:
+            axes[0].scatter(data['avg_rel_x'], data['avg_rel_z'], s=200, c=[colors[i]],
+                           label=period, zorder=5, edgecolors='black')
+
+    axes[0].set_xlabel('Release X (ft, + = 1B side)')
+    axes[0].set_ylabel('Release Z (ft)')
+    axes[0].set_title(f'{ff_type} Release Point by Period')
+    axes[0].legend()
+
+    # Extension comparison
+    ext_data = ff_release[['period', 'avg_extension']].set_index('period')
+    ext_data = ext_data.reindex([p for p in KEY_PERIODS if p in ext_data.index])
+    if len(ext_data) > 0:
+        axes[1].bar(ext_data.index, ext_data['avg_extension'], color=colors[:len(ext_data)])
+        axes[1].set_ylabel('Extension (ft)')
+        axes[1].set_title(f'{ff_type} Release Extension')
+        axes[1].tick_params(axis='x', rotation=45)
+
+    plt.suptitle('Yusei Kikuchi - Release Point Analysis')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print(f'\n=== {ff_type} Release Point by Period ===')
 print(ff_release[['period', 'avg_rel_x', 'avg_rel_z', 'avg_extension', 'pitches']].to_string(index=False))
 
-fig, axes = plt.subplots(1, len(KEY_PERIODS), figsize=(4*len(KEY_PERIODS), 5))
-
-for i, period in enumerate(KEY_PERIODS):
-    pitch_data = con.execute(f"""
-        SELECT
-            pitch_type,
-            AVG(pfx_x) as h_break,
-            AVG(pfx_z) as v_break,
-            COUNT(*) as cnt
-        FROM df
-        WHERE period = '{period}'
-          AND pitch_type IS NOT NULL
-          AND pfx_x IS NOT NULL
-        GROUP BY pitch_type
-        HAVING COUNT(*) >= 10
-    """).df()
-    for _, row in pitch_data.iterrows():
-        axes[i].scatter(row['h_break'], row['v_break'], s=100, zorder=5)
-        axes[i].annotate(row['pitch_type'], (row['h_break'], row['v_break']),
-                        fontsize=10, fontweight='bold',
-                        xytext=(5, 5), textcoords='offset points')
-    axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.3)
-    axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.3)
-    axes[i].set_xlabel('H-Break (in)')
-    axes[i].set_ylabel('V-Break (in)')
-    axes[i].set_title(period)
-    axes[i].set_xlim(-25, 25)
-    axes[i].set_ylim(-25, 25)
-
-plt.suptitle('Yusei Kikuchi - Pitch Movement Profile (pitcher POV, inches)')
-plt.tight_layout()
-plt.show()
+tracer.mark('movement')
+if PLOTS:
+    fig, axes = plt.subplots(1, len(KEY_PERIODS), figsize=(4*len(KEY_PERIODS), 5))
+
+    for i, period in enumerate(KEY_PERIODS):
+        pitch_data = con.execute(f"""
+            SELECT
+                pitch_type,
+                AVG(pfx_x) as h_break,
+                AVG(pfx_z) as v_break,
+                COUNT(*) as cnt
+            FROM df
+            WHERE period = '{period}'
+              AND pitch_type IS NOT NULL
+              AND pfx_x IS NOT NULL
+            GROUP BY pitch_type
+            HAVING COUNT(*) >= 10
+        """).df()
+        for _, row in pitch_data.iterrows():
+            axes[i].scatter(row['h_break'], row['v_break'], s=100, zorder=5)
+            axes[i].annotate(row['pitch_type'], (row['h_break'], row['v_break']),
+                            fontsize=10, fontweight='bold',
+                            xytext=(5, 5), textcoords='offset points')
+        axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.3)
+        axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.3)
+        axes[i].set_xlabel('H-Break (in)')
+        axes[i].set_ylabel('V-Break (in)')
+        axes[i].set_title(period)
+        axes[i].set_xlim(-25, 25)
+        axes[i].set_ylim(-25, 25)
+
+    plt.suptitle('Yusei Kikuchi - Pitch Movement Profile (pitcher POV, inches)')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 movement = con.execute(f"""
@@ -538,6 +640,7 @@ for period in KEY_PERIODS:
         print(f'\n--- {period} ---')
         print(data[['pitch_type', 'h_break', 'v_break', 'pitches']].to_string(index=False))
 
+tracer.mark('lr_splits')
 lr_arsenal = con.execute(f"""
     SELECT
         period,
@@ -589,6 +692,7 @@ lr_batted = con.execute(f"""
 print('\n=== Batted Ball by Batter Side ===')
 print(lr_batted.to_string(index=False))
 
+tracer.mark('tto')
 tto = con.execute(f"""
     WITH batter_pa AS (
         SELECT
@@ -677,6 +781,7 @@ for period in ['2023', '2024-TOR', '2024-HOU', '2025']:
         print(f'\n--- {period} ---')
         print(data[['tto', 'batted_balls', 'avg_exit_velo', 'avg_xwOBA']].to_string(index=False))
 
+tracer.mark('summary_text')
 print('=' * 65)
 print('YUSEI KIKUCHI CAREER EVOLUTION SUMMARY (2019-2025)')
 print('=' * 65)
@@ -716,3 +821,34 @@ for _, row in batted.iterrows():
     print(f'  {row["period"]}: xwOBA {row["avg_xwOBA"]}, Hard Hit {row["hard_hit_pct"]}%')
 
 print('\n' + '=' * 65)
+
+tracer.mark('report')
+# Structured output: one record (section id, run parameters, result table) per section
+with ReportSink(REPORT_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS, 'game_type': GAME_TYPE, 'trade_date': TRADE_DATE}) as report:
+    for section, table in [
+        ('change_points', change_points),
+        ('sweep', sweep),
+        ('summary', summary),
+        ('arsenal', arsenal),
+        ('slider_types', slider_types),
+        ('pitch_class_centroids', pitch_class_centroids),
+        ('class_by_period', class_by_period),
+        ('sl_analysis', sl_analysis),
+        ('velo_by_period', velo_by_period),
+        ('fatigue', fatigue),
+        ('whiff', whiff),
+        ('two_strike', two_strike),
+        ('batted', batted),
+        ('batted_by_pitch', batted_by_pitch),
+        ('release', release),
+        ('movement', movement),
+        ('lr_arsenal', lr_arsenal),
+        ('lr_batted', lr_batted),
+        ('tto', tto),
+        ('tto_batted', tto_batted),
+        ('deltas', deltas),
+        ('sl_ci', sl_ci),
+    ]:
+        report.emit(section, table)
+
+tracer.close()
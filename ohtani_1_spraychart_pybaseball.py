@@ -1,16 +1,33 @@
 # !pip install pybaseball duckdb -q  # uncomment in Colab/notebook
 
-from pybaseball import statcast, spraychart
 import duckdb
 
+from statcast_tools.lazy import lazy_import
+from statcast_tools.shared import SharedDataset
+from statcast_tools.store import PitchStore
+
+# 取得・描画ライブラリ（pybaseball）は初回呼び出し時に読み込む
+statcast = lazy_import('pybaseball', 'statcast')
+spraychart = lazy_import('pybaseball', 'spraychart')
+
 # ====== 設定 ======
 BATTER_ID = 660271      # 大谷翔平 MLBAM ID
 SEASON_YEAR = 2025
 GAME_TYPE = "R"         # "R"=レギュラーシーズン, "P"=ポストシーズン, None=全試合
+STORE_PATH = None       # 例: 'data/statcast_batters' ローカル保存先（season/game_type/打者バケットで分割、保存済みシーズンは再取得しない）
+SHARED_PATH = None      # 例: '/dev/shm/statcast.arrow'（python -m statcast_tools.shared で公開した共有メモリ上のデータにゼロコピーで接続）
+PLOTS = True            # False: テキスト出力のみ（図を描かず、描画ライブラリも import しない）
 # ==================
 
-# Statcastデータ取得
-df_raw = statcast(start_dt=f'{SEASON_YEAR}-03-01', end_dt=f'{SEASON_YEAR}-12-31')
+# Statcastデータ取得（共有メモリ or 保存済みなら該当シーズン・試合種別・打者の分だけを読む）
+store = PitchStore(STORE_PATH, key='batter') if STORE_PATH else None
+source = SharedDataset(SHARED_PATH, key='batter') if SHARED_PATH else store
+if source is not None and source.has(SEASON_YEAR, BATTER_ID):
+    df_raw = source.scan([SEASON_YEAR], [GAME_TYPE] if GAME_TYPE else None, [BATTER_ID])
+else:
+    df_raw = statcast(start_dt=f'{SEASON_YEAR}-03-01', end_dt=f'{SEASON_YEAR}-12-31')
+    if store is not None:
+        store.write(df_raw)
 print(f"Total records (raw): {len(df_raw):,}")
 
 # game_typeでフィルタ
@@ -47,11 +64,12 @@ df_hr = con.execute("""
 
 print(f"Hits: {len(df_hits)}, All: {len(df_all)}, HR: {len(df_hr)}")
 
-# 汎用スタジアム + イベント別色分け（全データ）
-spraychart(df_hits, 'generic', title='Ohtani 2025 Hits (All Stadiums)', colorby='events')
+if PLOTS:
+    # 汎用スタジアム + イベント別色分け（全データ）
+    spraychart(df_hits, 'generic', title='Ohtani 2025 Hits (All Stadiums)', colorby='events')
 
-# 全打球
-spraychart(df_all, 'generic', title='Ohtani 2025 All Batted Balls', colorby='events')
+    # 全打球
+    spraychart(df_all, 'generic', title='Ohtani 2025 All Batted Balls', colorby='events')
 
 # 球場 → チームコードのマッピング
 STADIUM_TEAMS = {
@@ -81,9 +99,10 @@ def spraychart_by_stadium(df_data, stadium_name, con):
         return
 
     print(f"{stadium_name.upper()} ({team_code}): {len(df_stadium)} batted balls")
-    spraychart(df_stadium, stadium_name,
-               title=f'Ohtani 2025 @ {stadium_name.title()} ({len(df_stadium)} balls)',
-               colorby='events')
+    if PLOTS:
+        spraychart(df_stadium, stadium_name,
+                   title=f'Ohtani 2025 @ {stadium_name.title()} ({len(df_stadium)} balls)',
+                   colorby='events')
 
 # 各球場でのデータ件数を確認
 stadium_counts = con.execute("""
@@ -116,4 +135,5 @@ print(hr_by_stadium.to_string(index=False))
 df_hr_dodgers = con.execute("SELECT * FROM df_hr WHERE home_team = 'LAD'").df()
 if len(df_hr_dodgers) > 0:
     print(f"HR at Dodger Stadium: {len(df_hr_dodgers)}")
-    spraychart(df_hr_dodgers, 'dodgers', title=f'Ohtani 2025 HRs @ Dodger Stadium ({len(df_hr_dodgers)})')
+    if PLOTS:
+        spraychart(df_hr_dodgers, 'dodgers', title=f'Ohtani 2025 HRs @ Dodger Stadium ({len(df_hr_dodgers)})')
@@ -2,14 +2,38 @@
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pybaseball import statcast_pitcher
 import duckdb
 
-plt.style.use('ggplot')
-plt.rcParams['figure.figsize'] = (12, 6)
-plt.rcParams['font.size'] = 12
+from statcast_tools.anomaly import ReleaseMonitor
+from statcast_tools.bootstrap import bootstrap_rates
+from statcast_tools.changepoint import game_series, propose_splits
+from statcast_tools.counts import COUNT_STATE_LABEL, add_count_columns, count_matrices
+from statcast_tools.cube import PitchCube
+from statcast_tools.deltas import pair_changes, period_deltas
+from statcast_tools.lazy import lazy_import
+from statcast_tools.profiling import Tracer
+from statcast_tools.raster import dense_scatter  # aggregates to one image above a point-count threshold
+from statcast_tools.report import ReportSink
+from statcast_tools.rollup import GameRollup, avg_sql
+from statcast_tools.sections import SectionScheduler
+from statcast_tools.sequence import TransitionTensor
+from statcast_tools.shared import SharedDataset
+from statcast_tools.similarity import ArsenalIndex, arsenal_profiles
+from statcast_tools.split_sweep import split_sweep
+from statcast_tools.store import PitchStore
+from statcast_tools.trajectory import tunnel_pairs
+
+
+def apply_style(plt):
+    plt.style.use('ggplot')
+    plt.rcParams['figure.figsize'] = (12, 6)
+    plt.rcParams['font.size'] = 12
+
+
+# Plotting and fetching libraries load on first use, so text-only runs skip their import cost
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+statcast_pitcher = lazy_import('pybaseball', 'statcast_pitcher')
 
 # ====== Settings ======
 PITCHER_ID = 673540  # Kodai Senga MLBAM ID
@@ -19,21 +43,40 @@ GAME_TYPE = 'R'  # Regular season only
 # 2025 injury split: hamstring strain on June 12 vs Nationals
 # IL ~1 month, returned ~July 11
 INJURY_DATE = '2025-06-13'  # Games before this = pre-injury, after = post-injury
+REPORT_PATH = None  # e.g. 'reports/senga.jsonl' (or .parquet): one structured record per section
+TRACE_PATH = None  # e.g. 'traces/senga.jsonl': per-section time / rows / memory, one file per run
+PROFILE_QUERIES = False  # with TRACE_PATH: also record DuckDB's JSON profile for every query
+STORE_PATH = None  # e.g. 'data/statcast': Hive-partitioned local store; stored seasons are read, not re-fetched
+SHARED_PATH = None  # e.g. '/dev/shm/statcast.arrow' from `python -m statcast_tools.shared`: attach zero-copy instead of loading
+SECTION_WORKERS = 4  # section queries run at once on their own DuckDB cursors; 1 = one after another
+PLOTS = True  # False = text-only run: figures are skipped and matplotlib / seaborn are never imported
 # ======================
 
+tracer = Tracer(TRACE_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS}, profile=PROFILE_QUERIES)
+tracer.mark('fetch')
+store = PitchStore(STORE_PATH, key='pitcher') if STORE_PATH else None
+source = SharedDataset(SHARED_PATH) if SHARED_PATH else store  # shared copy first, then the local store
 dfs = []
 for year in YEARS:
-    print(f'Fetching {year}...')
-    df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
-    df_year['season'] = year
+    if source is not None and source.has(year, PITCHER_ID):
+        # only this season / game type / pitcher is read (from shared memory or the store's partitions)
+        print(f'Loading {year} from {SHARED_PATH or STORE_PATH}...')
+        df_year = source.scan([year], [GAME_TYPE], [PITCHER_ID])
+    else:
+        print(f'Fetching {year}...')
+        df_year = statcast_pitcher(f'{year}-03-01', f'{year}-12-31', PITCHER_ID)
+        df_year['season'] = year
+        if store is not None:
+            store.write(df_year)
     dfs.append(df_year)
     print(f'  {year}: {len(df_year):,} pitches')
 
 df_raw = pd.concat(dfs, ignore_index=True)
 print(f'\nTotal (raw): {len(df_raw):,} pitches')
 
+tracer.mark('filter')
 # Filter regular season only + split 2025 into pre/post injury
-con = duckdb.connect()
+con = tracer.connect(duckdb.connect())  # records each query while tracing
 df = con.execute(f"""
     SELECT *,
         CASE
@@ -47,6 +90,15 @@ df = con.execute(f"""
 """).df()
 
 print(f'Total (regular season): {len(df):,} pitches')
+add_count_columns(df)  # int8 count_idx (0-0 ... 3-2) and count_state, used by the count queries
+
+tracer.mark('rollup_cube')
+# Per-(pitcher, game, pitch_type) rollup: monthly/season trends scan this instead of every pitch
+rollup = GameRollup(con).update(df)
+
+# Pitch cube (period x pitch_type x stand x count x TTO x zone): zone/TTO breakdowns are array slices
+cube = PitchCube.from_pitches(con, df)
+
 print(f'\nPeriod breakdown:')
 PERIODS = []
 for p in ['2023', '2024', '2025-Pre', '2025-Post']:
@@ -61,10 +113,41 @@ for p in ['2023', '2024', '2025-Pre', '2025-Post']:
         }.get(p, p)
         print(f'  {label}: {n:,} pitches')
 
-if '2024' in PERIODS and len(df[df['period'] == '2024']) < 100:
-    print('\n⚠️ 2024 data is very limited (injury year). Some analyses may skip 2024.')
+tracer.mark('sections')
+# The section queries (and the pandas-side computations) are independent of each other:
+# run them concurrently on a pool of DuckDB cursors, then print and plot below in order
 
-summary = con.execute("""
+# Only use periods with enough data
+fatigue_periods = [p for p in PERIODS if len(df[df['period'] == p]) >= 200]
+
+# Streaming ±2σ monitor: running mean/variance per pitch type, each pitch scored
+# against the pitches before it (the monitor can keep absorbing new games)
+monitor = ReleaseMonitor(z_threshold=2.0, min_history=30)
+df_seq = df.sort_values(['game_date', 'at_bat_number', 'pitch_number'])
+
+
+def fatigue_sql(top_pitches):
+    ff_type = 'FF' if 'FF' in top_pitches else top_pitches[0]
+    return f"""
+        SELECT
+            period,
+            inning,
+            ROUND(AVG(release_speed), 1) as avg_velo,
+            COUNT(*) as pitches
+        FROM df
+        WHERE pitch_type = '{ff_type}' AND inning <= 8
+          AND period IN ({','.join(["'" + p + "'" for p in fatigue_periods])})
+        GROUP BY period, inning
+        HAVING COUNT(*) >= 5
+        ORDER BY period, inning
+    """
+
+
+sections = SectionScheduler(con, tables={'df': df}, workers=SECTION_WORKERS)
+# Change points and the split-date sweep (pandas / numpy work overlaps with the queries)
+sections.add('change_points', lambda cur: propose_splits(game_series(cur, df), max_splits=2))
+sections.add('sweep', lambda cur: split_sweep(df[df['season'] == 2025]))
+sections.query('summary', """
     SELECT
         period,
         COUNT(*) as pitches,
@@ -79,13 +162,8 @@ summary = con.execute("""
         WHEN '2023' THEN 1 WHEN '2024' THEN 2
         WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
     END
-""").df()
-
-print('=== Season Overview ===')
-print(summary.to_string(index=False))
-print(f'\nTotal: {len(df):,} pitches')
-
-arsenal = con.execute("""
+""")
+sections.query('arsenal', """
     SELECT
         period,
         pitch_type,
@@ -99,7 +177,320 @@ arsenal = con.execute("""
     WHERE pitch_type IS NOT NULL
     GROUP BY period, pitch_type
     ORDER BY period, count DESC
-""").df()
+""")
+sections.query('velo_by_period', """
+    SELECT
+        period,
+        pitch_type,
+        ROUND(AVG(release_speed), 1) as avg_velo,
+        ROUND(AVG(release_spin_rate), 0) as avg_spin,
+        COUNT(*) as count
+    FROM df
+    WHERE pitch_type IS NOT NULL
+    GROUP BY period, pitch_type
+    ORDER BY period
+""")
+sections.add('top_pitches', lambda cur: cur.execute("""
+    SELECT pitch_type FROM df
+    WHERE pitch_type IS NOT NULL
+    GROUP BY pitch_type
+    ORDER BY COUNT(*) DESC
+    LIMIT 4
+""").df()['pitch_type'].tolist())
+sections.query('monthly', f"""
+    SELECT
+        season,
+        EXTRACT(MONTH FROM game_date) as month,
+        SUM(pitches) as pitches,
+        COUNT(DISTINCT game_date) as games,
+        ROUND({avg_sql('velo', "pitch_type = 'FF'")}, 1) as ff_velo,
+        ROUND({avg_sql('velo', "pitch_type = 'FO'")}, 1) as fo_velo,
+        ROUND(100.0 * SUM(whiffs) / NULLIF(SUM(swings), 0), 1) as whiff_rate,
+        ROUND({avg_sql('xwoba')}, 3) as avg_xwOBA
+    FROM pitch_game_rollup
+    WHERE pitcher = {PITCHER_ID} AND season IN (2023, 2025)
+    GROUP BY season, month
+    HAVING SUM(pitches) >= 30
+    ORDER BY season, month
+""")
+sections.query('fatigue', fatigue_sql, after=['top_pitches'])
+sections.query('whiff', """
+    SELECT
+        period,
+        pitch_type,
+        COUNT(*) as total_pitches,
+        SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked'
+        ) THEN 1 ELSE 0 END) as whiffs,
+        SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked',
+            'foul', 'foul_tip', 'foul_bunt',
+            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
+        ) THEN 1 ELSE 0 END) as total_swings,
+        ROUND(100.0 * SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked'
+        ) THEN 1 ELSE 0 END) /
+        NULLIF(SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked',
+            'foul', 'foul_tip', 'foul_bunt',
+            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
+        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
+    FROM df
+    WHERE pitch_type IS NOT NULL
+    GROUP BY period, pitch_type
+    ORDER BY period, total_pitches DESC
+""")
+# PA bootstrap CIs for the top pitches
+sections.add('whiff_ci', lambda cur, top_pitches: bootstrap_rates(
+    df[df['pitch_type'].isin(top_pitches)], ['period', 'pitch_type'], unit='pa', n_boot=2000),
+    after=['top_pitches'])
+sections.query('two_strike', """
+    SELECT
+        period,
+        pitch_type,
+        COUNT(*) as pitches,
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period), 1) as pct,
+        ROUND(100.0 * SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked'
+        ) THEN 1 ELSE 0 END) /
+        NULLIF(SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked',
+            'foul', 'foul_tip', 'foul_bunt',
+            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
+        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
+    FROM df
+    WHERE strikes = 2 AND pitch_type IS NOT NULL
+    GROUP BY period, pitch_type
+    ORDER BY period, pitches DESC
+""")
+sections.query('count_analysis', f"""
+    SELECT
+        period,
+        {COUNT_STATE_LABEL} as count_situation,
+        pitch_type,
+        COUNT(*) as pitches,
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period, count_state), 1) as pct
+    FROM df
+    WHERE pitch_type IS NOT NULL AND count_state >= 0
+    GROUP BY period, count_state, pitch_type
+    ORDER BY period, count_state, pitches DESC
+""")
+sections.query('batted', """
+    SELECT
+        period,
+        COUNT(*) as batted_balls,
+        ROUND(AVG(launch_speed), 1) as avg_exit_velo,
+        ROUND(AVG(launch_angle), 1) as avg_launch_angle,
+        ROUND(100.0 * SUM(CASE WHEN launch_speed >= 95 THEN 1 ELSE 0 END) / COUNT(*), 1) as hard_hit_pct,
+        ROUND(AVG(estimated_ba_using_speedangle), 3) as avg_xBA,
+        ROUND(AVG(estimated_woba_using_speedangle), 3) as avg_xwOBA
+    FROM df
+    WHERE launch_speed IS NOT NULL
+    GROUP BY period
+    ORDER BY period
+""")
+sections.query('batted_by_pitch', """
+    SELECT
+        period,
+        pitch_type,
+        COUNT(*) as batted_balls,
+        ROUND(AVG(launch_speed), 1) as avg_exit_velo,
+        ROUND(AVG(estimated_ba_using_speedangle), 3) as avg_xBA
+    FROM df
+    WHERE launch_speed IS NOT NULL AND pitch_type IS NOT NULL
+    GROUP BY period, pitch_type
+    HAVING COUNT(*) >= 5
+    ORDER BY period, batted_balls DESC
+""")
+sections.query('fs_movement', """
+    SELECT
+        period,
+        COUNT(*) as pitches,
+        ROUND(AVG(release_speed), 1) as avg_velo,
+        ROUND(AVG(release_spin_rate), 0) as avg_spin,
+        ROUND(AVG(pfx_x * 12), 1) as h_break_in,
+        ROUND(AVG(pfx_z * 12), 1) as v_break_in,
+        ROUND(STDDEV(pfx_x * 12), 1) as h_break_std,
+        ROUND(STDDEV(pfx_z * 12), 1) as v_break_std
+    FROM df
+    WHERE pitch_type = 'FO'
+    GROUP BY period
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END
+""")
+sections.query('fo_location', """
+    SELECT
+        period,
+        ROUND(AVG(plate_x), 2) as avg_plate_x,
+        ROUND(AVG(plate_z), 2) as avg_plate_z,
+        COUNT(*) as pitches
+    FROM df
+    WHERE pitch_type = 'FO' AND plate_x IS NOT NULL
+    GROUP BY period
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END
+""")
+sections.query('fo_by_count', """
+    SELECT
+        period,
+        balls || '-' || strikes as count,
+        ROUND(100.0 * SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) / COUNT(*), 1) as fo_pct,
+        SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) as fo_count,
+        COUNT(*) as total
+    FROM df
+    WHERE pitch_type IS NOT NULL
+    GROUP BY period, balls, strikes
+    HAVING COUNT(*) >= 10
+    ORDER BY period, balls, strikes
+""")
+sections.query('release', """
+    SELECT
+        period,
+        pitch_type,
+        ROUND(AVG(release_pos_x), 2) as avg_rel_x,
+        ROUND(AVG(release_pos_z), 2) as avg_rel_z,
+        ROUND(STDDEV(release_pos_x), 2) as std_rel_x,
+        ROUND(STDDEV(release_pos_z), 2) as std_rel_z,
+        ROUND(AVG(release_speed), 1) as avg_velo,
+        COUNT(*) as pitches
+    FROM df
+    WHERE pitch_type IN ('FF', 'FO')
+      AND release_pos_x IS NOT NULL
+    GROUP BY period, pitch_type
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END, pitch_type
+""")
+sections.add('release_flags', lambda cur: monitor.update(df_seq).join(df_seq[['period', 'pitch_type']]))
+sections.query('flag_rate', """
+    SELECT
+        period,
+        pitch_type,
+        COUNT(*) as pitches,
+        ROUND(100.0 * AVG(CASE WHEN anomaly THEN 1 ELSE 0 END), 1) as flag_pct,
+        ROUND(100.0 * AVG(CASE WHEN ABS(z_release_pos_x) >= 2 OR ABS(z_release_pos_z) >= 2 THEN 1 ELSE 0 END), 1) as release_flag_pct,
+        ROUND(100.0 * AVG(CASE WHEN ABS(z_release_speed) >= 2 THEN 1 ELSE 0 END), 1) as velo_flag_pct
+    FROM release_flags
+    WHERE pitch_type IN ('FF', 'FO')
+    GROUP BY period, pitch_type
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END, pitch_type
+""", after=['release_flags'])
+# Full-trajectory tunneling for consecutive pitch pairs
+sections.add('tunnels', lambda cur: tunnel_pairs(df).join(df[['period']]))
+sections.query('tunnel_summary', """
+    SELECT
+        period,
+        prev_pitch_type || '->' || pitch_type as pair,
+        COUNT(*) as pairs,
+        ROUND(AVG(release_dist), 1) as release_gap_in,
+        ROUND(AVG(tunnel_dist), 1) as tunnel_gap_in,
+        ROUND(AVG(plate_sep), 1) as plate_gap_in,
+        ROUND(AVG(plate_sep) / NULLIF(AVG(tunnel_dist), 0), 2) as plate_to_tunnel
+    FROM tunnels
+    WHERE (prev_pitch_type = 'FF' AND pitch_type = 'FO')
+       OR (prev_pitch_type = 'FO' AND pitch_type = 'FF')
+    GROUP BY period, pair
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END, pair
+""", after=['tunnels'])
+sections.query('all_avg_movement', """
+    SELECT
+        period,
+        pitch_type,
+        COUNT(*) as pitches,
+        ROUND(AVG(pfx_x * 12), 1) as h_break_in,
+        ROUND(AVG(pfx_z * 12), 1) as v_break_in
+    FROM df
+    WHERE pfx_x IS NOT NULL AND pitch_type IS NOT NULL
+    GROUP BY period, pitch_type
+    HAVING COUNT(*) >= 10
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END, pitches DESC
+""")
+sections.query('lr_arsenal', """
+    SELECT
+        period,
+        stand,
+        pitch_type,
+        COUNT(*) as count,
+        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period, stand), 1) as pct,
+        ROUND(100.0 * SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked'
+        ) THEN 1 ELSE 0 END) /
+        NULLIF(SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked',
+            'foul', 'foul_tip', 'foul_bunt',
+            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
+        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
+    FROM df
+    WHERE pitch_type IS NOT NULL
+    GROUP BY period, stand, pitch_type
+    HAVING COUNT(*) >= 5
+    ORDER BY period, stand, count DESC
+""")
+sections.query('lr_fo', """
+    SELECT
+        period,
+        stand,
+        COUNT(*) as pitches,
+        ROUND(100.0 * SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked'
+        ) THEN 1 ELSE 0 END) /
+        NULLIF(SUM(CASE WHEN description IN (
+            'swinging_strike', 'swinging_strike_blocked',
+            'foul', 'foul_tip', 'foul_bunt',
+            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
+        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate,
+        ROUND(AVG(CASE WHEN launch_speed IS NOT NULL THEN estimated_ba_using_speedangle END), 3) as xBA_on_contact
+    FROM df
+    WHERE pitch_type = 'FO'
+    GROUP BY period, stand
+    ORDER BY CASE period
+        WHEN '2023' THEN 1 WHEN '2024' THEN 2
+        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
+    END, stand
+""")
+results = sections.run()
+print(f'\nSection queries: {sections.describe()}')
+
+tracer.mark('change_points')
+# CUSUM change-point scan over the per-game series: compare proposed breaks with INJURY_DATE
+change_points = results['change_points']
+print(f'\n=== Proposed split dates (manual INJURY_DATE: {INJURY_DATE}) ===')
+print(change_points.drop(columns='pitcher').to_string(index=False))
+
+# Sensitivity of the 2025 pre/post comparison to the split date (every game date at once)
+sweep = results['sweep']
+near = (sweep['split_date'] - pd.Timestamp(INJURY_DATE)).abs() <= pd.Timedelta(days=21)
+print(f'\n=== Split-date sensitivity around INJURY_DATE ({INJURY_DATE}) ===')
+print(sweep.loc[near, ['split_date', 'pre_pitches', 'post_pitches', 'whiff_rate_delta',
+                       'velo_delta', 'xwOBA_delta', 'mix_shift']]
+      .round({'whiff_rate_delta': 3, 'velo_delta': 3, 'xwOBA_delta': 3, 'mix_shift': 3}).to_string(index=False))
+
+if '2024' in PERIODS and len(df[df['period'] == '2024']) < 100:
+    print('\n⚠️ 2024 data is very limited (injury year). Some analyses may skip 2024.')
+
+tracer.mark('summary')
+summary = results['summary']
+
+print('=== Season Overview ===')
+print(summary.to_string(index=False))
+print(f'\nTotal: {len(df):,} pitches')
+
+tracer.mark('arsenal')
+arsenal = results['arsenal']
 
 print('=== Pitch Arsenal by Period ===')
 for period in PERIODS:
@@ -110,79 +501,69 @@ for period in PERIODS:
 mix_pivot = arsenal.pivot_table(index='period', columns='pitch_type', values='pct', fill_value=0)
 mix_pivot = mix_pivot.reindex(PERIODS)
 
-mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
-plt.title('Kodai Senga - Pitch Mix by Period')
-plt.xlabel('Period')
-plt.ylabel('Usage %')
-plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    apply_style(plt)  # before the first figure: DataFrame.plot builds its axes without going through plt
+    mix_pivot.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='Set3')
+    plt.title('Kodai Senga - Pitch Mix by Period')
+    plt.xlabel('Period')
+    plt.ylabel('Usage %')
+    plt.legend(title='Pitch Type', bbox_to_anchor=(1.05, 1))
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Pitch Mix (% usage) ===')
 print(mix_pivot.round(1).to_string())
 
+# Usage / velocity / whiff / movement deltas for every period pair in one broadcast
+period_profile = cube.rollup(['period', 'pitch_type'], pct_within=['period'], dropna=('pitch_type',))
+deltas = period_deltas(period_profile, PERIODS, min_pitches=30)
+
 # Compare key period pairs
 comparisons = [
     ('2023', '2025-Pre', '2023 → 2025-Pre (healthy baseline comparison)'),
     ('2025-Pre', '2025-Post', '2025-Pre → 2025-Post (injury impact)'),
 ]
 for p1, p2, label in comparisons:
-    if p1 in mix_pivot.index and p2 in mix_pivot.index:
-        first = mix_pivot.loc[p1]
-        last = mix_pivot.loc[p2]
-        diff = (last - first).sort_values()
+    if p1 in PERIODS and p2 in PERIODS:
         print(f'\n=== {label} ===')
-        for pitch, change in diff.items():
-            if abs(change) >= 1.0:
-                direction = '↑' if change > 0 else '↓'
-                print(f'  {pitch}: {first[pitch]:.1f}% → {last[pitch]:.1f}% ({direction}{abs(change):.1f}%)')
+        for _, row in pair_changes(deltas, p1, p2, min_abs=1.0).iterrows():
+            direction = '↑' if row['delta'] > 0 else '↓'
+            print(f"  {row['pitch_type']}: {row['before']:.1f}% → {row['after']:.1f}% ({direction}{abs(row['delta']):.1f}%)")
 
-velo_by_period = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        ROUND(AVG(release_speed), 1) as avg_velo,
-        ROUND(AVG(release_spin_rate), 0) as avg_spin,
-        COUNT(*) as count
-    FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, pitch_type
-    ORDER BY period
-""").df()
+print('\n=== Largest Shifts, All Period Pairs (score = change / notable change) ===')
+print(deltas.head(15).round(2).to_string(index=False))
 
-top_pitches = con.execute("""
-    SELECT pitch_type FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY pitch_type
-    ORDER BY COUNT(*) DESC
-    LIMIT 4
-""").df()['pitch_type'].tolist()
+tracer.mark('velocity')
+velo_by_period = results['velo_by_period']
 
-fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+top_pitches = results['top_pitches']
 
-period_order = {p: i for i, p in enumerate(PERIODS)}
-for pitch in top_pitches:
-    data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
-    data['period_idx'] = data['period'].map(period_order)
-    data = data.dropna(subset=['period_idx']).sort_values('period_idx')
-    if len(data) > 0:
-        axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
-        axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
+if PLOTS:
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
-axes[0].set_title('Average Velocity by Period')
-axes[0].set_ylabel('Velocity (mph)')
-axes[0].legend()
-axes[0].tick_params(axis='x', rotation=20)
+    period_order = {p: i for i, p in enumerate(PERIODS)}
+    for pitch in top_pitches:
+        data = velo_by_period[velo_by_period['pitch_type'] == pitch].copy()
+        data['period_idx'] = data['period'].map(period_order)
+        data = data.dropna(subset=['period_idx']).sort_values('period_idx')
+        if len(data) > 0:
+            axes[0].plot(data['period'], data['avg_velo'], marker='o', label=pitch, linewidth=2)
+            axes[1].plot(data['period'], data['avg_spin'], marker='o', label=pitch, linewidth=2)
 
-axes[1].set_title('Average Spin Rate by Period')
-axes[1].set_ylabel('Spin Rate (rpm)')
-axes[1].legend()
-axes[1].tick_params(axis='x', rotation=20)
+    axes[0].set_title('Average Velocity by Period')
+    axes[0].set_ylabel('Velocity (mph)')
+    axes[0].legend()
+    axes[0].tick_params(axis='x', rotation=20)
 
-plt.suptitle('Kodai Senga - Velocity & Spin Trends')
-plt.tight_layout()
-plt.show()
+    axes[1].set_title('Average Spin Rate by Period')
+    axes[1].set_ylabel('Spin Rate (rpm)')
+    axes[1].legend()
+    axes[1].tick_params(axis='x', rotation=20)
+
+    plt.suptitle('Kodai Senga - Velocity & Spin Trends')
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('\n=== Velocity & Spin by Period (Top Pitches) ===')
@@ -191,56 +572,36 @@ for pitch in top_pitches:
     print(f'\n{pitch}:')
     print(data[['period', 'avg_velo', 'avg_spin', 'count']].to_string(index=False))
 
+tracer.mark('monthly')
 # Monthly trends for 2025 (and 2023 for comparison)
-monthly = con.execute("""
-    SELECT
-        season,
-        EXTRACT(MONTH FROM game_date::DATE) as month,
-        COUNT(*) as pitches,
-        COUNT(DISTINCT game_date) as games,
-        ROUND(AVG(CASE WHEN pitch_type = 'FF' THEN release_speed END), 1) as ff_velo,
-        ROUND(AVG(CASE WHEN pitch_type = 'FO' THEN release_speed END), 1) as fo_velo,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate,
-        ROUND(AVG(CASE WHEN launch_speed IS NOT NULL THEN estimated_woba_using_speedangle END), 3) as avg_xwOBA
-    FROM df
-    WHERE season IN (2023, 2025)
-    GROUP BY season, month
-    HAVING COUNT(*) >= 30
-    ORDER BY season, month
-""").df()
-
-fig, axes = plt.subplots(2, 2, figsize=(14, 10))
-
-for year in [2023, 2025]:
-    data = monthly[monthly['season'] == year]
-    label = str(year)
-    axes[0][0].plot(data['month'], data['ff_velo'], marker='o', label=label, linewidth=2)
-    axes[0][1].plot(data['month'], data['fo_velo'], marker='o', label=label, linewidth=2)
-    axes[1][0].plot(data['month'], data['whiff_rate'], marker='o', label=label, linewidth=2)
-    axes[1][1].plot(data['month'], data['avg_xwOBA'], marker='o', label=label, linewidth=2)
-
-# Add injury marker for 2025
-for ax in axes.flat:
-    ax.axvline(x=6.5, color='red', linestyle='--', alpha=0.6, label='6/12 Injury')
-    ax.set_xticks(range(3, 11))
-    ax.set_xticklabels(['Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct'])
-    ax.legend(fontsize=9)
-
-axes[0][0].set_title('FF Velocity (mph)')
-axes[0][1].set_title('FO (Ghost Fork) Velocity (mph)')
-axes[1][0].set_title('Overall Whiff Rate (%)')
-axes[1][1].set_title('xwOBA Allowed (lower = better)')
-
-plt.suptitle('Kodai Senga - Monthly Trends (2023 vs 2025)', fontsize=14)
-plt.tight_layout()
-plt.show()
+monthly = results['monthly']
+
+if PLOTS:
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+
+    for year in [2023, 2025]:
+        data = monthly[monthly['season'] == year]
+        label = str(year)
+        axes[0][0].plot(data['month'], data['ff_velo'], marker='o', label=label, linewidth=2)
+        axes[0][1].plot(data['month'], data['fo_velo'], marker='o', label=label, linewidth=2)
+        axes[1][0].plot(data['month'], data['whiff_rate'], marker='o', label=label, linewidth=2)
+        axes[1][1].plot(data['month'], data['avg_xwOBA'], marker='o', label=label, linewidth=2)
+
+    # Add injury marker for 2025
+    for ax in axes.flat:
+        ax.axvline(x=6.5, color='red', linestyle='--', alpha=0.6, label='6/12 Injury')
+        ax.set_xticks(range(3, 11))
+        ax.set_xticklabels(['Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct'])
+        ax.legend(fontsize=9)
+
+    axes[0][0].set_title('FF Velocity (mph)')
+    axes[0][1].set_title('FO (Ghost Fork) Velocity (mph)')
+    axes[1][0].set_title('Overall Whiff Rate (%)')
+    axes[1][1].set_title('xwOBA Allowed (lower = better)')
+
+    plt.suptitle('Kodai Senga - Monthly Trends (2023 vs 2025)', fontsize=14)
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print('=== Monthly Trends ===')
@@ -251,36 +612,23 @@ for year in [2023, 2025]:
 
 ff_type = 'FF' if 'FF' in top_pitches else top_pitches[0]
 
-# Only use periods with enough data
-fatigue_periods = [p for p in PERIODS if len(df[df['period'] == p]) >= 200]
-
-fatigue = con.execute(f"""
-    SELECT
-        period,
-        inning,
-        ROUND(AVG(release_speed), 1) as avg_velo,
-        COUNT(*) as pitches
-    FROM df
-    WHERE pitch_type = '{ff_type}' AND inning <= 8
-      AND period IN ({','.join(["'" + p + "'" for p in fatigue_periods])})
-    GROUP BY period, inning
-    HAVING COUNT(*) >= 5
-    ORDER BY period, inning
-""").df()
+tracer.mark('fatigue')
+fatigue = results['fatigue']
 
-fig, ax = plt.subplots(figsize=(12, 6))
-for period in fatigue_periods:
-    data = fatigue[fatigue['period'] == period]
-    if len(data) > 0:
-        ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for period in fatigue_periods:
+        data = fatigue[fatigue['period'] == period]
+        if len(data) > 0:
+            ax.plot(data['inning'], data['avg_velo'], marker='o', label=period, linewidth=2)
 
-ax.set_xlabel('Inning')
-ax.set_ylabel(f'{ff_type} Velocity (mph)')
-ax.set_title(f'Kodai Senga - {ff_type} Velocity by Inning')
-ax.set_xticks(range(1, 9))
-ax.legend()
-plt.tight_layout()
-plt.show()
+    ax.set_xlabel('Inning')
+    ax.set_ylabel(f'{ff_type} Velocity (mph)')
+    ax.set_title(f'Kodai Senga - {ff_type} Velocity by Inning')
+    ax.set_xticks(range(1, 9))
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
 
 # === Text Summary ===
 print(f'\n=== {ff_type} Velocity by Inning ===')
@@ -299,74 +647,44 @@ for period in fatigue_periods:
         drop = last_velo - first_velo
         print(f'  {period}: {first_velo} → {last_velo} (inn {last_inn}) = {drop:+.1f} mph')
 
-whiff = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        COUNT(*) as total_pitches,
-        SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) as whiffs,
-        SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END) as total_swings,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
-    FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, pitch_type
-    ORDER BY period, total_pitches DESC
-""").df()
-
-fig, ax = plt.subplots(figsize=(12, 6))
-period_order = {p: i for i, p in enumerate(PERIODS)}
-for pitch in top_pitches:
-    data = whiff[whiff['pitch_type'] == pitch].copy()
-    data['period_idx'] = data['period'].map(period_order)
-    data = data.dropna(subset=['period_idx']).sort_values('period_idx')
-    if len(data) > 0:
-        ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
+tracer.mark('whiff')
+whiff = results['whiff']
 
-ax.set_ylabel('Whiff Rate (%)')
-ax.set_title('Kodai Senga - Whiff Rate by Pitch Type')
-ax.legend()
-plt.tight_layout()
-plt.show()
-
-# === Text Summary ===
-print('\n=== Whiff Rate by Pitch Type ===')
-whiff_pivot = whiff.pivot_table(index='pitch_type', columns='period', values='whiff_rate')
-if len(whiff_pivot.columns) > 0:
-    whiff_pivot = whiff_pivot.reindex(columns=PERIODS)
-print(whiff_pivot.round(1).to_string())
+if PLOTS:
+    fig, ax = plt.subplots(figsize=(12, 6))
+    period_order = {p: i for i, p in enumerate(PERIODS)}
+    for pitch in top_pitches:
+        data = whiff[whiff['pitch_type'] == pitch].copy()
+        data['period_idx'] = data['period'].map(period_order)
+        data = data.dropna(subset=['period_idx']).sort_values('period_idx')
+        if len(data) > 0:
+            ax.plot(data['period'], data['whiff_rate'], marker='o', label=pitch, linewidth=2)
 
-two_strike = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        COUNT(*) as pitches,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period), 1) as pct,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
-    FROM df
-    WHERE strikes = 2 AND pitch_type IS NOT NULL
-    GROUP BY period, pitch_type
-    ORDER BY period, pitches DESC
-""").df()
+    ax.set_ylabel('Whiff Rate (%)')
+    ax.set_title('Kodai Senga - Whiff Rate by Pitch Type')
+    ax.legend()
+    plt.tight_layout()
+    plt.show()
+
+# === Text Summary ===
+print('\n=== Whiff Rate by Pitch Type ===')
+whiff_pivot = whiff.pivot_table(index='pitch_type', columns='period', values='whiff_rate')
+if len(whiff_pivot.columns) > 0:
+    whiff_pivot = whiff_pivot.reindex(columns=PERIODS)
+print(whiff_pivot.round(1).to_string())
+
+# 95% bootstrap CIs (resampling plate appearances; small post-injury samples are noisy)
+whiff_ci = results['whiff_ci']
+whiff_ci = whiff_ci[whiff_ci['metric'] == 'whiff_rate']
+print('\n=== Whiff Rate 95% CI (PA bootstrap) ===')
+for period in PERIODS:
+    data = whiff_ci[whiff_ci['period'] == period]
+    print(f'\n--- {period} ---')
+    for _, r in data.iterrows():
+        print(f"  {r['pitch_type']}: {100 * r['estimate']:.1f}% [{100 * r['lo']:.1f}, {100 * r['hi']:.1f}] (PA={r['n_units']})")
+
+tracer.mark('two_strike')
+two_strike = results['two_strike']
 
 print('=== Two-Strike Pitch Selection ===')
 for period in PERIODS:
@@ -374,31 +692,21 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['pitch_type', 'pitches', 'pct', 'whiff_rate']].to_string(index=False))
 
-count_analysis = con.execute("""
-    SELECT
-        period,
-        CASE
-            WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-            WHEN balls > strikes THEN 'Behind'
-            WHEN strikes > balls THEN 'Ahead'
-            ELSE 'Even'
-        END as count_situation,
-        pitch_type,
-        COUNT(*) as pitches,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(
-            PARTITION BY period,
-            CASE
-                WHEN balls = 3 AND strikes = 2 THEN 'Full Count'
-                WHEN balls > strikes THEN 'Behind'
-                WHEN strikes > balls THEN 'Ahead'
-                ELSE 'Even'
-            END
-        ), 1) as pct
-    FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, count_situation, pitch_type
-    ORDER BY period, count_situation, pitches DESC
-""").df()
+tracer.mark('sequencing')
+# Sequencing: previous pitch -> two-strike pitch, and whiff rate given the previous pitch
+transitions = TransitionTensor.from_pitches(con, df, by=('period',))
+TWO_STRIKE_COUNTS = [(b, 2) for b in range(4)]
+print('\n=== Two-Strike Sequencing (row = previous pitch, % of next pitch) ===')
+for period in PERIODS:
+    print(f'\n--- {period} ---')
+    print((100 * transitions.matrix(counts=TWO_STRIKE_COUNTS, period=period)).round(1).to_string())
+    fo_whiff = transitions.whiff_after(counts=TWO_STRIKE_COUNTS, min_swings=5, period=period)
+    if 'FO' in fo_whiff.columns:
+        print('  FO whiff% after: ' + ', '.join(
+            f'{prev} {100 * rate:.1f}%' for prev, rate in fo_whiff['FO'].dropna().items()))
+
+tracer.mark('counts')
+count_analysis = results['count_analysis']
 
 print('=== Pitch Selection by Count Situation ===')
 for period in PERIODS:
@@ -412,38 +720,25 @@ for period in PERIODS:
             top_str = ', '.join([f"{r['pitch_type']} {r['pct']}%" for _, r in data.iterrows()])
             print(f'  {situation}: {top_str}')
 
-batted = con.execute("""
-    SELECT
-        period,
-        COUNT(*) as batted_balls,
-        ROUND(AVG(launch_speed), 1) as avg_exit_velo,
-        ROUND(AVG(launch_angle), 1) as avg_launch_angle,
-        ROUND(100.0 * SUM(CASE WHEN launch_speed >= 95 THEN 1 ELSE 0 END) / COUNT(*), 1) as hard_hit_pct,
-        ROUND(AVG(estimated_ba_using_speedangle), 3) as avg_xBA,
-        ROUND(AVG(estimated_woba_using_speedangle), 3) as avg_xwOBA
-    FROM df
-    WHERE launch_speed IS NOT NULL
-    GROUP BY period
-    ORDER BY period
-""").df()
+# Full 12-count usage / whiff matrices (one pass over the precomputed count_idx)
+count_usage, count_whiff = count_matrices(df, by=('period',))
+print('\n=== Usage % by Ball-Strike Count ===')
+for period in PERIODS:
+    print(f'\n--- {period} ---')
+    print((100 * count_usage.loc[period]).round(1).to_string())
+print('\n=== Whiff % by Ball-Strike Count ===')
+for period in PERIODS:
+    print(f'\n--- {period} ---')
+    print((100 * count_whiff.loc[period]).round(1).to_string())
+
+tracer.mark('batted')
+batted = results['batted']
 
 print('=== Batted Ball Results by Season ===')
 print(batted.to_string(index=False))
 
 # By pitch type
-batted_by_pitch = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        COUNT(*) as batted_balls,
-        ROUND(AVG(launch_speed), 1) as avg_exit_velo,
-        ROUND(AVG(estimated_ba_using_speedangle), 3) as avg_xBA
-    FROM df
-    WHERE launch_speed IS NOT NULL AND pitch_type IS NOT NULL
-    GROUP BY period, pitch_type
-    HAVING COUNT(*) >= 5
-    ORDER BY period, batted_balls DESC
-""").df()
+batted_by_pitch = results['batted_by_pitch']
 
 print('\n=== Batted Ball by Pitch Type (min 5 BIP) ===')
 for period in PERIODS:
@@ -451,90 +746,61 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['pitch_type', 'batted_balls', 'avg_exit_velo', 'avg_xBA']].to_string(index=False))
 
+tracer.mark('fo_movement')
 # Ghost Fork (FO) movement profile
-fs_movement = con.execute("""
-    SELECT
-        period,
-        COUNT(*) as pitches,
-        ROUND(AVG(release_speed), 1) as avg_velo,
-        ROUND(AVG(release_spin_rate), 0) as avg_spin,
-        ROUND(AVG(pfx_x * 12), 1) as h_break_in,
-        ROUND(AVG(pfx_z * 12), 1) as v_break_in,
-        ROUND(STDDEV(pfx_x * 12), 1) as h_break_std,
-        ROUND(STDDEV(pfx_z * 12), 1) as v_break_std
-    FROM df
-    WHERE pitch_type = 'FO'
-    GROUP BY period
-    ORDER BY CASE period
-        WHEN '2023' THEN 1 WHEN '2024' THEN 2
-        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
-    END
-""").df()
+fs_movement = results['fs_movement']
 
 print('=== Ghost Fork (FO) Movement Profile ===')
 print(fs_movement.to_string(index=False))
 print('\n(h_break_in: horizontal break in inches, negative = glove-side for RHP)')
 print('(v_break_in: induced vertical break in inches)')
 
+tracer.mark('similarity')
+# Nearest arsenal profiles: which earlier period does each 2025-Post pitch most resemble?
+# (the same index takes league-wide profiles keyed by pitcher/season for comparable pitchers)
+profiles = arsenal_profiles(con, df, keys=('pitcher', 'period', 'pitch_type'), min_pitches=20)
+arsenal_index = ArsenalIndex(profiles)
+post_rows = profiles.index[profiles['period'] == '2025-Post']
+nearest = arsenal_index.neighbors(post_rows, k=3)
+nearest['query_type'] = profiles['pitch_type'].to_numpy()[nearest['query']]
+print('\n=== 2025-Post Pitches: Most Similar Period Profiles ===')
+print(nearest[['query_type', 'rank', 'period', 'pitch_type', 'pitches', 'distance']].round(2).to_string(index=False))
+
 # Movement scatter plot by period
 plot_periods = [p for p in PERIODS if len(df[(df['period'] == p) & (df['pitch_type'] == 'FO')]) > 0]
-fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 5))
-if len(plot_periods) == 1:
-    axes = [axes]
-
-for i, period in enumerate(plot_periods):
-    fo_data = con.execute(f"""
-        SELECT pfx_x * 12 as h_break, pfx_z * 12 as v_break
-        FROM df
-        WHERE pitch_type = 'FO' AND period = '{period}'
-          AND pfx_x IS NOT NULL AND pfx_z IS NOT NULL
-    """).df()
-
-    if len(fo_data) > 0:
-        axes[i].scatter(fo_data['h_break'], fo_data['v_break'], alpha=0.3, s=20, c='purple')
-        axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.5)
-        axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.5)
-        axes[i].set_xlim(-25, 25)
-        axes[i].set_ylim(-25, 25)
-        axes[i].set_xlabel('Horizontal Break (in)')
-        axes[i].set_ylabel('Induced Vertical Break (in)')
-        axes[i].set_title(f'FO Movement - {period} (n={len(fo_data)})')
-        axes[i].set_aspect('equal')
-
-plt.suptitle('Kodai Senga - Ghost Fork (FO) Movement Profile')
-plt.tight_layout()
-plt.show()
+if PLOTS:
+    fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 5))
+    if len(plot_periods) == 1:
+        axes = [axes]
+
+    for i, period in enumerate(plot_periods):
+        fo_data = con.execute(f"""
+            SELECT pfx_x * 12 as h_break, pfx_z * 12 as v_break
+            FROM df
+            WHERE pitch_type = 'FO' AND period = '{period}'
+              AND pfx_x IS NOT NULL AND pfx_z IS NOT NULL
+        """).df()
 
+        if len(fo_data) > 0:
+            dense_scatter(axes[i], fo_data['h_break'], fo_data['v_break'], alpha=0.3, s=20, c='purple')
+            axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.5)
+            axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.5)
+            axes[i].set_xlim(-25, 25)
+            axes[i].set_ylim(-25, 25)
+            axes[i].set_xlabel('Horizontal Break (in)')
+            axes[i].set_ylabel('Induced Vertical Break (in)')
+            axes[i].set_title(f'FO Movement - {period} (n={len(fo_data)})')
+            axes[i].set_aspect('equal')
+
+    plt.suptitle('Kodai Senga - Ghost Fork (FO) Movement Profile')
+    plt.tight_layout()
+    plt.show()
+
+tracer.mark('fo_zone')
 # Ghost Fork (FO) zone analysis
 # zone 1-9 = strike zone, 11-14 = chase/waste zones
-fs_zone = con.execute("""
-    SELECT
-        period,
-        CASE
-            WHEN zone BETWEEN 1 AND 9 THEN 'In Zone'
-            WHEN zone BETWEEN 11 AND 14 THEN 'Chase'
-            ELSE 'Waste'
-        END as zone_type,
-        COUNT(*) as pitches,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period), 1) as pct,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END) / COUNT(*), 1) as swing_rate
-    FROM df
-    WHERE pitch_type = 'FO' AND zone IS NOT NULL
-    GROUP BY period, zone_type
-    ORDER BY period, zone_type
-""").df()
+fs_zone = cube.rollup(['period', 'zone_type'], pct_within=['period'], dropna=('zone_type',),
+                      pitch_type='FO').round(1)
 
 print('=== Ghost Fork (FO) Zone Analysis ===')
 for period in PERIODS:
@@ -545,74 +811,50 @@ for period in PERIODS:
 
 # Ghost Fork (FO) location scatter by period
 plot_periods = [p for p in PERIODS if len(df[(df['period'] == p) & (df['pitch_type'] == 'FO')]) > 0]
-fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 6))
-if len(plot_periods) == 1:
-    axes = [axes]
-
-for i, period in enumerate(plot_periods):
-    fo_loc = con.execute(f"""
-        SELECT plate_x, plate_z, description
-        FROM df
-        WHERE pitch_type = 'FO' AND period = '{period}'
-          AND plate_x IS NOT NULL AND plate_z IS NOT NULL
-    """).df()
-
-    if len(fo_loc) > 0:
-        whiff_mask = fo_loc['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
-
-        axes[i].scatter(fo_loc[~whiff_mask]['plate_x'], fo_loc[~whiff_mask]['plate_z'],
-                        alpha=0.3, s=20, c='gray', label='Other')
-        axes[i].scatter(fo_loc[whiff_mask]['plate_x'], fo_loc[whiff_mask]['plate_z'],
-                        alpha=0.7, s=30, c='red', label='Whiff')
-
-        # Strike zone box (approximate)
-        axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
-                     [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
-        axes[i].set_xlim(-2.5, 2.5)
-        axes[i].set_ylim(0, 5)
-        axes[i].set_title(f'FO Location - {period} (n={len(fo_loc)})')
-        axes[i].set_xlabel('Plate X')
-        axes[i].set_ylabel('Plate Z')
-        axes[i].legend(fontsize=8)
-        axes[i].set_aspect('equal')
+if PLOTS:
+    fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 6))
+    if len(plot_periods) == 1:
+        axes = [axes]
+
+    for i, period in enumerate(plot_periods):
+        fo_loc = con.execute(f"""
+            SELECT plate_x, plate_z, description
+            FROM df
+            WHERE pitch_type = 'FO' AND period = '{period}'
+              AND plate_x IS NOT NULL AND plate_z IS NOT NULL
+        """).df()
 
-plt.suptitle('Kodai Senga - Ghost Fork (FO) Location by Period')
-plt.tight_layout()
-plt.show()
+        if len(fo_loc) > 0:
+            whiff_mask = fo_loc['description'].isin(['swinging_strike', 'swinging_strike_blocked'])
+
+            dense_scatter(axes[i], fo_loc[~whiff_mask]['plate_x'], fo_loc[~whiff_mask]['plate_z'],
+                          alpha=0.3, s=20, c='gray', label='Other')
+            dense_scatter(axes[i], fo_loc[whiff_mask]['plate_x'], fo_loc[whiff_mask]['plate_z'],
+                          alpha=0.7, s=30, c='red', label='Whiff')
+
+            # Strike zone box (approximate)
+            axes[i].plot([-0.83, 0.83, 0.83, -0.83, -0.83],
+                         [1.5, 1.5, 3.5, 3.5, 1.5], 'k-', linewidth=1)
+            axes[i].set_xlim(-2.5, 2.5)
+            axes[i].set_ylim(0, 5)
+            axes[i].set_title(f'FO Location - {period} (n={len(fo_loc)})')
+            axes[i].set_xlabel('Plate X')
+            axes[i].set_ylabel('Plate Z')
+            axes[i].legend(fontsize=8)
+            axes[i].set_aspect('equal')
+
+    plt.suptitle('Kodai Senga - Ghost Fork (FO) Location by Period')
+    plt.tight_layout()
+    plt.show()
 
 # Average FO location
-fo_location = con.execute("""
-    SELECT
-        period,
-        ROUND(AVG(plate_x), 2) as avg_plate_x,
-        ROUND(AVG(plate_z), 2) as avg_plate_z,
-        COUNT(*) as pitches
-    FROM df
-    WHERE pitch_type = 'FO' AND plate_x IS NOT NULL
-    GROUP BY period
-    ORDER BY CASE period
-        WHEN '2023' THEN 1 WHEN '2024' THEN 2
-        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
-    END
-""").df()
+fo_location = results['fo_location']
 
 print('\n=== Ghost Fork (FO) Average Location ===')
 print(fo_location.to_string(index=False))
 
 # Ghost Fork (FO) usage by count
-fo_by_count = con.execute("""
-    SELECT
-        period,
-        balls || '-' || strikes as count,
-        ROUND(100.0 * SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) / COUNT(*), 1) as fo_pct,
-        SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) as fo_count,
-        COUNT(*) as total
-    FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, balls, strikes
-    HAVING COUNT(*) >= 10
-    ORDER BY period, balls, strikes
-""").df()
+fo_by_count = results['fo_by_count']
 
 print('=== Ghost Fork (FO) Usage % by Count ===')
 for period in PERIODS:
@@ -621,28 +863,11 @@ for period in PERIODS:
         print(f'\n--- {period} ---')
         print(data[['count', 'fo_pct', 'fo_count', 'total']].to_string(index=False))
 
+tracer.mark('release')
 # FF vs FO Release Point Comparison (Tunnel Effect)
 # お化けフォークが効く理由 = FFと見分けがつかない
 # 故障後にリリースポイントがズレたか確認
-release = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        ROUND(AVG(release_pos_x), 2) as avg_rel_x,
-        ROUND(AVG(release_pos_z), 2) as avg_rel_z,
-        ROUND(STDDEV(release_pos_x), 2) as std_rel_x,
-        ROUND(STDDEV(release_pos_z), 2) as std_rel_z,
-        ROUND(AVG(release_speed), 1) as avg_velo,
-        COUNT(*) as pitches
-    FROM df
-    WHERE pitch_type IN ('FF', 'FO')
-      AND release_pos_x IS NOT NULL
-    GROUP BY period, pitch_type
-    ORDER BY CASE period
-        WHEN '2023' THEN 1 WHEN '2024' THEN 2
-        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
-    END, pitch_type
-""").df()
+release = results['release']
 
 print('=== FF vs FO Release Point ===')
 print(release.to_string(index=False))
@@ -658,87 +883,89 @@ for period in PERIODS:
         velo_gap = ff.iloc[0]['avg_velo'] - fo.iloc[0]['avg_velo']
         print(f'  {period}: X gap={dx:.2f}in, Z gap={dz:.2f}in, Velo gap={velo_gap:.1f}mph')
 
+# Streaming ±2σ monitor (computed with the section queries above)
+flag_rate = results['flag_rate']
+
+print('\n=== FF/FO Pitches Outside ±2σ of Prior History ===')
+print(flag_rate.to_string(index=False))
+
+tracer.mark('tunnel')
+# Full-trajectory tunneling: position of each pitch at the ~23.8ft commit point vs at the plate,
+# for consecutive FF/FO pairs in the same plate appearance
+tunnel_summary = results['tunnel_summary']
+
+print('\n=== FF/FO Tunnel (consecutive pitches, inches; higher plate_to_tunnel = better tunnel) ===')
+print(tunnel_summary.to_string(index=False))
+
 # Scatter plot
 plot_periods = [p for p in PERIODS if len(df[df['period'] == p]) >= 50]
-fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 5))
-if len(plot_periods) == 1:
-    axes = [axes]
-
-for i, period in enumerate(plot_periods):
-    for pt, color, label in [('FF', 'red', 'FF'), ('FO', 'purple', 'FO (Ghost Fork)')]:
-        pt_data = con.execute(f"""
-            SELECT release_pos_x, release_pos_z
+if PLOTS:
+    fig, axes = plt.subplots(1, len(plot_periods), figsize=(5 * len(plot_periods), 5))
+    if len(plot_periods) == 1:
+        axes = [axes]
+
+    for i, period in enumerate(plot_periods):
+        for pt, color, label in [('FF', 'red', 'FF'), ('FO', 'purple', 'FO (Ghost Fork)')]:
+            pt_data = con.execute(f"""
+                SELECT release_pos_x, release_pos_z
+                FROM df
+                WHERE pitch_type = '{pt}' AND period = '{period}'
+                  AND release_pos_x IS NOT NULL
+            """).df()
+            if len(pt_data) > 0:
+                dense_scatter(axes[i], pt_data['release_pos_x'], pt_data['release_pos_z'],
+                              alpha=0.2, s=15, c=color, label=f'{label} ({len(pt_data)})')
+        axes[i].set_xlabel('Release Pos X (ft)')
+        axes[i].set_ylabel('Release Pos Z (ft)')
+        axes[i].set_title(f'{period}')
+        axes[i].legend(fontsize=8)
+
+    plt.suptitle('FF vs FO Release Point - Can Batters Tell Them Apart?')
+    plt.tight_layout()
+    plt.show()
+
+# All pitches movement scatter by season
+if PLOTS:
+    fig, axes = plt.subplots(1, len(PERIODS), figsize=(6 * len(PERIODS), 6))
+    if len(PERIODS) == 1:
+        axes = [axes]
+
+    colors = {'FF': 'red', 'FO': 'purple', 'SL': 'blue', 'CU': 'green',
+              'CH': 'orange', 'FC': 'brown', 'SI': 'pink', 'ST': 'cyan',
+              'KC': 'darkgreen', 'CS': 'olive', 'FS': 'magenta'}
+
+    for i, period in enumerate(PERIODS):
+        all_movement = con.execute(f"""
+            SELECT pitch_type, pfx_x * 12 as h_break, pfx_z * 12 as v_break
             FROM df
-            WHERE pitch_type = '{pt}' AND period = '{period}'
-              AND release_pos_x IS NOT NULL
+            WHERE period = '{period}'
+              AND pfx_x IS NOT NULL AND pfx_z IS NOT NULL
+              AND pitch_type IS NOT NULL
         """).df()
-        if len(pt_data) > 0:
-            axes[i].scatter(pt_data['release_pos_x'], pt_data['release_pos_z'],
-                            alpha=0.2, s=15, c=color, label=f'{label} ({len(pt_data)})')
-    axes[i].set_xlabel('Release Pos X (ft)')
-    axes[i].set_ylabel('Release Pos Z (ft)')
-    axes[i].set_title(f'{period}')
-    axes[i].legend(fontsize=8)
-
-plt.suptitle('FF vs FO Release Point - Can Batters Tell Them Apart?')
-plt.tight_layout()
-plt.show()
 
-# All pitches movement scatter by season
-fig, axes = plt.subplots(1, len(PERIODS), figsize=(6 * len(PERIODS), 6))
-if len(PERIODS) == 1:
-    axes = [axes]
+        for pitch_type in all_movement['pitch_type'].unique():
+            pt_data = all_movement[all_movement['pitch_type'] == pitch_type]
+            c = colors.get(pitch_type, 'gray')
+            dense_scatter(axes[i], pt_data['h_break'], pt_data['v_break'],
+                          alpha=0.2, s=15, c=c, label=f'{pitch_type} ({len(pt_data)})')
 
-colors = {'FF': 'red', 'FO': 'purple', 'SL': 'blue', 'CU': 'green',
-          'CH': 'orange', 'FC': 'brown', 'SI': 'pink', 'ST': 'cyan',
-          'KC': 'darkgreen', 'CS': 'olive', 'FS': 'magenta'}
+        axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.5)
+        axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.5)
+        axes[i].set_xlim(-25, 25)
+        axes[i].set_ylim(-25, 25)
+        axes[i].set_xlabel('Horizontal Break (in)')
+        axes[i].set_ylabel('Induced Vertical Break (in)')
+        axes[i].set_title(f'{period}')
+        axes[i].legend(fontsize=7, loc='upper left')
+        axes[i].set_aspect('equal')
 
-for i, period in enumerate(PERIODS):
-    all_movement = con.execute(f"""
-        SELECT pitch_type, pfx_x * 12 as h_break, pfx_z * 12 as v_break
-        FROM df
-        WHERE period = '{period}'
-          AND pfx_x IS NOT NULL AND pfx_z IS NOT NULL
-          AND pitch_type IS NOT NULL
-    """).df()
-
-    for pitch_type in all_movement['pitch_type'].unique():
-        pt_data = all_movement[all_movement['pitch_type'] == pitch_type]
-        c = colors.get(pitch_type, 'gray')
-        axes[i].scatter(pt_data['h_break'], pt_data['v_break'],
-                        alpha=0.2, s=15, c=c, label=f'{pitch_type} ({len(pt_data)})')
-
-    axes[i].axhline(y=0, color='gray', linestyle='--', alpha=0.5)
-    axes[i].axvline(x=0, color='gray', linestyle='--', alpha=0.5)
-    axes[i].set_xlim(-25, 25)
-    axes[i].set_ylim(-25, 25)
-    axes[i].set_xlabel('Horizontal Break (in)')
-    axes[i].set_ylabel('Induced Vertical Break (in)')
-    axes[i].set_title(f'{period}')
-    axes[i].legend(fontsize=7, loc='upper left')
-    axes[i].set_aspect('equal')
-
-plt.suptitle('Kodai Senga - All Pitch Movement by Period')
-plt.tight_layout()
-plt.show()
+    plt.suptitle('Kodai Senga - All Pitch Movement by Period')
+    plt.tight_layout()
+    plt.show()
 
+tracer.mark('movement')
 # === Text Summary: average movement by pitch type ===
-all_avg_movement = con.execute("""
-    SELECT
-        period,
-        pitch_type,
-        COUNT(*) as pitches,
-        ROUND(AVG(pfx_x * 12), 1) as h_break_in,
-        ROUND(AVG(pfx_z * 12), 1) as v_break_in
-    FROM df
-    WHERE pfx_x IS NOT NULL AND pitch_type IS NOT NULL
-    GROUP BY period, pitch_type
-    HAVING COUNT(*) >= 10
-    ORDER BY CASE period
-        WHEN '2023' THEN 1 WHEN '2024' THEN 2
-        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
-    END, pitches DESC
-""").df()
+all_avg_movement = results['all_avg_movement']
 
 print('\n=== Average Movement by Pitch Type (min 10 pitches) ===')
 for period in PERIODS:
@@ -746,28 +973,9 @@ for period in PERIODS:
     print(f'\n--- {period} ---')
     print(data[['pitch_type', 'pitches', 'h_break_in', 'v_break_in']].to_string(index=False))
 
+tracer.mark('lr_splits')
 # L/R splits - pitch usage and effectiveness
-lr_arsenal = con.execute("""
-    SELECT
-        period,
-        stand,
-        pitch_type,
-        COUNT(*) as count,
-        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER(PARTITION BY period, stand), 1) as pct,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
-    FROM df
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, stand, pitch_type
-    HAVING COUNT(*) >= 5
-    ORDER BY period, stand, count DESC
-""").df()
+lr_arsenal = results['lr_arsenal']
 
 print('=== Pitch Usage & Whiff Rate by Batter Side ===')
 for period in PERIODS:
@@ -778,75 +986,16 @@ for period in PERIODS:
         print(data[['pitch_type', 'count', 'pct', 'whiff_rate']].to_string(index=False))
 
 # FO-specific L/R splits
-lr_fo = con.execute("""
-    SELECT
-        period,
-        stand,
-        COUNT(*) as pitches,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate,
-        ROUND(AVG(CASE WHEN launch_speed IS NOT NULL THEN estimated_ba_using_speedangle END), 3) as xBA_on_contact
-    FROM df
-    WHERE pitch_type = 'FO'
-    GROUP BY period, stand
-    ORDER BY CASE period
-        WHEN '2023' THEN 1 WHEN '2024' THEN 2
-        WHEN '2025-Pre' THEN 3 WHEN '2025-Post' THEN 4
-    END, stand
-""").df()
+lr_fo = results['lr_fo']
 
 print('\n=== Ghost Fork (FO) Left/Right Splits ===')
 print(lr_fo.to_string(index=False))
 
+tracer.mark('tto')
 # Only use seasons with enough data
 tto_periods = [p for p in PERIODS if len(df[df['period'] == p]) >= 200]
 
-tto = con.execute(f"""
-    WITH batter_pa AS (
-        SELECT
-            period,
-            game_pk,
-            batter,
-            at_bat_number,
-            DENSE_RANK() OVER(PARTITION BY game_pk, batter ORDER BY at_bat_number) as pa_num
-        FROM df
-        WHERE period IN ({','.join(["'" + p + "'" for p in tto_periods])})
-        GROUP BY period, game_pk, batter, at_bat_number
-    ),
-    tto_tagged AS (
-        SELECT
-            d.*,
-            CASE
-                WHEN b.pa_num = 1 THEN '1st'
-                WHEN b.pa_num = 2 THEN '2nd'
-                ELSE '3rd+'
-            END as tto
-        FROM df d
-        JOIN batter_pa b ON d.game_pk = b.game_pk AND d.batter = b.batter AND d.at_bat_number = b.at_bat_number
-        WHERE d.period IN ({','.join(["'" + p + "'" for p in tto_periods])})
-    )
-    SELECT
-        period,
-        tto,
-        COUNT(*) as pitches,
-        ROUND(100.0 * SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as whiff_rate
-    FROM tto_tagged
-    GROUP BY period, tto
-    ORDER BY period, tto
-""").df()
+tto = cube.rollup(['period', 'tto'], period=tto_periods).round(1)
 
 print('=== Whiff Rate by Time Through Order ===')
 if len(tto) > 0:
@@ -855,49 +1004,14 @@ if len(tto) > 0:
     print(tto_pivot.round(1).to_string())
 
 # TTO with FO specifically
-tto_fo = con.execute(f"""
-    WITH batter_pa AS (
-        SELECT
-            period,
-            game_pk,
-            batter,
-            at_bat_number,
-            DENSE_RANK() OVER(PARTITION BY game_pk, batter ORDER BY at_bat_number) as pa_num
-        FROM df
-        WHERE period IN ({','.join(["'" + p + "'" for p in tto_periods])})
-        GROUP BY period, game_pk, batter, at_bat_number
-    ),
-    tto_tagged AS (
-        SELECT
-            d.*,
-            CASE
-                WHEN b.pa_num = 1 THEN '1st'
-                WHEN b.pa_num = 2 THEN '2nd'
-                ELSE '3rd+'
-            END as tto
-        FROM df d
-        JOIN batter_pa b ON d.game_pk = b.game_pk AND d.batter = b.batter AND d.at_bat_number = b.at_bat_number
-        WHERE d.period IN ({','.join(["'" + p + "'" for p in tto_periods])})
-    )
-    SELECT
-        period,
-        tto,
-        SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) as fo_pitches,
-        COUNT(*) as total_pitches,
-        ROUND(100.0 * SUM(CASE WHEN pitch_type = 'FO' THEN 1 ELSE 0 END) / COUNT(*), 1) as fo_pct,
-        ROUND(100.0 * SUM(CASE WHEN pitch_type = 'FO' AND description IN (
-            'swinging_strike', 'swinging_strike_blocked'
-        ) THEN 1 ELSE 0 END) /
-        NULLIF(SUM(CASE WHEN pitch_type = 'FO' AND description IN (
-            'swinging_strike', 'swinging_strike_blocked',
-            'foul', 'foul_tip', 'foul_bunt',
-            'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score'
-        ) THEN 1 ELSE 0 END), 0), 1) as fo_whiff_rate
-    FROM tto_tagged
-    WHERE pitch_type IS NOT NULL
-    GROUP BY period, tto
-    ORDER BY period, tto
-""").df()
+tto_total = cube.rollup(['period', 'tto'], dropna=('pitch_type',), period=tto_periods)
+tto_fo = tto_total[['period', 'tto', 'pitches']].rename(columns={'pitches': 'total_pitches'}).merge(
+    cube.rollup(['period', 'tto'], period=tto_periods, pitch_type='FO')[['period', 'tto', 'pitches', 'whiff_rate']]
+    .rename(columns={'pitches': 'fo_pitches', 'whiff_rate': 'fo_whiff_rate'}),
+    on=['period', 'tto'], how='left')
+tto_fo['fo_pitches'] = tto_fo['fo_pitches'].fillna(0).astype(int)
+tto_fo['fo_pct'] = (100.0 * tto_fo['fo_pitches'] / tto_fo['total_pitches']).round(1)
+tto_fo['fo_whiff_rate'] = tto_fo['fo_whiff_rate'].round(1)
 
 print('\n=== Ghost Fork (FO) by Time Through Order ===')
 for period in tto_periods:
@@ -905,6 +1019,7 @@ for period in tto_periods:
     print(f'\n--- {period} ---')
     print(data[['tto', 'fo_pitches', 'fo_pct', 'fo_whiff_rate']].to_string(index=False))
 
+tracer.mark('summary_text')
 print('=' * 60)
 print('KODAI SENGA 2023-2025 ANALYSIS SUMMARY')
 print('=' * 60)
@@ -916,25 +1031,17 @@ for _, row in summary.iterrows():
 
 # Pitch mix changes (2025-Pre vs 2025-Post focus)
 print(f'\n[Pitch Mix Changes: 2025 Pre vs Post Injury]')
-if '2025-Pre' in mix_pivot.index and '2025-Post' in mix_pivot.index:
-    pre = mix_pivot.loc['2025-Pre']
-    post = mix_pivot.loc['2025-Post']
-    diff = (post - pre).sort_values()
-    for pitch, change in diff.items():
-        if abs(change) >= 1.0:
-            direction = '↑' if change > 0 else '↓'
-            print(f'  {pitch}: {pre[pitch]:.1f}% → {post[pitch]:.1f}% ({direction}{abs(change):.1f}%)')
+if '2025-Pre' in PERIODS and '2025-Post' in PERIODS:
+    for _, row in pair_changes(deltas, '2025-Pre', '2025-Post', min_abs=1.0).iterrows():
+        direction = '↑' if row['delta'] > 0 else '↓'
+        print(f"  {row['pitch_type']}: {row['before']:.1f}% → {row['after']:.1f}% ({direction}{abs(row['delta']):.1f}%)")
 
 # Pitch mix changes (2023 vs 2025-Pre)
 print(f'\n[Pitch Mix Changes: 2023 Rookie vs 2025-Pre]')
-if '2023' in mix_pivot.index and '2025-Pre' in mix_pivot.index:
-    base = mix_pivot.loc['2023']
-    pre = mix_pivot.loc['2025-Pre']
-    diff = (pre - base).sort_values()
-    for pitch, change in diff.items():
-        if abs(change) >= 1.0:
-            direction = '↑' if change > 0 else '↓'
-            print(f'  {pitch}: {base[pitch]:.1f}% → {pre[pitch]:.1f}% ({direction}{abs(change):.1f}%)')
+if '2023' in PERIODS and '2025-Pre' in PERIODS:
+    for _, row in pair_changes(deltas, '2023', '2025-Pre', min_abs=1.0).iterrows():
+        direction = '↑' if row['delta'] > 0 else '↓'
+        print(f"  {row['pitch_type']}: {row['before']:.1f}% → {row['after']:.1f}% ({direction}{abs(row['delta']):.1f}%)")
 
 # Velocity
 print(f'\n[Fastball Velocity]')
@@ -971,3 +1078,39 @@ print('  Was it velocity? Movement? Pitch selection? Command?')
 print('  Did the FF-FO tunnel effect break down?')
 
 print('\n' + '=' * 60)
+
+tracer.mark('report')
+# Structured output: one record (section id, run parameters, result table) per section
+with ReportSink(REPORT_PATH, run={'pitcher_id': PITCHER_ID, 'years': YEARS, 'game_type': GAME_TYPE, 'injury_date': INJURY_DATE}) as report:
+    for section, table in [
+        ('change_points', change_points),
+        ('sweep', sweep),
+        ('summary', summary),
+        ('arsenal', arsenal),
+        ('velo_by_period', velo_by_period),
+        ('monthly', monthly),
+        ('fatigue', fatigue),
+        ('whiff', whiff),
+        ('two_strike', two_strike),
+        ('count_analysis', count_analysis),
+        ('batted', batted),
+        ('batted_by_pitch', batted_by_pitch),
+        ('fs_movement', fs_movement),
+        ('fs_zone', fs_zone),
+        ('fo_location', fo_location),
+        ('fo_by_count', fo_by_count),
+        ('release', release),
+        ('flag_rate', flag_rate),
+        ('tunnel_summary', tunnel_summary),
+        ('all_avg_movement', all_avg_movement),
+        ('lr_arsenal', lr_arsenal),
+        ('lr_fo', lr_fo),
+        ('tto', tto),
+        ('tto_fo', tto_fo),
+        ('deltas', deltas),
+        ('whiff_ci', whiff_ci),
+        ('nearest', nearest),
+    ]:
+        report.emit(section, table)
+
+tracer.close()
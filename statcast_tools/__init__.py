@@ -0,0 +1,6 @@
+"""Shared helpers for the Statcast analysis scripts in this repository.
+
+The per-player scripts (ohtani_*, darvish_*, senga_*, ...) import from the
+submodules here so the heavier pieces (field drawing, aggregation engines)
+live in one place instead of being copied into every notebook.
+"""
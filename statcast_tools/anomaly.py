@@ -0,0 +1,159 @@
+"""Streaming release-point / velocity anomaly detector.
+
+Keeps a running mean and variance (Welford) per (pitcher, pitch_type) for
+each monitored metric and flags pitches that deviate by more than
+``z_threshold`` standard deviations from everything that pitcher threw
+with that pitch *before* it. State is O(groups x metrics), so appending new
+pitches costs O(1) per pitch and never re-reads history.
+
+``update`` handles a whole batch at once with grouped exclusive prefix sums
+(equivalent to pushing the rows one by one, in order); ``push`` is the
+single-pitch form for live feeds.
+"""
+
+import numpy as np
+import pandas as pd
+
+MONITOR_METRICS = (
+    'release_pos_x', 'release_pos_z', 'release_extension',
+    'release_speed', 'release_spin_rate',
+)
+
+
+class _Stats:
+    __slots__ = ('n', 'mean', 'm2')
+
+    def __init__(self, k):
+        self.n = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+
+
+class ReleaseMonitor:
+    """Online ±zσ detector per (pitcher, pitch_type).
+
+    Args:
+        metrics: numeric columns to monitor
+        z_threshold: |z| at or above which a metric is flagged
+        min_history: pitches of history required before a metric can flag
+        keys: grouping columns
+    """
+
+    def __init__(self, metrics=MONITOR_METRICS, z_threshold=2.0, min_history=30,
+                 keys=('pitcher', 'pitch_type')):
+        self.metrics = tuple(metrics)
+        self.z_threshold = z_threshold
+        self.min_history = min_history
+        self.keys = tuple(keys)
+        self._stats = {}
+
+    def _group(self, key):
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = _Stats(len(self.metrics))
+        return stats
+
+    def push(self, key, values):
+        """Score one pitch against its history, then add it. Returns z-scores."""
+        x = np.asarray(values, dtype=np.float64)
+        s = self._group(key)
+        z = np.full(len(self.metrics), np.nan)
+        ok = np.isfinite(x)
+
+        ready = ok & (s.n >= self.min_history)
+        std = np.sqrt(s.m2[ready] / (s.n[ready] - 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z[ready] = (x[ready] - s.mean[ready]) / std
+
+        s.n[ok] += 1
+        delta = x[ok] - s.mean[ok]
+        s.mean[ok] += delta / s.n[ok]
+        s.m2[ok] += delta * (x[ok] - s.mean[ok])
+        return z
+
+    def update(self, pitches):
+        """Score and absorb a batch of pitches (assumed in chronological order).
+
+        Returns a DataFrame aligned with ``pitches`` holding ``z_<metric>``
+        columns, ``anomaly`` (any metric flagged) and ``flagged`` (names of
+        the flagged metrics, comma separated).
+        """
+        n_rows = len(pitches)
+        k = len(self.metrics)
+        values = pitches[list(self.metrics)].to_numpy(dtype=np.float64, na_value=np.nan)
+        group_ids = pitches.groupby(list(self.keys), sort=False, dropna=False).ngroup().to_numpy()
+        n_groups = group_ids.max() + 1 if n_rows else 0
+        group_keys = [tuple(None if pd.isna(v) else v for v in key)
+                      for key in pitches[list(self.keys)].drop_duplicates()
+                      .itertuples(index=False, name=None)]
+
+        # Prior state per group in the batch; shift values by the prior mean
+        # (or the first observation) so prefix sums stay well conditioned.
+        prior = [self._group(key) for key in group_keys]
+        prior_n = np.array([s.n for s in prior]).reshape(n_groups, k)
+        prior_mean = np.array([s.mean for s in prior]).reshape(n_groups, k)
+        prior_m2 = np.array([s.m2 for s in prior]).reshape(n_groups, k)
+
+        order = np.argsort(group_ids, kind='stable')
+        gid = group_ids[order]
+        x = values[order]
+        ok = np.isfinite(x)
+
+        first = np.zeros((n_groups, k))
+        for j in range(k):
+            valid = ok[:, j]
+            firsts = pd.Series(x[valid, j]).groupby(gid[valid]).first()
+            first[firsts.index.to_numpy(), j] = firsts.to_numpy()
+        shift = np.where(prior_n > 0, prior_mean, first)
+
+        d = np.where(ok, x - shift[gid], 0.0)
+        c = ok.astype(np.float64)
+        starts = np.r_[0, np.flatnonzero(np.diff(gid)) + 1]
+        seg = np.repeat(starts, np.diff(np.r_[starts, len(gid)]))
+
+        def exclusive_cumsum(a):
+            total = np.cumsum(a, axis=0)
+            base = np.where(seg[:, None] > 0, total[seg - 1], 0.0) if len(a) else total
+            return total - a - base
+
+        cnt = prior_n[gid] + exclusive_cumsum(c)
+        sum_d = prior_n[gid] * (prior_mean[gid] - shift[gid]) + exclusive_cumsum(d)
+        sum_d2 = (prior_m2[gid] + prior_n[gid] * (prior_mean[gid] - shift[gid]) ** 2
+                  + exclusive_cumsum(d * d))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_d = sum_d / cnt
+            var = (sum_d2 - cnt * mean_d ** 2) / (cnt - 1)
+            z_sorted = (d - mean_d) / np.sqrt(np.maximum(var, 0))
+        z_sorted[~ok | (cnt < self.min_history)] = np.nan
+
+        z = np.empty_like(z_sorted)
+        z[order] = z_sorted
+
+        # Fold the batch into the running state
+        for g, s in enumerate(prior):
+            rows = slice(starts[g], starts[g + 1] if g + 1 < n_groups else len(gid))
+            n_tot = s.n + c[rows].sum(axis=0)
+            sd = s.n * (s.mean - shift[g]) + d[rows].sum(axis=0)
+            sd2 = s.m2 + s.n * (s.mean - shift[g]) ** 2 + (d[rows] ** 2).sum(axis=0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean_d_tot = np.where(n_tot > 0, sd / n_tot, 0.0)
+            s.mean = np.where(n_tot > 0, shift[g] + mean_d_tot, 0.0)
+            s.m2 = np.maximum(sd2 - n_tot * mean_d_tot ** 2, 0)
+            s.n = n_tot
+
+        flags = np.abs(z) >= self.z_threshold
+        out = pd.DataFrame(z, index=pitches.index, columns=[f'z_{m}' for m in self.metrics])
+        out['anomaly'] = flags.any(axis=1)
+        names = np.array(self.metrics, dtype=object)
+        out['flagged'] = [','.join(names[row]) for row in flags]
+        return out
+
+    def state(self):
+        """Current running statistics as a DataFrame (one row per group/metric)."""
+        rows = []
+        for key, s in self._stats.items():
+            for j, metric in enumerate(self.metrics):
+                std = np.sqrt(s.m2[j] / (s.n[j] - 1)) if s.n[j] > 1 else np.nan
+                rows.append((*key, metric, int(s.n[j]), s.mean[j], std))
+        return pd.DataFrame(rows, columns=[*self.keys, 'metric', 'n', 'mean', 'std'])
@@ -0,0 +1,111 @@
+"""Batched bootstrap confidence intervals for period-level rates.
+
+Every rate in the reports is a ratio of sums (whiffs / swings, xwOBA sum /
+batted balls, ...). ``bootstrap_rates`` resamples units (pitches or plate
+appearances) within every group at once: units are sorted by group, one
+(B, N) matrix of resampled indices is drawn with per-group offsets, and
+``np.add.reduceat`` sums each group's segment for all replicates in one
+call. The replicate count multiplies array size, not Python work.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.sql import SWING_DESCRIPTIONS, WHIFF_DESCRIPTIONS
+
+PA_KEYS = ('game_pk', 'at_bat_number')
+MAX_CELLS = 4_000_000  # resampled units per chunk (x columns x 8 bytes in memory)
+
+
+def rate_columns(df):
+    """Numerator/denominator columns for the standard rates.
+
+    Returns (frame, metrics) where metrics maps a rate name to its
+    (numerator, denominator) column pair in frame.
+    """
+    desc = df['description']
+    batted = df['launch_speed'].notna() & df['estimated_woba_using_speedangle'].notna()
+    frame = pd.DataFrame({
+        'whiffs': desc.isin(WHIFF_DESCRIPTIONS).astype(np.float64),
+        'swings': desc.isin(SWING_DESCRIPTIONS).astype(np.float64),
+        'xwoba_sum': df['estimated_woba_using_speedangle'].where(batted, 0.0).astype(np.float64),
+        'batted': batted.astype(np.float64),
+    }, index=df.index)
+    metrics = {
+        'whiff_rate': ('whiffs', 'swings'),
+        'swing_rate': ('swings', None),
+        'xwOBA': ('xwoba_sum', 'batted'),
+    }
+    return frame, metrics
+
+
+def bootstrap_rates(df, group_cols, unit='pitch', n_boot=2000, ci=0.95, seed=0, metrics=None):
+    """Point estimates and percentile CIs for ratio metrics per group.
+
+    Args:
+        df: raw pitches
+        group_cols: grouping columns, e.g. ['period', 'pitch_type']
+        unit: 'pitch' or 'pa' (resample whole plate appearances)
+        n_boot: bootstrap replicates
+        ci: central interval width
+        seed: RNG seed
+        metrics: (frame, {name: (num, den)}) as from rate_columns; a den of
+            None means "per unit" (denominator = unit count)
+
+    Returns:
+        DataFrame: group_cols, metric, n_units, estimate, lo, hi
+    """
+    group_cols = list(group_cols)
+    frame, spec = metrics if metrics is not None else rate_columns(df)
+    values = pd.concat([df[group_cols], frame], axis=1)
+    if unit == 'pa':
+        values = pd.concat([values, df[list(PA_KEYS)]], axis=1)
+        values = values.groupby(group_cols + list(PA_KEYS), sort=False, dropna=False,
+                                observed=True)[list(frame.columns)].sum().reset_index()
+    elif unit != 'pitch':
+        raise ValueError(f"unit must be 'pitch' or 'pa', got {unit!r}")
+    values['_units'] = 1.0
+
+    values = values.sort_values(group_cols, kind='stable').reset_index(drop=True)
+    gid = values.groupby(group_cols, sort=False, dropna=False, observed=True).ngroup().to_numpy()
+    starts = np.r_[0, np.flatnonzero(np.diff(gid)) + 1]
+    sizes = np.diff(np.r_[starts, len(gid)])
+    keys = values.iloc[starts][group_cols].reset_index(drop=True)
+
+    cols = sorted({c for pair in spec.values() for c in pair if c is not None} | {'_units'})
+    data = values[cols].to_numpy(dtype=np.float64)
+    col_idx = {c: i for i, c in enumerate(cols)}
+
+    # Resampled column sums: (n_boot, groups, columns), built in row-chunks of replicates
+    rng = np.random.default_rng(seed)
+    offsets = starts[gid]
+    unit_size = sizes[gid]
+    reps = np.empty((n_boot, len(starts), len(cols)))
+    step = max(1, MAX_CELLS // max(len(gid), 1))
+    for lo in range(0, n_boot, step):
+        b = min(step, n_boot - lo)
+        idx = offsets + (rng.random((b, len(gid))) * unit_size).astype(np.int64)
+        sampled = data[idx]                      # (b, N, columns)
+        reps[lo:lo + b] = np.add.reduceat(sampled, starts, axis=1)
+
+    totals = np.add.reduceat(data, starts, axis=0)  # (groups, columns)
+    alpha = (1 - ci) / 2
+    out = []
+    for name, (num, den) in spec.items():
+        den = den or '_units'
+        with np.errstate(invalid='ignore', divide='ignore'):
+            est = totals[:, col_idx[num]] / totals[:, col_idx[den]]
+            boot = reps[:, :, col_idx[num]] / reps[:, :, col_idx[den]]
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)  # groups with a zero denominator
+            lo_q, hi_q = np.nanquantile(boot, [alpha, 1 - alpha], axis=0)
+        part = keys.copy()
+        part['metric'] = name
+        part['n_units'] = sizes
+        part['estimate'] = est
+        part['lo'] = lo_q
+        part['hi'] = hi_q
+        out.append(part)
+    return pd.concat(out, ignore_index=True)
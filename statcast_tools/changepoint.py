@@ -0,0 +1,161 @@
+"""CUSUM change-point scan for proposing split dates.
+
+Split dates such as INJURY_DATE, TRADE_DATE or ASB_DATE are entered by hand.
+``propose_splits`` scans each pitcher's per-game series (fastball velocity,
+whiff rate, release point, pitch mix) for the game where the mean shifts
+the most. For standardised series x_1..x_n and a split after game k, the
+CUSUM S_k = sum_{i<=k} (x_i - mean) gives the mean-shift statistic
+
+    T_k = S_k^2 * n / (k * (n - k))
+
+summed over the metrics. The best k is the argmax. Cumulative sums are taken
+with a grouped ``cumsum`` over all pitchers at once, so one scan is linear
+in the number of games in the league. With ``max_splits > 1`` every
+accepted segment is scanned again (binary segmentation), one linear pass
+per round.
+"""
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.sql import IS_SWING, IS_WHIFF
+
+SERIES_METRICS = ('primary_velo', 'whiff_rate', 'release_x', 'release_z',
+                  'mix_1', 'mix_2', 'mix_3')
+
+
+def game_series(con, pitches):
+    """Per-(pitcher, game) series used by the scan.
+
+    primary_velo is the velocity of the pitcher's most used pitch type, and
+    mix_1..3 are the usage shares of their top three pitch types.
+    """
+    con.register('_cp_pitches', pitches)
+    try:
+        return con.execute(f"""
+            WITH ranked AS (
+                SELECT pitcher, pitch_type,
+                       ROW_NUMBER() OVER(PARTITION BY pitcher ORDER BY COUNT(*) DESC, pitch_type) as rk
+                FROM _cp_pitches
+                WHERE pitch_type IS NOT NULL
+                GROUP BY pitcher, pitch_type
+            )
+            SELECT
+                p.pitcher,
+                p.game_pk,
+                MIN(p.game_date::DATE) as game_date,
+                COUNT(*) as pitches,
+                AVG(CASE WHEN r.rk = 1 THEN p.release_speed END) as primary_velo,
+                SUM({IS_WHIFF}) / NULLIF(SUM({IS_SWING}), 0) as whiff_rate,
+                AVG(p.release_pos_x) as release_x,
+                AVG(p.release_pos_z) as release_z,
+                AVG(CASE WHEN r.rk = 1 THEN 1.0 ELSE 0.0 END) as mix_1,
+                AVG(CASE WHEN r.rk = 2 THEN 1.0 ELSE 0.0 END) as mix_2,
+                AVG(CASE WHEN r.rk = 3 THEN 1.0 ELSE 0.0 END) as mix_3
+            FROM _cp_pitches p
+            LEFT JOIN ranked r ON p.pitcher = r.pitcher AND p.pitch_type = r.pitch_type
+            GROUP BY p.pitcher, p.game_pk
+            ORDER BY p.pitcher, game_date, p.game_pk
+        """).df()
+    finally:
+        con.unregister('_cp_pitches')
+
+
+def _best_splits(seg, z, min_games):
+    """Best split per segment. seg must be sorted; z is (games, metrics)."""
+    starts = np.r_[0, np.flatnonzero(np.diff(seg)) + 1]
+    sizes = np.diff(np.r_[starts, len(seg)])
+    seg_start = np.repeat(starts, sizes)
+    n = np.repeat(sizes, sizes).astype(np.float64)
+    k = np.arange(len(seg)) - seg_start + 1.0  # games in the left part
+
+    # centre within segment, then grouped cumulative sums
+    sums = np.add.reduceat(z, starts, axis=0)
+    centred = z - (sums / sizes[:, None])[np.searchsorted(starts, seg_start)]
+    total = np.cumsum(centred, axis=0)
+    base = np.where(seg_start[:, None] > 0, total[seg_start - 1], 0.0)
+    cusum = total - base
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stat = (cusum ** 2).sum(axis=1) * n / (k * (n - k))
+    stat[(k < min_games) | (n - k < min_games)] = -np.inf
+
+    stat[np.isnan(stat)] = -np.inf
+
+    # segment maximum, then the first game reaching it (two linear passes)
+    score = np.maximum.reduceat(stat, starts)
+    rows = np.arange(len(seg))
+    hit = stat == np.repeat(score, sizes)
+    best = np.minimum.reduceat(np.where(hit, rows, len(seg)), starts)
+    best[np.isneginf(score)] = -1
+    return best, score
+
+
+def propose_splits(series, metrics=SERIES_METRICS, min_games=5, max_splits=1, penalty=None):
+    """Propose split dates for every pitcher.
+
+    Args:
+        series: output of ``game_series`` (one row per pitcher/game)
+        metrics: series columns to scan jointly
+        min_games: minimum games on each side of a split
+        max_splits: binary-segmentation rounds per pitcher
+        penalty: minimum score to accept a split; defaults to
+            2 * len(metrics) * log(games) (a BIC-style penalty)
+
+    Returns:
+        DataFrame: pitcher, split_date (first game of the new segment),
+        games_before, games_after, score and the mean shift of each metric
+        (after - before, original units).
+    """
+    series = series.sort_values(['pitcher', 'game_date', 'game_pk']).reset_index(drop=True)
+    metrics = [m for m in metrics if m in series.columns]
+    raw = series[metrics].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    # per-pitcher standardisation, missing values set to the pitcher mean
+    pid = series['pitcher'].to_numpy()
+    grouped = series.groupby('pitcher', sort=False)[metrics]
+    mean = grouped.transform('mean').to_numpy(dtype=np.float64, na_value=np.nan)
+    std = grouped.transform('std').to_numpy(dtype=np.float64, na_value=np.nan)
+    std = np.where(std > 0, std, 1.0)
+    z = np.nan_to_num((raw - mean) / std)
+
+    boundaries = np.zeros(len(series), dtype=bool)
+    accepted = []
+    for _ in range(max_splits if len(series) else 0):
+        new_pitcher = np.r_[True, pid[1:] != pid[:-1]]
+        seg = np.cumsum(new_pitcher | boundaries)
+        best, score = _best_splits(seg, z, min_games)
+        starts = np.r_[0, np.flatnonzero(np.diff(seg)) + 1]
+        sizes = np.diff(np.r_[starts, len(seg)])
+        limit = (2 * len(metrics) * np.log(sizes)) if penalty is None else np.full(len(sizes), penalty)
+        ok = (best >= 0) & (score > limit)
+        if not ok.any():
+            break
+        split_rows = best[ok] + 1
+        boundaries[split_rows] = True
+        accepted.append(pd.DataFrame({'row': split_rows, 'score': score[ok],
+                                      'start': starts[ok], 'end': (starts + sizes)[ok]}))
+
+    if not accepted:
+        return pd.DataFrame(columns=['pitcher', 'split_date', 'games_before', 'games_after',
+                                     'score', *[f'{m}_shift' for m in metrics]])
+    splits = pd.concat(accepted, ignore_index=True)
+    rows = splits['row'].to_numpy()
+    out = pd.DataFrame({
+        'pitcher': series['pitcher'].to_numpy()[rows],
+        'split_date': series['game_date'].to_numpy()[rows],
+        'games_before': rows - splits['start'].to_numpy(),
+        'games_after': splits['end'].to_numpy() - rows,
+        'score': splits['score'].round(1).to_numpy(),
+    })
+    # segment means from prefix sums over the raw (NaN-skipping) values
+    finite = np.isfinite(raw)
+    csum = np.vstack([np.zeros(len(metrics)), np.cumsum(np.where(finite, raw, 0.0), axis=0)])
+    ccnt = np.vstack([np.zeros(len(metrics)), np.cumsum(finite, axis=0)])
+    start, end = splits['start'].to_numpy(), splits['end'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        before = (csum[rows] - csum[start]) / (ccnt[rows] - ccnt[start])
+        after = (csum[end] - csum[rows]) / (ccnt[end] - ccnt[rows])
+    for j, m in enumerate(metrics):
+        out[f'{m}_shift'] = np.round(after[:, j] - before[:, j], 3)
+    return out.sort_values(['pitcher', 'split_date']).reset_index(drop=True)
@@ -0,0 +1,64 @@
+"""Batted-ball coordinate transform shared by field plots and spray analyses.
+
+The transform is applied once to the whole batted-ball table, in place,
+so hits/outs/per-event subsets are plain row selections that already carry
+x, y, spray angle, distance and direction.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Statcast hc_x/hc_y → feet, home plate at the origin
+HC_X_HOME = 125.42
+HC_Y_HOME = 198.27
+HC_SCALE = 2.5
+
+# |spray angle| within this many degrees of dead centre counts as 'center'
+CENTER_HALF_WIDTH = 15.0
+SPRAY_DIRECTIONS = ['pull', 'center', 'oppo']
+
+
+def transform_statcast_coords(df, stand_col='stand'):
+    """Statcast座標を標準的な野球場座標に変換（in place, 列を追加して df を返す）
+
+    変換後:
+    - ホームプレートが原点(0, 0)
+    - Y軸が外野方向に増加
+    - 単位はおおよそフィート
+
+    Added float32 columns:
+        x, y: field coordinates (feet)
+        spray_angle: degrees from centre field, negative = left field
+        hit_dist_est: distance from home plate estimated from x, y (feet)
+        pull_angle: spray angle signed so positive = batter's pull side
+            (needs ``stand``; NaN where it is missing)
+    Added categorical column:
+        spray_dir: 'pull' / 'center' / 'oppo' from pull_angle
+
+    Only the new columns are allocated; existing columns are not copied.
+    """
+    hc_x = df['hc_x'].to_numpy(dtype=np.float32, na_value=np.nan)
+    hc_y = df['hc_y'].to_numpy(dtype=np.float32, na_value=np.nan)
+
+    x = np.float32(HC_SCALE) * (hc_x - np.float32(HC_X_HOME))
+    y = np.float32(HC_SCALE) * (np.float32(HC_Y_HOME) - hc_y)
+    spray = np.degrees(np.arctan2(x, y))
+
+    df['x'] = x
+    df['y'] = y
+    df['spray_angle'] = spray
+    df['hit_dist_est'] = np.hypot(x, y)
+
+    if stand_col in df.columns:
+        stand = df[stand_col].to_numpy()
+        # RHB pull to left field (negative angle), LHB pull to right field
+        sign = np.where(stand == 'R', -1.0, np.where(stand == 'L', 1.0, np.nan))
+        pull = (spray * sign).astype(np.float32)
+        df['pull_angle'] = pull
+
+        codes = np.where(pull > CENTER_HALF_WIDTH, 0,
+                         np.where(pull < -CENTER_HALF_WIDTH, 2, 1))
+        codes[np.isnan(pull)] = -1
+        df['spray_dir'] = pd.Categorical.from_codes(codes, categories=SPRAY_DIRECTIONS)
+
+    return df
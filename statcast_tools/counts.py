@@ -0,0 +1,98 @@
+"""Precomputed ball-strike count columns and per-count pitch matrices.
+
+``add_count_columns`` tags every pitch once, at load, with two small
+integer columns. Count queries then group on these integers instead of
+re-evaluating the ``CASE WHEN balls = 3 AND strikes = 2 ...`` string
+expression in both the SELECT and the window PARTITION BY.
+
+- count_idx: balls * 3 + strikes (0 = 0-0 ... 11 = 3-2), see COUNT_LABELS
+- count_state: index into COUNT_STATES (Ahead/Even/Behind/Full Count)
+
+Use COUNT_STATE_LABEL in SQL to turn the code back into its name after
+grouping.
+"""
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.sql import SWING_DESCRIPTIONS, WHIFF_DESCRIPTIONS
+
+N_COUNTS = 12
+COUNT_LABELS = [f'{b}-{s}' for b in range(4) for s in range(3)]
+COUNT_STATES = ('Ahead', 'Even', 'Behind', 'Full Count')
+
+
+def count_index(balls, strikes):
+    """Flat index of a (balls, strikes) count: balls * 3 + strikes."""
+    return np.asarray(balls) * 3 + np.asarray(strikes)
+
+
+def _state_of(b, s):
+    if b == 3 and s == 2:
+        return 3
+    if b > s:
+        return 2
+    if s > b:
+        return 0
+    return 1
+
+
+# count_idx -> count_state code
+STATE_OF_COUNT = np.array([_state_of(b, s) for b in range(4) for s in range(3)], dtype=np.int8)
+
+# SQL: count_state code -> name (DuckDB lists are 1-based)
+COUNT_STATE_LABEL = '[{}][count_state + 1]'.format(', '.join(f"'{s}'" for s in COUNT_STATES))
+
+
+def add_count_columns(df):
+    """Add int8 count_idx and count_state columns in place (-1 where the count is invalid)."""
+    balls = df['balls'].to_numpy(dtype=np.float64, na_value=np.nan)
+    strikes = df['strikes'].to_numpy(dtype=np.float64, na_value=np.nan)
+    ok = (balls >= 0) & (balls <= 3) & (strikes >= 0) & (strikes <= 2)
+    idx = np.where(ok, count_index(np.where(ok, balls, 0), np.where(ok, strikes, 0)), -1).astype(np.int8)
+    df['count_idx'] = idx
+    df['count_state'] = np.where(ok, STATE_OF_COUNT[np.maximum(idx, 0)], -1).astype(np.int8)
+    return df
+
+
+def count_matrices(df, by=('pitcher',)):
+    """Per-group 12-count x pitch_type usage and whiff matrices in one pass.
+
+    Args:
+        df: pitches with count_idx (see add_count_columns), pitch_type and description
+        by: grouping columns
+
+    Returns:
+        (usage, whiff): DataFrames indexed by (*by, count) with one column per
+        pitch type. usage is the pitch type's share within the count;
+        whiff is whiffs / swings (NaN without swings).
+    """
+    by = list(by)
+    if 'count_idx' not in df.columns:
+        df = add_count_columns(df.copy())
+    ok = (df['count_idx'].to_numpy() >= 0) & df['pitch_type'].notna().to_numpy()
+    sub = df[ok]
+    group_ids, groups = pd.MultiIndex.from_frame(sub[by]).factorize()
+    type_ids, types = pd.factorize(sub['pitch_type'], sort=True)
+    shape = (len(groups), N_COUNTS, len(types))
+    flat = np.ravel_multi_index((group_ids, sub['count_idx'].to_numpy(dtype=np.int64), type_ids), shape)
+    size = int(np.prod(shape))
+
+    desc = sub['description']
+    pitches = np.bincount(flat, minlength=size).reshape(shape)
+    swings = np.bincount(flat, weights=desc.isin(SWING_DESCRIPTIONS), minlength=size).reshape(shape)
+    whiffs = np.bincount(flat, weights=desc.isin(WHIFF_DESCRIPTIONS), minlength=size).reshape(shape)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        usage = pitches / pitches.sum(axis=2, keepdims=True)
+        whiff = whiffs / swings
+
+    index = pd.MultiIndex.from_tuples(
+        [(*(g if isinstance(g, tuple) else (g,)), c) for g in groups for c in COUNT_LABELS],
+        names=by + ['count'])
+    columns = pd.Index(types, name='pitch_type')
+    usage = pd.DataFrame(usage.reshape(-1, len(types)), index=index, columns=columns)
+    whiff = pd.DataFrame(whiff.reshape(-1, len(types)), index=index, columns=columns)
+    # counts a group never reached
+    seen = pitches.sum(axis=2).reshape(-1) > 0
+    return usage[seen], whiff[seen]
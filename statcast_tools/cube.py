@@ -0,0 +1,179 @@
+"""Pre-aggregated pitch cube: pitcher x period x pitch_type x stand x count x TTO x zone.
+
+Most report sections are one slice of the same aggregation. Arsenal by
+period, L/R splits, two-strike mix, times-through-order and zone
+breakdowns only differ in which axes they keep. ``PitchCube`` makes one
+DuckDB pass that groups raw pitches by every axis and stores the
+non-empty cells in coordinate form. Each axis is dictionary-encoded as
+small integer codes, next to a (cells, measures) array of additive sums
+and counts. ``rollup`` then answers any breakdown with a mask plus one
+``np.bincount`` per measure, with no further queries.
+
+Axes: pitcher, period, pitch_type, stand, count_idx (balls * 3 + strikes),
+tto ('1st' / '2nd' / '3rd+', per batter within a game) and zone_type
+('In Zone' = zones 1-9, 'Chase' = 11-14, 'Waste' = other zones; None
+where zone is missing).
+"""
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.counts import COUNT_LABELS
+from statcast_tools.sql import IS_SWING, IS_WHIFF
+
+CUBE_AXES = ('pitcher', 'period', 'pitch_type', 'stand', 'count_idx', 'tto', 'zone_type')
+
+# measure name -> SQL aggregate over raw pitches
+MEASURES = {
+    'pitches': 'COUNT(*)',
+    'swings': f'SUM({IS_SWING})',
+    'whiffs': f'SUM({IS_WHIFF})',
+    'velo_sum': 'SUM(release_speed)',
+    'velo_n': 'COUNT(release_speed)',
+    'spin_sum': 'SUM(release_spin_rate)',
+    'spin_n': 'COUNT(release_spin_rate)',
+    'pfx_x_sum': 'SUM(pfx_x * 12)',
+    'pfx_z_sum': 'SUM(pfx_z * 12)',
+    'pfx_n': 'COUNT(pfx_x)',
+    'batted': 'COUNT(launch_speed)',
+    'ev_sum': 'SUM(launch_speed)',
+    'hard_hit': 'SUM(CASE WHEN launch_speed >= 95 THEN 1 ELSE 0 END)',
+    'xwoba_sum': 'SUM(estimated_woba_using_speedangle)',
+    'xwoba_n': 'COUNT(estimated_woba_using_speedangle)',
+}
+MEASURE_INPUTS = ('description', 'release_speed', 'release_spin_rate', 'pfx_x', 'pfx_z',
+                  'launch_speed', 'estimated_woba_using_speedangle')
+
+# derived column -> (numerator, denominator, scale)
+RATES = {
+    'whiff_rate': ('whiffs', 'swings', 100.0),
+    'swing_rate': ('swings', 'pitches', 100.0),
+    'avg_velo': ('velo_sum', 'velo_n', 1.0),
+    'avg_spin': ('spin_sum', 'spin_n', 1.0),
+    'h_break_in': ('pfx_x_sum', 'pfx_n', 1.0),
+    'v_break_in': ('pfx_z_sum', 'pfx_n', 1.0),
+    'avg_exit_velo': ('ev_sum', 'batted', 1.0),
+    'hard_hit_pct': ('hard_hit', 'batted', 100.0),
+    'avg_xwOBA': ('xwoba_sum', 'xwoba_n', 1.0),
+}
+
+_AXIS_SQL = {
+    'count_idx': 'balls * 3 + strikes',
+    'tto': """CASE DENSE_RANK() OVER(PARTITION BY game_pk, pitcher, batter ORDER BY at_bat_number)
+                WHEN 1 THEN '1st' WHEN 2 THEN '2nd' ELSE '3rd+' END""",
+    'zone_type': """CASE
+                WHEN zone BETWEEN 1 AND 9 THEN 'In Zone'
+                WHEN zone BETWEEN 11 AND 14 THEN 'Chase'
+                WHEN zone IS NOT NULL THEN 'Waste'
+            END""",
+}
+
+
+class PitchCube:
+    """Sparse additive cube over raw pitches.
+
+    Attributes:
+        axes: axis names
+        labels: {axis: array of labels}; codes index into these
+        codes: (cells, axes) int32 axis codes
+        values: (cells, measures) float64 additive measures
+    """
+
+    def __init__(self, cells, axes):
+        self.axes = list(axes)
+        self.measures = list(MEASURES)
+        self.labels = {}
+        codes = []
+        for axis in self.axes:
+            c, uniques = pd.factorize(cells[axis], sort=True, use_na_sentinel=False)
+            self.labels[axis] = np.asarray(uniques, dtype=object)
+            codes.append(c.astype(np.int32))
+        self.codes = np.column_stack(codes) if codes else np.zeros((len(cells), 0), dtype=np.int32)
+        self.values = cells[self.measures].to_numpy(dtype=np.float64, na_value=0.0)
+
+    @classmethod
+    def from_pitches(cls, con, pitches, axes=CUBE_AXES):
+        """Group raw pitches by every axis in one DuckDB pass."""
+        axes = list(axes)
+        tagged = ',\n                    '.join(f'{_AXIS_SQL.get(a, a)} as {a}' for a in axes)
+        measures = ',\n                    '.join(f'{sql} as {name}' for name, sql in MEASURES.items())
+        con.register('_cube_src', pitches)
+        try:
+            cells = con.execute(f"""
+                WITH tagged AS (
+                    SELECT
+                    {tagged},
+                    {', '.join(MEASURE_INPUTS)}
+                    FROM _cube_src
+                )
+                SELECT
+                    {', '.join(axes)},
+                    {measures}
+                FROM tagged
+                GROUP BY {', '.join(axes)}
+            """).df()
+        finally:
+            con.unregister('_cube_src')
+        return cls(cells, axes)
+
+    def _mask(self, where):
+        mask = np.ones(len(self.codes), dtype=bool)
+        for axis, value in where.items():
+            values = value if isinstance(value, (list, tuple, set, np.ndarray)) else [value]
+            if axis == 'count_idx':
+                values = [COUNT_LABELS.index(v) if isinstance(v, str) else v for v in values]
+            allowed = pd.Index(self.labels[axis]).isin(list(values))
+            mask &= allowed[self.codes[:, self.axes.index(axis)]]
+        return mask
+
+    def rollup(self, by, pct_within=None, dropna=(), **where):
+        """Aggregate the cube down to ``by`` axes.
+
+        Args:
+            by: axes to keep, e.g. ['period', 'tto']
+            pct_within: axes (a subset of ``by``) whose totals are the
+                denominator of a ``pct`` column (usage share), e.g. ['period']
+            dropna: axes whose missing label (None) is excluded
+            where: axis filters, scalar or list, e.g. pitch_type='FO',
+                period=['2025-Pre', '2025-Post']
+
+        Returns:
+            DataFrame: ``by`` columns, the additive measures and the RATES
+            columns (percentages for *_rate / *_pct), one row per non-empty
+            combination.
+        """
+        by = list(by)
+        mask = self._mask(where)
+        for axis in dropna:
+            mask &= pd.notna(self.labels[axis])[self.codes[:, self.axes.index(axis)]]
+        cols = [self.axes.index(a) for a in by]
+        sizes = [len(self.labels[a]) for a in by]
+        codes = self.codes[mask][:, cols]
+        values = self.values[mask]
+        flat = np.ravel_multi_index(codes.T, sizes) if by else np.zeros(len(codes), dtype=np.int64)
+        # dense bins when the kept axes are small, compacted keys otherwise
+        n = int(np.prod(sizes, dtype=np.float64)) if by else 1
+        if n > 4 * len(flat) + 1024:
+            keys, flat = np.unique(flat, return_inverse=True)
+            n = len(keys)
+        else:
+            keys = np.arange(n)
+        sums = np.stack([np.bincount(flat, weights=values[:, j], minlength=n)
+                         for j in range(len(self.measures))], axis=1)
+        present = np.flatnonzero(sums[:, self.measures.index('pitches')] > 0)
+
+        out = pd.DataFrame(
+            {a: self.labels[a][idx] for a, idx in zip(by, np.unravel_index(keys[present], sizes))}
+            if by else {}, index=range(len(present)))
+        if 'count_idx' in by:
+            out['count_idx'] = [COUNT_LABELS[int(c)] for c in out['count_idx']]
+        for j, m in enumerate(self.measures):
+            out[m] = sums[present, j] if m.endswith('_sum') else sums[present, j].astype(np.int64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name, (num, den, scale) in RATES.items():
+                out[name] = scale * out[num] / out[den].where(out[den] > 0)
+        if pct_within is not None:
+            total = out.groupby(list(pct_within), sort=False)['pitches'].transform('sum') \
+                if pct_within else out['pitches'].sum()
+            out['pct'] = 100.0 * out['pitches'] / total
+        return out
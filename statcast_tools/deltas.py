@@ -0,0 +1,87 @@
+"""All-pairs period deltas ("biggest changes") in one broadcast.
+
+A per-(period, pitch_type) profile (usage, velocity, whiff rate, movement)
+is laid out as an array A[period, pitch_type, metric]. Then
+
+    D = A[None, :, :, :] - A[:, None, :, :]      D[i, j] = A[j] - A[i]
+
+holds the change for every ordered pair of periods at once. Pairs are
+kept from earlier to later in the given period order, so 8 periods give
+all 28 comparisons. Each delta is divided by its metric's scale (what
+counts as a notable shift), so different metrics can be ranked together.
+"""
+
+import numpy as np
+import pandas as pd
+
+# metric -> size of a notable change (usage pp, mph, whiff pp, inches)
+DELTA_METRICS = {
+    'pct': 5.0,
+    'avg_velo': 1.0,
+    'whiff_rate': 5.0,
+    'h_break_in': 2.0,
+    'v_break_in': 2.0,
+}
+
+
+def period_deltas(profile, periods, period_col='period', metrics=DELTA_METRICS, min_pitches=0):
+    """Changes between every ordered pair of periods.
+
+    Args:
+        profile: one row per (period, pitch_type) with the metric columns,
+            e.g. ``cube.rollup(['period', 'pitch_type'], pct_within=['period'])``
+        periods: period order; pairs run from earlier to later
+        period_col: period column in ``profile``
+        metrics: {metric: scale}; metrics missing from ``profile`` are skipped
+        min_pitches: cells with fewer pitches (when a 'pitches' column
+            exists) count as missing for everything but usage
+
+    Returns:
+        DataFrame sorted by score (descending): from, to, pitch_type,
+        metric, before, after, delta, score (= |delta| / scale). A pitch
+        type absent from a period has usage 0 and no other metrics.
+    """
+    metrics = {m: s for m, s in metrics.items() if m in profile.columns}
+    names = list(metrics)
+    periods = list(periods)
+    profile = profile[profile[period_col].isin(periods) & profile['pitch_type'].notna()]
+    types = sorted(profile['pitch_type'].unique())
+
+    A = np.full((len(periods), len(types), len(names)), np.nan)
+    p = pd.Index(periods).get_indexer(profile[period_col])
+    t = pd.Index(types).get_indexer(profile['pitch_type'])
+    values = profile[names].to_numpy(dtype=np.float64, na_value=np.nan)
+    if min_pitches and 'pitches' in profile.columns:
+        thin = profile['pitches'].to_numpy() < min_pitches
+        values[thin] = np.where(np.array(names) == 'pct', values[thin], np.nan)
+    A[p, t] = values
+    if 'pct' in metrics:
+        A[:, :, names.index('pct')] = np.nan_to_num(A[:, :, names.index('pct')])
+
+    D = A[None, :, :, :] - A[:, None, :, :]                 # (from, to, type, metric)
+    scale = np.array([metrics[m] for m in names])
+    i, j = np.triu_indices(len(periods), k=1)
+    pair_d = D[i, j]                                        # (pairs, type, metric)
+    before = np.broadcast_to(A[i], pair_d.shape)
+    after = np.broadcast_to(A[j], pair_d.shape)
+
+    pair, ti, mi = np.nonzero(np.isfinite(pair_d))
+    delta = pair_d[pair, ti, mi]
+    out = pd.DataFrame({
+        'from': np.asarray(periods, dtype=object)[i[pair]],
+        'to': np.asarray(periods, dtype=object)[j[pair]],
+        'pitch_type': np.asarray(types, dtype=object)[ti],
+        'metric': np.asarray(names, dtype=object)[mi],
+        'before': before[pair, ti, mi],
+        'after': after[pair, ti, mi],
+        'delta': delta,
+        'score': np.abs(delta) / scale[mi],
+    })
+    return out.sort_values('score', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def pair_changes(deltas, start, end, metric='pct', min_abs=0.0):
+    """One pair's changes for one metric, sorted by delta (most negative first)."""
+    rows = deltas[(deltas['from'] == start) & (deltas['to'] == end) & (deltas['metric'] == metric)
+                  & (deltas['delta'].abs() >= min_abs)]
+    return rows.sort_values(['delta', 'pitch_type']).reset_index(drop=True)
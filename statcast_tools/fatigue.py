@@ -0,0 +1,123 @@
+"""In-game fatigue curves for every pitcher in one windowed pass.
+
+The per-pitcher scripts number pitches with
+``ROW_NUMBER() OVER(PARTITION BY game_pk ...)`` for a single pitcher. Here the
+window is partitioned by (pitcher, game_pk), so one query numbers every
+pitch of every pitcher in every game. The numbered pitches are materialised
+once and then aggregated two ways:
+
+- curves: avg velocity / spin per pitch-count bin (configurable edges)
+- slopes: least-squares change in velocity / spin per 100 pitches, fitted
+  on values de-meaned within each game so that day-to-day differences in
+  overall velocity do not leak into the within-game decay
+
+Pitch numbers count *all* pitches the pitcher has thrown in the game, before
+the pitch_type filter is applied.
+"""
+
+PITCH_COUNT_EDGES = (25, 50, 75, 100)
+
+
+def bin_labels(edges):
+    """Labels for the bins defined by upper edges, e.g. ['1-25', ..., '101+']."""
+    labels = []
+    lower = 1
+    for upper in edges:
+        labels.append(f'{lower}-{upper}')
+        lower = upper + 1
+    labels.append(f'{lower}+')
+    return labels
+
+
+def _bin_case(column, edges):
+    """CASE expression mapping a pitch number to its 0-based bin index."""
+    whens = '\n'.join(f'            WHEN {column} <= {upper} THEN {i}'
+                      for i, upper in enumerate(edges))
+    return f'CASE\n{whens}\n            ELSE {len(edges)}\n        END'
+
+
+def fatigue_curves(con, pitches, pitch_types=('FF',), edges=PITCH_COUNT_EDGES,
+                   by=('season',), min_pitches=5):
+    """Velocity/spin decay by in-game pitch count for all pitchers.
+
+    Args:
+        con: DuckDB connection
+        pitches: DataFrame of raw pitches, or the name of a table in ``con``
+        pitch_types: pitch types to include in the curves (None = all)
+        edges: upper edges of the pitch-count bins
+        by: extra grouping columns (e.g. ('season',) or ('period',))
+        min_pitches: bins/fits with fewer pitches are dropped
+
+    Returns:
+        (curves, slopes) DataFrames.
+        curves: pitcher, *by, pitch_type, bin, pitch_range, pitches, avg_velo, avg_spin
+        slopes: pitcher, *by, pitch_type, pitches, games, velo_per_100, spin_per_100
+    """
+    table = pitches
+    if not isinstance(pitches, str):
+        con.register('_fatigue_src', pitches)
+        table = '_fatigue_src'
+
+    group = ', '.join(['pitcher', *by, 'pitch_type'])
+    type_filter = ''
+    if pitch_types is not None:
+        type_filter = 'WHERE pitch_type IN (' + ', '.join(f"'{p}'" for p in pitch_types) + ')'
+
+    con.execute(f"""
+        CREATE OR REPLACE TEMP TABLE _fatigue_seq AS
+        SELECT
+            *,
+            pitch_num - AVG(pitch_num) OVER game_type as num_dm,
+            release_speed - AVG(release_speed) OVER game_type as velo_dm,
+            release_spin_rate - AVG(release_spin_rate) OVER game_type as spin_dm
+        FROM (
+            SELECT
+                pitcher,
+                {', '.join(by) + ',' if by else ''}
+                game_pk,
+                pitch_type,
+                release_speed,
+                release_spin_rate,
+                ROW_NUMBER() OVER(
+                    PARTITION BY pitcher, game_pk
+                    ORDER BY at_bat_number, pitch_number
+                ) as pitch_num
+            FROM {table}
+        )
+        {type_filter}
+        WINDOW game_type AS (PARTITION BY pitcher, game_pk, pitch_type)
+    """)
+
+    labels = bin_labels(edges)
+    curves = con.execute(f"""
+        SELECT
+            {group},
+            {_bin_case('pitch_num', edges)} as bin,
+            COUNT(*) as pitches,
+            ROUND(AVG(release_speed), 1) as avg_velo,
+            ROUND(AVG(release_spin_rate), 0) as avg_spin
+        FROM _fatigue_seq
+        GROUP BY {group}, bin
+        HAVING COUNT(*) >= {min_pitches}
+        ORDER BY {group}, bin
+    """).df()
+    curves.insert(curves.columns.get_loc('bin') + 1, 'pitch_range',
+                  [labels[int(b)] for b in curves['bin']])
+
+    slopes = con.execute(f"""
+        SELECT
+            {group},
+            COUNT(*) as pitches,
+            COUNT(DISTINCT game_pk) as games,
+            ROUND(100 * REGR_SLOPE(velo_dm, num_dm), 2) as velo_per_100,
+            ROUND(100 * REGR_SLOPE(spin_dm, num_dm), 1) as spin_per_100
+        FROM _fatigue_seq
+        GROUP BY {group}
+        HAVING COUNT(*) >= {min_pitches}
+        ORDER BY {group}
+    """).df()
+
+    con.execute('DROP TABLE _fatigue_seq')
+    if table == '_fatigue_src':
+        con.unregister('_fatigue_src')
+    return curves, slopes
@@ -0,0 +1,129 @@
+"""Baseball field background for batted-ball plots.
+
+The field geometry (foul lines, infield arc, fence, base path, bases) never
+changes between plots, so it is computed once per (foul_distance,
+outfield_distance) and reused by every call. With ``raster=True`` the field
+is additionally rendered once into an RGBA image that is stamped onto each
+new axes with a single ``imshow``, which keeps per-axes cost constant when
+generating many per-batter PNGs.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+# matplotlib is imported inside the drawing functions: importing this module
+# (e.g. for FIELD_EXTENT) must not pull in the plotting stack
+
+# Area covered by the cached raster (x_min, x_max, y_min, y_max) in feet.
+FIELD_EXTENT = (-350, 350, -50, 420)
+FIELD_COLOR = 'lightgreen'
+RASTER_DPI = 150
+
+
+@lru_cache(maxsize=None)
+def _field_geometry(foul_distance, outfield_distance):
+    """Return (lines, markers) describing the field; cached per distance pair.
+
+    lines: tuples of (x, y, line kwargs)
+    markers: tuples of (x, y, scatter kwargs)
+    """
+    foul = foul_distance * 0.707
+    theta = np.linspace(-np.pi / 4, np.pi / 4, 100)
+    sin_t, cos_t = np.sin(theta), np.cos(theta)
+    infield_dist = 95
+
+    lines = (
+        # ファールライン（45度の角度で外野へ）
+        (np.array([0, -foul]), np.array([0, foul]),
+         dict(color='k', lw=2, label='Foul Line')),
+        (np.array([0, foul]), np.array([0, foul]),
+         dict(color='k', lw=2)),
+        # 内野アーク（約95フィート）
+        (infield_dist * sin_t, infield_dist * cos_t,
+         dict(color='green', lw=2, alpha=0.7, label='Infield')),
+        # 外野フェンス
+        (outfield_distance * sin_t, outfield_distance * cos_t,
+         dict(color='saddlebrown', lw=3, alpha=0.7, label='Outfield Fence')),
+        # ベースパス（90フィート四方のダイヤモンド）
+        (np.array([0, 63.64, 0, -63.64, 0]), np.array([0, 63.64, 127.28, 63.64, 0]),
+         dict(color='k', lw=1.5)),
+    )
+    markers = (
+        ([0], [0], dict(color='white', edgecolors='black', s=150, marker='p', zorder=5)),
+        ([63.64, 0, -63.64], [63.64, 127.28, 63.64],
+         dict(color='white', edgecolors='black', s=100, marker='s', zorder=5)),
+        # ピッチャーマウンド（60.5フィート）
+        ([0], [60.5], dict(color='brown', s=80, zorder=5)),
+    )
+    for x, y, _ in lines:
+        x.setflags(write=False)
+        y.setflags(write=False)
+    return lines, markers
+
+
+def _draw_vector_field(ax, foul_distance, outfield_distance):
+    from matplotlib.lines import Line2D
+
+    lines, markers = _field_geometry(foul_distance, outfield_distance)
+    for x, y, style in lines:
+        ax.add_line(Line2D(x, y, **style))
+    for x, y, style in markers:
+        ax.scatter(x, y, **style)
+    ax.autoscale_view()
+
+
+@lru_cache(maxsize=None)
+def _field_raster(foul_distance, outfield_distance):
+    """Render the field once into an RGBA array covering FIELD_EXTENT."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    x_min, x_max, y_min, y_max = FIELD_EXTENT
+    width_in = 7.0
+    height_in = width_in * (y_max - y_min) / (x_max - x_min)
+
+    fig = Figure(figsize=(width_in, height_in), dpi=RASTER_DPI)
+    canvas = FigureCanvasAgg(fig)
+    fig.patch.set_facecolor(FIELD_COLOR)
+    ax = fig.add_axes([0, 0, 1, 1])
+    _draw_vector_field(ax, foul_distance, outfield_distance)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+    ax.set_facecolor(FIELD_COLOR)
+    ax.axis('off')
+    canvas.draw()
+
+    img = np.asarray(canvas.buffer_rgba()).copy()
+    img.setflags(write=False)
+    return img
+
+
+def draw_baseball_field(ax, foul_distance=330, outfield_distance=340, raster=False):
+    """野球場を描画（ホームプレートが原点）
+
+    Args:
+        ax: matplotlib axes
+        foul_distance: ファールラインの長さ（フィート）
+        outfield_distance: 外野フェンスまでの距離（フィート）
+        raster: True なら一度だけ描画したフィールド画像を imshow で貼り付ける
+            （大量のPNG出力向け）。False ならキャッシュ済みの座標からベクターで描画する。
+    """
+    if raster:
+        from matplotlib.lines import Line2D
+
+        img = _field_raster(foul_distance, outfield_distance)
+        ax.imshow(img, extent=FIELD_EXTENT, origin='upper',
+                  interpolation='nearest', zorder=0)
+        # Legend proxies so ax.legend() still lists the field elements
+        lines, _ = _field_geometry(foul_distance, outfield_distance)
+        for _, _, style in lines:
+            if 'label' in style:
+                ax.add_line(Line2D([], [], **style))
+    else:
+        _draw_vector_field(ax, foul_distance, outfield_distance)
+
+    ax.set_aspect('equal')
+    ax.set_facecolor(FIELD_COLOR)
+
+    return ax
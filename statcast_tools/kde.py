@@ -0,0 +1,179 @@
+"""Binned FFT kernel density estimates for batted-ball heatmaps.
+
+``sns.kdeplot`` evaluates a Gaussian KDE at every grid point against every
+data point, which is fine for one batter but far too slow for league-wide or
+multi-season sets. Here the points are linearly binned onto a fixed grid with
+``np.bincount`` and smoothed by convolving with a Gaussian kernel in the
+frequency domain, so the cost is O(n + G log G) for n points and G cells.
+
+The kernel is the one scipy's ``gaussian_kde`` (and so seaborn) uses:
+Scott's rule times the full data covariance, so correlated x/y spread gives
+a tilted kernel. The grid is padded by the kernel radius, so points just
+outside the extent still contribute their tails inside it. The estimate
+matches the exact KDE up to the binning error: well under 1% of the peak
+density at the default grid. Differences from ``sns.kdeplot`` that remain:
+the density is evaluated on the fixed field grid, not on seaborn's grid
+around the data range, so the iso-proportion levels are computed over the
+field rather than seaborn's grid; and bandwidths are rounded to 0.1 cell
+(correlation to 0.01) so that kernels can be cached.
+
+The grid and the kernel spectrum are cached per (extent, gridsize) and per
+bandwidth, so repeated heatmaps on the same field reuse them.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from statcast_tools.field import FIELD_EXTENT
+
+GRIDSIZE = (256, 192)  # (nx, ny) cells over the extent
+
+
+@lru_cache(maxsize=None)
+def _grid(extent, gridsize):
+    """Cell centres for the extent; returns (xs, ys, dx, dy)."""
+    x_min, x_max, y_min, y_max = extent
+    nx, ny = gridsize
+    dx = (x_max - x_min) / nx
+    dy = (y_max - y_min) / ny
+    xs = x_min + dx * (np.arange(nx) + 0.5)
+    ys = y_min + dy * (np.arange(ny) + 0.5)
+    xs.setflags(write=False)
+    ys.setflags(write=False)
+    return xs, ys, dx, dy
+
+
+@lru_cache(maxsize=64)
+def _kernel_spectrum(gridsize, sigma_cells):
+    """FFT of a (possibly tilted) Gaussian kernel, zero padded for linear convolution.
+
+    sigma_cells is (sx, sy, rho): the kernel's standard deviations in grid
+    cells and its x/y correlation, rounded by the caller so that similar
+    bandwidths share a cache entry. The binned grid is padded by the
+    kernel radius (ry, rx) on every side.
+    """
+    nx, ny = gridsize
+    sx, sy, rho = sigma_cells
+    rx = int(np.ceil(4 * sx))
+    ry = int(np.ceil(4 * sy))
+    u = np.arange(-rx, rx + 1) / sx
+    v = np.arange(-ry, ry + 1)[:, None] / sy
+    kernel = np.exp(-0.5 * (u ** 2 - 2 * rho * u * v + v ** 2) / (1 - rho ** 2))
+    kernel /= kernel.sum()
+
+    shape = (ny + 4 * ry, nx + 4 * rx)
+    spectrum = np.fft.rfft2(kernel, s=shape)
+    spectrum.setflags(write=False)
+    return spectrum, shape, (ry, rx)
+
+
+def scott_bandwidth(x, y):
+    """Kernel covariance by Scott's rule: n**(-1/3) times the data covariance.
+
+    This is the bandwidth matrix of scipy's ``gaussian_kde`` (which seaborn
+    uses), including the x/y correlation. Returns a 2x2 array.
+    """
+    factor = len(x) ** (-1.0 / 6.0)
+    return factor ** 2 * np.cov(x, y)
+
+
+def _bin_linear(x, y, origin, dx, dy, shape):
+    """Linear binning: each point's weight is shared by its four nearest cell centres."""
+    ny, nx = shape
+    u = (x - origin[0]) / dx - 0.5
+    v = (y - origin[1]) / dy - 0.5
+    i0 = np.floor(u).astype(np.int64)
+    j0 = np.floor(v).astype(np.int64)
+    fu = u - i0
+    fv = v - j0
+    ok = (i0 >= 0) & (i0 < nx - 1) & (j0 >= 0) & (j0 < ny - 1)
+    i0, j0, fu, fv = i0[ok], j0[ok], fu[ok], fv[ok]
+    cell = j0 * nx + i0
+    counts = np.zeros(nx * ny)
+    for offset, weight in ((0, (1 - fu) * (1 - fv)), (1, fu * (1 - fv)),
+                           (nx, (1 - fu) * fv), (nx + 1, fu * fv)):
+        counts += np.bincount(cell + offset, weights=weight, minlength=nx * ny)
+    return counts.reshape(ny, nx)
+
+
+def binned_kde(x, y, extent=FIELD_EXTENT, gridsize=GRIDSIZE, bw=None, bw_adjust=1.0):
+    """Estimate a 2-D density on a fixed grid.
+
+    Args:
+        x, y: point coordinates (array-like, NaNs are dropped)
+        extent: (x_min, x_max, y_min, y_max) of the grid
+        gridsize: (nx, ny) number of cells
+        bw: kernel bandwidth in data units, either (bw_x, bw_y) standard
+            deviations or a 2x2 covariance; Scott's rule (full covariance) if None
+        bw_adjust: multiplier on the bandwidth, like seaborn's ``bw_adjust``
+
+    Returns:
+        (xs, ys, density) where density has shape (ny, nx) and integrates
+        to the share of the estimated density inside the extent.
+    """
+    extent = tuple(extent)
+    gridsize = tuple(gridsize)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+
+    xs, ys, dx, dy = _grid(extent, gridsize)
+    nx, ny = gridsize
+    if len(x) < 2:
+        return xs, ys, np.zeros((ny, nx))
+
+    cov = scott_bandwidth(x, y) if bw is None else np.asarray(bw, dtype=np.float64)
+    if cov.ndim == 1:
+        cov = np.diag(cov ** 2)
+    sx = np.sqrt(cov[0, 0]) * bw_adjust / dx
+    sy = np.sqrt(cov[1, 1]) * bw_adjust / dy
+    rho = cov[0, 1] / np.sqrt(cov[0, 0] * cov[1, 1]) if sx > 0 and sy > 0 else 0.0
+    sigma_cells = (max(round(sx, 1), 0.5), max(round(sy, 1), 0.5),
+                   float(np.clip(round(rho, 2), -0.95, 0.95)))
+
+    # bin onto the grid padded by the kernel radius, convolve, keep the extent
+    spectrum, shape, (ry, rx) = _kernel_spectrum(gridsize, sigma_cells)
+    origin = (extent[0] - rx * dx, extent[2] - ry * dy)
+    counts = _bin_linear(x, y, origin, dx, dy, (ny + 2 * ry, nx + 2 * rx))
+    smoothed = np.fft.irfft2(np.fft.rfft2(counts, s=shape) * spectrum, s=shape)
+    density = smoothed[2 * ry:2 * ry + ny, 2 * rx:2 * rx + nx]
+    np.maximum(density, 0, out=density)  # FFT round-off can go slightly negative
+    density /= len(x) * dx * dy
+    return xs, ys, density
+
+
+def _iso_levels(density, levels, thresh):
+    """Convert iso-proportion levels into density values (seaborn semantics)."""
+    if np.isscalar(levels):
+        levels = np.linspace(thresh, 1, levels)
+    values = np.sort(density.ravel())[::-1]
+    total = values.sum()
+    if total == 0:
+        return None
+    cumulative = np.cumsum(values) / total
+    idx = np.searchsorted(cumulative, 1 - np.asarray(levels))
+    return np.unique(np.take(values, idx, mode='clip'))
+
+
+def kdeplot_field(ax, x, y, cmap='Blues', fill=True, alpha=0.6, levels=10, thresh=0.05,
+                  extent=FIELD_EXTENT, gridsize=GRIDSIZE, bw=None, bw_adjust=1.0):
+    """Stand-in for ``sns.kdeplot(x=..., y=..., fill=True, levels=10)`` on the field grid.
+
+    Same kernel as seaborn (Scott's rule, full covariance), and contour
+    levels follow seaborn: ``levels`` iso-proportions between ``thresh``
+    and 1 of the probability mass. The proportions are taken over the
+    field grid (see the module docstring for the remaining differences).
+    """
+    xs, ys, density = binned_kde(x, y, extent=extent, gridsize=gridsize,
+                                 bw=bw, bw_adjust=bw_adjust)
+    draw_levels = _iso_levels(density, levels, thresh)
+    if draw_levels is None or len(draw_levels) < 2:
+        return ax
+    if fill:
+        draw_levels = np.append(draw_levels, density.max() + 1e-12)
+        ax.contourf(xs, ys, density, levels=draw_levels, cmap=cmap, alpha=alpha)
+    else:
+        ax.contour(xs, ys, density, levels=draw_levels, cmap=cmap, alpha=alpha)
+    return ax
@@ -0,0 +1,102 @@
+"""Deferred imports for the heavy plotting and fetching libraries.
+
+Importing pandas and duckdb takes about half a second. matplotlib.pyplot
+adds another ~0.7s, seaborn ~1.2s, and pybaseball (requests, bs4, lxml and
+its own matplotlib use) more still. A run that only reads a local store
+and prints text pays for all of that up front. The scripts bind these
+names through ``lazy_import`` instead:
+
+    plt = lazy_import('matplotlib.pyplot')
+    sns = lazy_import('seaborn')
+    statcast_pitcher = lazy_import('pybaseball', 'statcast_pitcher')
+
+Each binding is a stand-in that imports the real module (and runs
+``on_import`` once) on first attribute access or call. After that every
+access goes straight to the module, so plotting code is unchanged.
+
+``on_import`` only fires through the binding. Code that imports the
+module itself, such as pandas' ``DataFrame.plot`` importing pyplot, runs
+before it, so the scripts apply their plot style explicitly at the top
+of the first figure block rather than through the hook.
+
+The statcast_tools plotting helpers (field, raster) likewise import
+matplotlib inside the functions that draw, not at module import.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports ``name`` on first attribute access."""
+
+    def __init__(self, name, on_import=None):
+        super().__init__(name)
+        self.__dict__['_lazy_on_import'] = on_import
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+            on_import = self.__dict__.pop('_lazy_on_import')
+            if on_import is not None:
+                on_import(module)
+        return module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        self.__dict__[attr] = value  # later lookups skip __getattr__
+        return value
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return f'<lazy module {self.__name__!r} ({state})>'
+
+
+class LazyFunction:
+    """Callable stand-in for ``module.attr``, imported on first call."""
+
+    def __init__(self, module, attr):
+        self._module = module
+        self._attr = attr
+        self._func = None
+
+    def __call__(self, *args, **kwargs):
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self._module), self._attr)
+        return self._func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<lazy {self._module}.{self._attr}>'
+
+
+def lazy_import(module, attr=None, on_import=None):
+    """Deferred ``import module`` (or ``from module import attr`` for a callable).
+
+    Args:
+        module: dotted module name, e.g. 'matplotlib.pyplot'
+        attr: a function to take from the module; returns a callable stand-in
+        on_import: called with the module right after it is first imported
+            (e.g. to apply plot styling); module stand-ins only
+
+    A module that is already imported is returned as is.
+    """
+    if attr is not None:
+        return LazyFunction(module, attr)
+    if module in sys.modules:
+        loaded = sys.modules[module]
+        if on_import is not None:
+            on_import(loaded)
+        return loaded
+    return LazyModule(module, on_import)
+
+
+def is_imported(module):
+    """Whether ``module`` has actually been imported in this process."""
+    return module in sys.modules
@@ -0,0 +1,176 @@
+"""Stable per-pitcher pitch classes from movement, velocity and spin.
+
+Statcast labels drift: Kikuchi's slider is SL in some seasons and ST in
+others, Senga's splitter is FO. ``classify_pitches`` re-derives classes
+from the physical pitch characteristics, pooled over all seasons of each
+pitcher, so the same pitch keeps one class across label changes.
+
+Per pitcher:
+
+1. features are standardised (spin_axis enters as cos/sin),
+2. each Statcast label with at least ``min_share`` usage seeds a centroid,
+   and seeds closer than ``merge_distance`` are merged (SL + ST → one),
+3. k-means (Lloyd) refines the centroids.
+
+Step 3 runs for every pitcher at once: centroids live in a padded
+(pitchers, k_max, features) array and each iteration is one gather, one
+distance/argmin and one ``np.bincount`` update, so a league season runs in
+seconds. Each class is named after the most common Statcast label of its
+members.
+"""
+
+import numpy as np
+import pandas as pd
+
+CLUSTER_FEATURES = ('pfx_x', 'pfx_z', 'release_speed', 'release_spin_rate', 'spin_axis')
+CHUNK_ROWS = 200_000  # rows per distance block, bounds memory at league scale
+
+
+def _feature_matrix(df, features):
+    cols = []
+    names = []
+    for f in features:
+        v = df[f].to_numpy(dtype=np.float64, na_value=np.nan)
+        if f == 'spin_axis':
+            rad = np.radians(v)
+            cols += [np.cos(rad), np.sin(rad)]
+            names += ['spin_axis_cos', 'spin_axis_sin']
+        else:
+            cols.append(v)
+            names.append(f)
+    return np.column_stack(cols), names
+
+
+def _group_mean(values, ids, n_ids):
+    counts = np.bincount(ids, minlength=n_ids).astype(np.float64)
+    sums = np.stack([np.bincount(ids, weights=values[:, j], minlength=n_ids)
+                     for j in range(values.shape[1])], axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts[:, None], counts
+
+
+def _merge_seeds(seeds, merge_distance):
+    """Union seeds closer than merge_distance; returns a group id per seed."""
+    n = len(seeds)
+    parent = list(range(n))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    dist = np.sqrt(((seeds[:, None, :] - seeds[None, :, :]) ** 2).sum(-1))
+    for i, j in zip(*np.nonzero(np.triu(dist < merge_distance, k=1))):
+        parent[find(i)] = find(j)
+    roots = [find(i) for i in range(n)]
+    _, groups = np.unique(roots, return_inverse=True)
+    return groups
+
+
+def classify_pitches(df, features=CLUSTER_FEATURES, min_share=0.03, merge_distance=1.0,
+                     n_iter=25, pitcher_col='pitcher', label_col='pitch_type'):
+    """Assign a stable pitch class to every pitch.
+
+    Args:
+        df: raw pitches (all seasons to be compared together)
+        features: feature columns; those missing from ``df`` are skipped
+        min_share: minimum usage share for a Statcast label to seed a class
+        merge_distance: seeds closer than this (standardised units) merge
+        n_iter: maximum k-means iterations
+        pitcher_col, label_col: pitcher id and Statcast pitch type columns
+
+    Returns:
+        (pitch_class, centroids): a Series aligned with ``df`` (None where
+        features are missing) and a DataFrame of class centroids in
+        original units with the labels each class absorbed.
+    """
+    features = [f for f in features if f in df.columns]
+    X, names = _feature_matrix(df, features)
+    labels = df[label_col]
+    ok = np.isfinite(X).all(axis=1) & labels.notna().to_numpy()
+    X = X[ok]
+    pitcher_ids, pitchers = pd.factorize(df[pitcher_col].to_numpy()[ok])
+    label_ids, label_names = pd.factorize(labels.to_numpy()[ok])
+    n_p, n_l, n_f = len(pitchers), len(label_names), X.shape[1]
+
+    # 1. per-pitcher standardisation
+    mu, _ = _group_mean(X, pitcher_ids, n_p)
+    var, _ = _group_mean((X - mu[pitcher_ids]) ** 2, pitcher_ids, n_p)
+    sd = np.sqrt(var)
+    sd[sd == 0] = 1.0
+    Z = (X - mu[pitcher_ids]) / sd[pitcher_ids]
+
+    # 2. seeds from (pitcher, label) means, merging near-duplicates
+    pl = pitcher_ids * n_l + label_ids
+    seed_mean, seed_n = _group_mean(Z, pl, n_p * n_l)
+    seed_mean = seed_mean.reshape(n_p, n_l, n_f)
+    seed_n = seed_n.reshape(n_p, n_l)
+    share = seed_n / seed_n.sum(axis=1, keepdims=True)
+
+    centroid_lists = []
+    for p in range(n_p):
+        keep = np.flatnonzero(share[p] >= min_share)
+        if len(keep) == 0:
+            keep = np.array([np.argmax(seed_n[p])])
+        groups = _merge_seeds(seed_mean[p, keep], merge_distance)
+        w = seed_n[p, keep]
+        merged = np.stack([np.average(seed_mean[p, keep[groups == g]], axis=0,
+                                      weights=w[groups == g])
+                           for g in range(groups.max() + 1)])
+        centroid_lists.append(merged)
+
+    k_max = max(len(c) for c in centroid_lists) if centroid_lists else 1
+    centroids = np.zeros((n_p, k_max, n_f))
+    valid = np.zeros((n_p, k_max), dtype=bool)
+    for p, c in enumerate(centroid_lists):
+        centroids[p, :len(c)] = c
+        valid[p, :len(c)] = True
+
+    # 3. vectorised Lloyd iterations over all pitchers
+    assign = np.zeros(len(Z), dtype=np.int64)
+    for it in range(n_iter):
+        new_assign = np.empty_like(assign)
+        for lo in range(0, len(Z), CHUNK_ROWS):
+            rows = slice(lo, lo + CHUNK_ROWS)
+            ids = pitcher_ids[rows]
+            d2 = ((Z[rows, None, :] - centroids[ids]) ** 2).sum(-1)
+            d2[~valid[ids]] = np.inf
+            new_assign[rows] = d2.argmin(axis=1)
+        if it > 0 and np.array_equal(new_assign, assign):
+            break
+        assign = new_assign
+        cell = pitcher_ids * k_max + assign
+        means, counts = _group_mean(Z, cell, n_p * k_max)
+        means = means.reshape(n_p, k_max, n_f)
+        filled = counts.reshape(n_p, k_max) > 0
+        centroids[filled] = means[filled]
+
+    # name each class by its most common Statcast label
+    cell = pitcher_ids * k_max + assign
+    votes = np.bincount(cell * n_l + label_ids, minlength=n_p * k_max * n_l)
+    votes = votes.reshape(n_p * k_max, n_l)
+    class_names = np.asarray(label_names, dtype=object)[votes.argmax(axis=1)]
+    # two classes of one pitcher can share a majority label: suffix the smaller
+    used = np.flatnonzero(votes.sum(axis=1) > 0)
+    order = used[np.argsort(-votes.sum(axis=1)[used], kind='stable')]
+    dup = pd.DataFrame({'p': order // k_max, 'name': class_names[order]}).groupby(['p', 'name']).cumcount()
+    for cell_id, rank in zip(order, dup.to_numpy()):
+        if rank > 0:
+            class_names[cell_id] = f'{class_names[cell_id]}-{rank + 1}'
+
+    pitch_class = pd.Series(None, index=df.index, dtype=object, name='pitch_class')
+    pitch_class[ok] = class_names[cell]
+
+    raw_means, counts = _group_mean(X, cell, n_p * k_max)
+    used = counts > 0
+    rows = np.flatnonzero(used)
+    centroid_df = pd.DataFrame(raw_means[rows], columns=names)
+    centroid_df.insert(0, 'pitches', counts[rows].astype(int))
+    centroid_df.insert(0, 'pitch_class', class_names[rows])
+    centroid_df.insert(0, pitcher_col, np.asarray(pitchers)[rows // k_max])
+    centroid_df['labels'] = [
+        ','.join(np.asarray(label_names, dtype=object)[np.flatnonzero(votes[r])])
+        for r in rows
+    ]
+    return pitch_class, centroid_df
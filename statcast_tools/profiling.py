@@ -0,0 +1,347 @@
+"""Per-section timing, row counts, memory and DuckDB query profiles.
+
+``Tracer`` splits a script run into named sections and records, for each
+section and for every query run through a traced connection:
+
+    seconds       wall-clock time (a query's time includes fetching the result)
+    rows          rows fetched (queries) / summed over the section's queries
+    rss_mb        process resident memory at the end
+    rss_peak_mb   process peak resident memory so far (covers DuckDB's native buffers)
+    py_peak_mb    peak traced Python allocation in the section (trace_malloc=True only;
+                  numpy/pandas buffers are included, DuckDB's are not)
+
+With ``profile=True`` DuckDB's JSON profiler (the EXPLAIN ANALYZE tree)
+is enabled on the connection. Each query record then carries the
+profile: latency, CPU time, rows scanned, peak buffer memory and the
+operator tree with per-operator timing and cardinality.
+
+Records are appended to a JSON-lines trace file as they complete, one
+file per run. ``load_trace`` and ``compare_traces`` line up two runs
+section by section. With ``path=None`` the tracer is inert: ``connect``
+returns the connection unchanged and ``mark`` / ``section`` do nothing,
+so scripts can leave the calls in place.
+
+Flat scripts use laps (``tracer.mark('whiff')`` ends the previous
+section and starts the next), and nested code can use
+``with tracer.section('tto'):``.
+"""
+
+import json
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+PROFILE_METRICS = ('latency', 'cpu_time', 'rows_returned', 'cumulative_rows_scanned',
+                   'cumulative_cardinality', 'system_peak_buffer_memory', 'total_bytes_read')
+OPERATOR_METRICS = ('operator_name', 'operator_type', 'operator_timing', 'operator_cardinality',
+                    'operator_rows_scanned', 'extra_info')
+SQL_PREVIEW = 400  # characters of query text kept per record
+
+_FETCHERS = ('df', 'fetchdf', 'fetch_df', 'fetchall', 'fetchmany', 'fetchone', 'fetchnumpy',
+             'arrow', 'fetch_arrow_table', 'pl')
+
+
+def _rss_mb():
+    """Current resident set size in MB (Linux /proc; falls back to the peak)."""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        return _rss_peak_mb()
+
+
+def _rss_peak_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10  # bytes on macOS, KB elsewhere
+
+
+def _n_rows(result):
+    if result is None:
+        return 0
+    if isinstance(result, tuple):  # fetchone
+        return 1
+    if isinstance(result, dict):  # fetchnumpy
+        return len(next(iter(result.values()))) if result else 0
+    if hasattr(result, 'num_rows'):  # Arrow table
+        return result.num_rows
+    return len(result)
+
+
+def _operator_tree(node):
+    out = {k: node[k] for k in OPERATOR_METRICS if k in node}
+    children = [_operator_tree(c) for c in node.get('children', [])]
+    if children:
+        out['children'] = children
+    return out
+
+
+class TracedResult:
+    """Result of a traced ``execute``; fetch methods record time and rows."""
+
+    def __init__(self, tracer, record, result):
+        self._tracer = tracer
+        self._record = record
+        self._result = result
+
+    def __getattr__(self, name):
+        attr = getattr(self._result, name)
+        if name not in _FETCHERS:
+            return attr
+
+        def fetch(*args, **kwargs):
+            start = time.perf_counter()
+            out = attr(*args, **kwargs)
+            self._record['seconds'] += time.perf_counter() - start
+            self._record['rows'] += _n_rows(out)
+            return out
+        return fetch
+
+
+class TracedConnection:
+    """DuckDB connection proxy that records every ``execute``.
+
+    Everything other than ``execute`` / ``cursor`` is passed through, so
+    it can stand in for the connection anywhere (``register``,
+    ``unregister``, replacement scans of local DataFrames, ...).
+    """
+
+    def __init__(self, con, tracer):
+        self._con = con
+        self._tracer = tracer
+        # replacement scans look at the calling frame only by default, which is
+        # now ``execute`` below; scan outward so the script's DataFrames resolve
+        con.execute('SET python_scan_all_frames = true')
+        self._profile_path = tracer._enable_profiling(con)
+
+    def __getattr__(self, name):
+        return getattr(self._con, name)
+
+    def execute(self, query, parameters=None):
+        record = self._tracer._start_query(self, query)
+        start = time.perf_counter()
+        result = self._con.execute(query) if parameters is None else self._con.execute(query, parameters)
+        record['seconds'] += time.perf_counter() - start
+        return TracedResult(self._tracer, record, result)
+
+    def cursor(self):
+        return TracedConnection(self._con.cursor(), self._tracer)
+
+    def close(self):
+        self._tracer._flush_query(self)
+        self._con.close()
+
+
+class Tracer:
+    """Section / query tracer writing one JSON-lines trace file per run.
+
+    Args:
+        path: trace file (.jsonl); None disables tracing
+        run: run-level parameters stored on every record
+        profile: enable DuckDB's JSON query profiler on traced connections
+        trace_malloc: track peak Python allocation per section with
+            tracemalloc (precise, but slows pandas-heavy code noticeably)
+    """
+
+    def __init__(self, path, run=None, profile=False, trace_malloc=False):
+        self.path = path
+        self.run = dict(run or {})
+        self.profile = profile
+        self.trace_malloc = trace_malloc
+        self.sections = []
+        self._fh = None
+        self._lap = None
+        self._stack = []
+        self._pending = {}  # traced connection -> its last query, written on the next one
+        self._lock = threading.Lock()
+        self._profile_dir = None
+        self._n_profiles = 0
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._fh = open(path, 'w', encoding='utf-8')
+        self.run.setdefault('started', time.strftime('%Y-%m-%dT%H:%M:%S'))
+        if profile:
+            self._profile_dir = tempfile.mkdtemp(prefix='duckdb_profile_')
+        if trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    # -- connections -------------------------------------------------
+
+    def connect(self, con):
+        """Wrap a DuckDB connection so its queries are traced."""
+        return TracedConnection(con, self) if self.enabled else con
+
+    def _enable_profiling(self, con):
+        if not self.profile:
+            return None
+        self._n_profiles += 1
+        out = os.path.join(self._profile_dir, f'profile_{self._n_profiles}.json')
+        con.execute("SET enable_profiling = 'json'")
+        con.execute(f"SET profiling_output = '{out}'")
+        return out
+
+    def _start_query(self, con, query):
+        # the previous query's profile file is overwritten by this one, so write it now
+        self._flush_query(con)
+        stack = list(self._stack)
+        record = {
+            'kind': 'query',
+            'section': stack[-1]['name'] if stack else None,
+            'sql': ' '.join(str(query).split())[:SQL_PREVIEW],
+            'seconds': 0.0,
+            'rows': 0,
+            '_profile_path': con._profile_path,
+            '_sections': stack,
+        }
+        with self._lock:
+            self._pending[con] = record
+        return record
+
+    def _flush_query(self, con=None):
+        """Write the pending query record of ``con`` (of every connection if None)."""
+        with self._lock:
+            if con is None:
+                records = list(self._pending.values())
+                self._pending.clear()
+            else:
+                records = [self._pending.pop(con)] if con in self._pending else []
+        for record in records:
+            self._finish_query(record)
+
+    def _finish_query(self, record):
+        sections = record.pop('_sections')
+        profile_path = record.pop('_profile_path')
+        if profile_path and os.path.exists(profile_path):
+            try:
+                with open(profile_path, encoding='utf-8') as fh:
+                    profile = json.load(fh)
+                os.remove(profile_path)
+                record['profile'] = {k: profile[k] for k in PROFILE_METRICS if k in profile}
+                record['profile']['operators'] = [_operator_tree(c) for c in profile.get('children', [])]
+            except (OSError, ValueError):
+                pass
+        record['rss_mb'] = round(_rss_mb(), 1)
+        with self._lock:
+            for section in sections:
+                section['queries'] += 1
+                section['query_seconds'] += record['seconds']
+                section['rows'] += record['rows']
+        self._write(record)
+
+    # -- sections ----------------------------------------------------
+
+    def _open(self, name):
+        self._flush_query()
+        if self.trace_malloc:
+            tracemalloc.reset_peak()
+        section = {'kind': 'section', 'name': name, 'start': time.perf_counter(),
+                   'queries': 0, 'query_seconds': 0.0, 'rows': 0}
+        self._stack.append(section)
+        return section
+
+    def _close(self, section):
+        self._flush_query()
+        self._stack.remove(section)
+        section['seconds'] = time.perf_counter() - section.pop('start')
+        section['rss_mb'] = round(_rss_mb(), 1)
+        section['rss_peak_mb'] = round(_rss_peak_mb(), 1)
+        if self.trace_malloc:
+            section['py_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        self.sections.append(section)
+        self._write(section)
+
+    @contextmanager
+    def section(self, name):
+        """Trace a block as one section (sections may nest)."""
+        if not self.enabled:
+            yield
+            return
+        section = self._open(name)
+        try:
+            yield
+        finally:
+            self._close(section)
+
+    def mark(self, name):
+        """End the current lap section (if any) and start a new one."""
+        if not self.enabled:
+            return
+        if self._lap is not None:
+            self._close(self._lap)
+        self._lap = self._open(name)
+
+    def _write(self, record):
+        line = json.dumps({'run': self.run, **record}, default=str) + '\n'
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+
+    def summary(self):
+        """Completed sections as a DataFrame (slowest first)."""
+        cols = ['name', 'seconds', 'queries', 'query_seconds', 'rows', 'rss_mb', 'rss_peak_mb']
+        if self.trace_malloc:
+            cols.append('py_peak_mb')
+        out = pd.DataFrame(self.sections, columns=cols)
+        return out.sort_values('seconds', ascending=False).reset_index(drop=True)
+
+    def close(self, show=True):
+        """Close the open lap and the trace file; print the section summary."""
+        if not self.enabled or self._fh is None:
+            return
+        if self._lap is not None:
+            self._close(self._lap)
+            self._lap = None
+        self._fh.close()
+        self._fh = None
+        if self._profile_dir:
+            for name in os.listdir(self._profile_dir):
+                os.remove(os.path.join(self._profile_dir, name))
+            os.rmdir(self._profile_dir)
+        if show and self.sections:
+            print(f'\n=== Section timings ({self.path}) ===')
+            print(self.summary().round(3).to_string(index=False))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_trace(path, kind='section'):
+    """Section (or query) records of a trace file as a DataFrame."""
+    rows = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            record = json.loads(line)
+            if record.get('kind') == kind:
+                record.pop('run', None)
+                rows.append(record)
+    return pd.DataFrame(rows)
+
+
+def compare_traces(before, after):
+    """Section times of two runs side by side, largest slowdown first.
+
+    Sections that occur more than once in a run (repeated names) are summed.
+    """
+    cols = ['seconds', 'query_seconds', 'rows', 'rss_peak_mb']
+    a = load_trace(before).groupby('name', sort=False)[cols].agg(
+        {'seconds': 'sum', 'query_seconds': 'sum', 'rows': 'sum', 'rss_peak_mb': 'max'})
+    b = load_trace(after).groupby('name', sort=False)[cols].agg(
+        {'seconds': 'sum', 'query_seconds': 'sum', 'rows': 'sum', 'rss_peak_mb': 'max'})
+    out = a.join(b, how='outer', lsuffix='_before', rsuffix='_after')
+    out['delta_seconds'] = out['seconds_after'] - out['seconds_before']
+    out['ratio'] = out['seconds_after'] / out['seconds_before']
+    return out.sort_values('delta_seconds', ascending=False).reset_index()
@@ -0,0 +1,99 @@
+"""Aggregated, rasterized scatter for very large point sets.
+
+Above ``RASTER_THRESHOLD`` points, ``dense_scatter`` bins the points onto a
+pixel grid matching the axes size (one ``np.bincount``) and draws a single
+RGBA image whose opacity follows the log point count per pixel, in the
+spirit of datashader. Render time and saved file size then depend on the
+figure size, not on the number of points. Below the threshold it is a plain
+``ax.scatter`` so small per-player plots look exactly as before.
+"""
+
+import numpy as np
+
+# matplotlib is imported where an image or legend proxy is built, so the
+# binning helpers can be used without loading the plotting stack
+
+RASTER_THRESHOLD = 50_000
+MIN_ALPHA = 0.15  # opacity of a pixel holding a single point (before alpha)
+
+
+def _data_extent(x, y):
+    x_min, x_max = np.nanmin(x), np.nanmax(x)
+    y_min, y_max = np.nanmin(y), np.nanmax(y)
+    if x_max == x_min:
+        x_min, x_max = x_min - 0.5, x_max + 0.5
+    if y_max == y_min:
+        y_min, y_max = y_min - 0.5, y_max + 0.5
+    return (x_min, x_max, y_min, y_max)
+
+
+def aggregate_points(x, y, extent, shape):
+    """Count points per pixel.
+
+    Args:
+        x, y: float arrays (NaNs ignored)
+        extent: (x_min, x_max, y_min, y_max)
+        shape: (height, width) in pixels
+
+    Returns:
+        int64 array of shape (height, width), row 0 at y_min.
+    """
+    height, width = shape
+    x_min, x_max, y_min, y_max = extent
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    ix = ((x - x_min) * (width / (x_max - x_min))).astype(np.int64)
+    iy = ((y - y_min) * (height / (y_max - y_min))).astype(np.int64)
+    # points exactly on the max edge belong to the last pixel
+    ix[x == x_max] = width - 1
+    iy[y == y_max] = height - 1
+    ok = (ix >= 0) & (ix < width) & (iy >= 0) & (iy < height) & (x >= x_min) & (y >= y_min)
+    counts = np.bincount(iy[ok] * width + ix[ok], minlength=height * width)
+    return counts.reshape(height, width)
+
+
+def shade(counts, color, alpha=1.0):
+    """Map counts to an RGBA image of one colour with log-scaled opacity."""
+    from matplotlib.colors import to_rgba
+
+    rgba = np.zeros(counts.shape + (4,), dtype=np.float32)
+    rgba[..., :3] = to_rgba(color)[:3]
+    peak = counts.max()
+    if peak > 0:
+        level = np.log1p(counts) / np.log1p(peak)
+        rgba[..., 3] = np.where(counts > 0, MIN_ALPHA + (1 - MIN_ALPHA) * level, 0) * alpha
+    return rgba
+
+
+def dense_scatter(ax, x, y, c='C0', s=20, alpha=1.0, label=None, extent=None,
+                  threshold=RASTER_THRESHOLD, zorder=2, **kwargs):
+    """``ax.scatter`` that switches to an aggregated image for large inputs.
+
+    Args:
+        ax: matplotlib axes
+        x, y: point coordinates
+        c: single colour for all points
+        s, alpha, label, zorder, **kwargs: as for ``ax.scatter``
+        extent: (x_min, x_max, y_min, y_max) of the raster; the data range if None
+        threshold: point count above which the raster path is used
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) <= threshold:
+        return ax.scatter(x, y, c=c, s=s, alpha=alpha, label=label, zorder=zorder, **kwargs)
+
+    if extent is None:
+        extent = _data_extent(x, y)
+    bbox = ax.get_window_extent()
+    shape = (max(int(bbox.height), 1), max(int(bbox.width), 1))
+
+    counts = aggregate_points(x, y, extent, shape)
+    image = ax.imshow(shade(counts, c, alpha), extent=extent, origin='lower',
+                      interpolation='nearest', aspect=ax.get_aspect(), zorder=zorder)
+    if label is not None:
+        from matplotlib.lines import Line2D
+
+        # imshow has no legend entry, so add a marker proxy
+        ax.add_line(Line2D([], [], linestyle='none', marker='o', color=c,
+                           alpha=alpha, markersize=np.sqrt(s), label=label))
+    return image
@@ -0,0 +1,133 @@
+"""Structured report output: one record per analysis section.
+
+The "=== Text Summary ===" blocks are for reading; ``ReportSink`` writes
+the same tables as records that tools can load without scraping
+``to_string()`` output. Each record holds
+
+    run      run-level parameters (pitcher id, years, split dates, ...)
+    section  section id, e.g. 'arsenal' or 'tto'
+    params   section parameters
+    table    the result DataFrame as {"columns": [...], "data": [[...], ...]}
+
+Records are appended as they are emitted, either one JSON object per line
+(``.jsonl``) or as row groups of a Parquet file (``.parquet``, where run,
+params and table are JSON strings). Nothing accumulates in memory. A bulk
+run over many pitchers writes many files, and ``load_section`` reads one
+section back from all of them with a single DuckDB scan.
+"""
+
+import json
+import os
+
+import pandas as pd
+
+PARQUET_BATCH = 64  # records per Parquet row group
+
+
+def _json(value):
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _table_json(table):
+    if isinstance(table, pd.Series):
+        table = table.reset_index()
+    elif not isinstance(table.index, pd.RangeIndex):
+        table = table.reset_index()
+    table = table.copy()
+    table.columns = [str(c) for c in table.columns]
+    return table.to_json(orient='split', index=False, date_format='iso', force_ascii=False)
+
+
+class ReportSink:
+    """Streaming sink for section records.
+
+    Args:
+        path: .jsonl or .parquet output file; None disables output (emit is a no-op)
+        run: run-level parameters stored on every record
+        append: append to an existing .jsonl file instead of truncating it
+    """
+
+    def __init__(self, path, run=None, append=False):
+        self.path = path
+        self.run = dict(run or {})
+        self._fh = None
+        self._writer = None
+        self._batch = []
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if path.endswith('.parquet'):
+            import pyarrow as pa  # optional: only needed for Parquet output
+            self._pa = pa
+            self._schema = pa.schema([('run', pa.string()), ('section', pa.string()),
+                                      ('params', pa.string()), ('table', pa.string())])
+        else:
+            self._fh = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def emit(self, section, table, **params):
+        """Write one section record."""
+        if self.path is None:
+            return
+        record = (_json(self.run), section, _json(params), _table_json(table))
+        if self._fh is not None:
+            self._fh.write('{"run": %s, "section": %s, "params": %s, "table": %s}\n'
+                           % (record[0], _json(section), record[2], record[3]))
+            self._fh.flush()
+        else:
+            self._batch.append(record)
+            if len(self._batch) >= PARQUET_BATCH:
+                self._flush_parquet()
+
+    def _flush_parquet(self):
+        if not self._batch:
+            return
+        if self._writer is None:
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+        columns = list(zip(*self._batch))
+        self._writer.write_table(self._pa.table(
+            {name: list(col) for name, col in zip(self._schema.names, columns)}, schema=self._schema))
+        self._batch = []
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self.path is not None and self.path.endswith('.parquet'):
+            self._flush_parquet()
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_section(con, pattern, section):
+    """One section's tables from every report file matching ``pattern``.
+
+    Returns a single DataFrame: the run parameters (prefixed ``run_``), then
+    the section params (prefixed ``param_``), then the table columns.
+    """
+    if pattern.endswith('.parquet'):
+        source = f"read_parquet('{pattern}')"
+    else:
+        source = (f"read_json('{pattern}', format='newline_delimited', "
+                  "columns={run: 'JSON', section: 'VARCHAR', params: 'JSON', \"table\": 'JSON'})")
+    rows = con.execute(f"""
+        SELECT run::VARCHAR as run, params::VARCHAR as params, "table"::VARCHAR as tbl
+        FROM {source}
+        WHERE section = ?
+    """, [section]).fetchall()
+    parts = []
+    for run, params, tbl in rows:
+        spec = json.loads(tbl)
+        part = pd.DataFrame(spec['data'], columns=spec['columns'])
+        for prefix, values in (('param_', json.loads(params)), ('run_', json.loads(run))):
+            for key, value in reversed(list(values.items())):
+                part.insert(0, prefix + key, str(value) if isinstance(value, (list, dict)) else value)
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
@@ -0,0 +1,155 @@
+"""Per-game pre-aggregated pitch table for monthly, rolling and season trends.
+
+One row per (pitcher, game_pk, pitch_type) holding additive statistics:
+counts, sums and sums of squares. Any coarser trend (month, season, last N
+games) is a GROUP BY over these few thousand rows instead of a re-scan of
+every pitch, and averages / standard deviations are recovered exactly:
+
+    avg = sum / n
+    std = sqrt((sumsq - sum * sum / n) / (n - 1))
+
+The table is maintained incrementally: ``update`` aggregates only the new
+pitches and merges them into the rows of the games they belong to.
+"""
+
+import duckdb
+
+from statcast_tools.sql import IS_SWING, IS_WHIFF
+
+ROLLUP_TABLE = 'pitch_game_rollup'
+
+# column prefix -> source expression; each gets <prefix>_n, _sum, _sumsq
+MOMENT_COLUMNS = {
+    'velo': 'release_speed',
+    'spin': 'release_spin_rate',
+    'pfx_x': 'pfx_x',
+    'pfx_z': 'pfx_z',
+    'ev': 'launch_speed',
+    'xwoba': 'CASE WHEN launch_speed IS NOT NULL THEN estimated_woba_using_speedangle END',
+}
+
+
+def _moment_select():
+    parts = []
+    for name, expr in MOMENT_COLUMNS.items():
+        parts.append(f'COUNT({expr}) AS {name}_n')
+        parts.append(f'SUM({expr}) AS {name}_sum')
+        parts.append(f'SUM(({expr}) * ({expr})) AS {name}_sumsq')
+    return ',\n            '.join(parts)
+
+
+def _moment_ddl():
+    parts = []
+    for name in MOMENT_COLUMNS:
+        parts += [f'{name}_n BIGINT', f'{name}_sum DOUBLE', f'{name}_sumsq DOUBLE']
+    return ',\n            '.join(parts)
+
+
+def avg_sql(name, where=None):
+    """SQL for the mean of a moment column, optionally over a CASE filter."""
+    if where is None:
+        return f'SUM({name}_sum) / NULLIF(SUM({name}_n), 0)'
+    return (f'SUM(CASE WHEN {where} THEN {name}_sum END) / '
+            f'NULLIF(SUM(CASE WHEN {where} THEN {name}_n END), 0)')
+
+
+def std_sql(name):
+    """SQL for the sample standard deviation of a moment column."""
+    return (f'SQRT(GREATEST(SUM({name}_sumsq) - SUM({name}_sum) * SUM({name}_sum) / SUM({name}_n), 0)'
+            f' / NULLIF(SUM({name}_n) - 1, 0))')
+
+
+class GameRollup:
+    """Maintained per-(pitcher, game_pk, pitch_type) rollup in a DuckDB table.
+
+    Args:
+        con: DuckDB connection holding the table (a new in-memory one if None)
+        table: table name
+    """
+
+    def __init__(self, con=None, table=ROLLUP_TABLE):
+        self.con = con if con is not None else duckdb.connect()
+        self.table = table
+        self.con.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                pitcher BIGINT,
+                game_pk BIGINT,
+                pitch_type VARCHAR,
+                season INTEGER,
+                game_date DATE,
+                pitches BIGINT,
+                swings BIGINT,
+                whiffs BIGINT,
+                hard_hit BIGINT,
+                {_moment_ddl()}
+            )
+        """)
+
+    def update(self, pitches, replace=False):
+        """Fold newly arrived pitches (a DataFrame) into the rollup.
+
+        By default the new aggregates are added to existing rows with the
+        same key, so a game may arrive in several batches. With
+        ``replace=True`` the rows of every (pitcher, game_pk) in the batch
+        are overwritten instead, which makes re-loading whole games
+        idempotent.
+        """
+        self.con.register('_rollup_new', pitches)
+        try:
+            self.con.execute('BEGIN TRANSACTION')
+            self.con.execute(f"""
+                CREATE OR REPLACE TEMP TABLE _rollup_batch AS
+                SELECT
+                    pitcher,
+                    game_pk,
+                    pitch_type,
+                    MIN(EXTRACT(YEAR FROM game_date::DATE)) AS season,
+                    MIN(game_date::DATE) AS game_date,
+                    COUNT(*) AS pitches,
+                    SUM({IS_SWING}) AS swings,
+                    SUM({IS_WHIFF}) AS whiffs,
+                    SUM(CASE WHEN launch_speed >= 95 THEN 1 ELSE 0 END) AS hard_hit,
+                    {_moment_select()}
+                FROM _rollup_new
+                GROUP BY pitcher, game_pk, pitch_type
+            """)
+            if not replace:
+                # Merge with the existing rows of the touched games
+                sums = ', '.join(f'SUM({c})' for c in self._additive_columns())
+                self.con.execute(f"""
+                    CREATE OR REPLACE TEMP TABLE _rollup_batch AS
+                    SELECT pitcher, game_pk, pitch_type, MIN(season), MIN(game_date), {sums}
+                    FROM (
+                        SELECT * FROM {self.table}
+                        WHERE (pitcher, game_pk) IN (SELECT pitcher, game_pk FROM _rollup_batch)
+                        UNION ALL
+                        SELECT * FROM _rollup_batch
+                    )
+                    GROUP BY pitcher, game_pk, pitch_type
+                """)
+            self.con.execute(f"""
+                DELETE FROM {self.table}
+                WHERE (pitcher, game_pk) IN (SELECT pitcher, game_pk FROM _rollup_batch)
+            """)
+            self.con.execute(f'INSERT INTO {self.table} SELECT * FROM _rollup_batch')
+            self.con.execute('DROP TABLE _rollup_batch')
+            self.con.execute('COMMIT')
+        except Exception:
+            self.con.execute('ROLLBACK')
+            raise
+        finally:
+            self.con.unregister('_rollup_new')
+        return self
+
+    @staticmethod
+    def _additive_columns():
+        cols = ['pitches', 'swings', 'whiffs', 'hard_hit']
+        for name in MOMENT_COLUMNS:
+            cols += [f'{name}_n', f'{name}_sum', f'{name}_sumsq']
+        return cols
+
+    def df(self):
+        return self.con.execute(f'SELECT * FROM {self.table}').df()
+
+    def __len__(self):
+        return self.con.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
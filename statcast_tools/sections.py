@@ -0,0 +1,183 @@
+"""Concurrent analysis sections on a pool of DuckDB cursors.
+
+Most sections of a script are independent queries over the same pitch
+frame (arsenal, monthly, fatigue, whiff, zone, release, L/R, TTO, ...).
+Run one after another, the report takes the sum of their times. DuckDB
+releases the GIL while a query executes, so several queries can run at
+once from Python threads as long as each uses its own cursor. Pandas /
+numpy work between queries (bootstrap resampling, pivots) overlaps with
+them too.
+
+``SectionScheduler`` takes the sections as a dependency graph:
+
+    sections = SectionScheduler(con, tables={'df': df}, workers=4)
+    sections.query('whiff', WHIFF_SQL)
+    sections.add('top_pitches', lambda cur: cur.execute(TOP_SQL).df()['pitch_type'].tolist())
+    sections.query('fatigue', lambda top_pitches: fatigue_sql(top_pitches[0]), after=['top_pitches'])
+    results = sections.run()
+
+Every section starts as soon as the sections it depends on have
+finished. ``run`` returns all results at once, keyed by name, so the
+printing and plotting that follows (matplotlib is not thread-safe) stays
+in script order on the main thread. With enough workers the query phase
+takes about as long as the longest dependency chain instead of the sum
+of all sections. ``workers=1`` runs them one at a time, in the order
+they were added.
+
+Cursors are separate connections to the same database: tables created on
+``con`` (e.g. the rollup table) are visible, but registered DataFrames
+and the caller's local variables are not. Frames the queries read go in
+``tables``, which registers them on every cursor. A ``query`` section
+also sees each DataFrame dependency as a table under the dependency's
+name.
+
+With a traced connection (statcast_tools.profiling) every cursor is
+traced as well, and section queries are recorded under the tracer's
+current section.
+"""
+
+import os
+import queue
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+DEFAULT_WORKERS = 4
+
+
+class SectionScheduler:
+    """Dependency graph of analysis sections, run concurrently.
+
+    Args:
+        con: DuckDB connection (or traced connection) to take cursors from
+        tables: {name: DataFrame} registered on every cursor
+        workers: sections run at once (one cursor each); default
+            ``min(DEFAULT_WORKERS, cpu count)``
+    """
+
+    def __init__(self, con, tables=None, workers=None):
+        self.con = con
+        self.tables = dict(tables or {})
+        self.workers = max(1, int(workers or min(DEFAULT_WORKERS, os.cpu_count() or 1)))
+        self._sections = {}  # name -> (func, deps), in the order added
+        self._timings = []
+        self.wall_seconds = None
+
+    def add(self, name, func, after=()):
+        """Add a section computed by ``func(cursor, **dependency_results)``."""
+        if name in self._sections:
+            raise ValueError(f'duplicate section {name!r}')
+        self._sections[name] = (func, tuple(after))
+        return self
+
+    def query(self, name, sql, after=()):
+        """Add a section whose result is ``cursor.execute(sql).df()``.
+
+        ``sql`` is a string, or a callable taking the dependency results as
+        keyword arguments and returning one (for SQL built from an earlier
+        section's result). DataFrame dependencies are also registered as
+        tables under their names for the query.
+        """
+        def run_query(cur, **deps):
+            text = sql(**deps) if callable(sql) else sql
+            frames = [k for k, v in deps.items() if isinstance(v, pd.DataFrame)]
+            for k in frames:
+                cur.register(k, deps[k])
+            try:
+                return cur.execute(text).df()
+            finally:
+                for k in frames:
+                    cur.unregister(k)
+        return self.add(name, run_query, after)
+
+    def _order(self):
+        """Section names in a dependency-respecting order (raises on bad graphs)."""
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f'dependency cycle: {" -> ".join(path + [name])}')
+            state[name] = 'visiting'
+            for dep in self._sections[name][1]:
+                if dep not in self._sections:
+                    raise ValueError(f'section {name!r} depends on unknown section {dep!r}')
+                visit(dep, path + [name])
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self._sections:
+            visit(name, [])
+        return order
+
+    def _cursor(self):
+        cur = self.con.cursor()
+        for name, frame in self.tables.items():
+            cur.register(name, frame)
+        return cur
+
+    def run(self):
+        """Run every section; returns {name: result}.
+
+        The first section to fail re-raises its exception once the running
+        sections have finished; sections not yet started are skipped.
+        """
+        order = self._order()
+        self._timings = []
+        results = {}
+        cursors = queue.SimpleQueue()
+        n_cursors = min(self.workers, len(order))
+        for _ in range(n_cursors):
+            cursors.put(self._cursor())
+        start = time.perf_counter()
+
+        def run_section(name):
+            func, deps = self._sections[name]
+            cur = cursors.get()
+            began = time.perf_counter()
+            try:
+                return func(cur, **{d: results[d] for d in deps})
+            finally:
+                self._timings.append({'name': name, 'start': began - start,
+                                      'seconds': time.perf_counter() - began})
+                cursors.put(cur)
+
+        try:
+            with ThreadPoolExecutor(max_workers=n_cursors or 1, thread_name_prefix='section') as pool:
+                running = {}
+                waiting = list(order)
+                while waiting or running:
+                    ready = [n for n in waiting if all(d in results for d in self._sections[n][1])]
+                    for name in ready:
+                        waiting.remove(name)
+                        running[pool.submit(run_section, name)] = name
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            for other in running:
+                                other.cancel()
+                            raise error
+                        results[name] = future.result()
+        finally:
+            self.wall_seconds = time.perf_counter() - start
+            for _ in range(n_cursors):
+                cursors.get().close()
+        return {name: results[name] for name in self._sections}
+
+    def timings(self):
+        """Per-section start offset and duration of the last run (by start time)."""
+        out = pd.DataFrame(self._timings, columns=['name', 'start', 'seconds'])
+        return out.sort_values('start').reset_index(drop=True)
+
+    def describe(self):
+        """One-line summary of the last run: wall time vs serial and longest section."""
+        t = self.timings()
+        if t.empty:
+            return 'no sections run'
+        longest = t.loc[t['seconds'].idxmax()]
+        return (f'{len(t)} sections in {self.wall_seconds:.2f}s on {self.workers} worker(s) '
+                f'(serial {t["seconds"].sum():.2f}s, longest {longest["name"]} {longest["seconds"]:.2f}s)')
@@ -0,0 +1,144 @@
+"""Pitch-sequence transition tensors.
+
+One windowed DuckDB pass tags every pitch with the previous pitch of the
+same plate appearance, using LAG over (game_pk, at_bat_number) ordered by
+pitch_number, and counts (group, count, previous type, type) cells with
+their swings and whiffs. The result is held as dense integer tensors with
+dictionary-encoded axes:
+
+    pitches[group, count, prev, next]    (likewise swings, whiffs)
+
+- group: one entry per distinct ``by`` tuple (e.g. pitcher x period)
+- count: the count_idx column from ``add_count_columns`` (0-0 ... 3-2, 12
+  cells); pitches with an invalid count (-1) are left out
+- prev: index into pitch_types, or the last slot ('START') for the first
+  pitch of a plate appearance. A later pitch whose previous pitch has no
+  pitch_type is left out, since its predecessor is unknown and it is not
+  a first pitch.
+- next: index into pitch_types
+
+Transition matrices and whiff rates conditioned on the previous pitch
+are sums over slices of these arrays, so any pitcher/period/count cut
+needs no further queries.
+"""
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.counts import N_COUNTS, add_count_columns, count_index
+from statcast_tools.sql import IS_SWING, IS_WHIFF
+
+START = 'START'
+
+
+class TransitionTensor:
+    """Dense previous-pitch -> pitch count tensors.
+
+    Build with ``TransitionTensor.from_pitches(con, df, by=('pitcher', 'period'))``.
+    """
+
+    def __init__(self, cells, by):
+        self.by = list(by)
+        group_ids, groups = pd.MultiIndex.from_frame(cells[self.by]).factorize() \
+            if len(self.by) > 1 else pd.factorize(cells[self.by[0]])
+        self.groups = pd.DataFrame(list(groups) if len(self.by) > 1 else {self.by[0]: groups},
+                                   columns=self.by)
+        types = sorted(set(cells['pitch_type'].dropna()) | set(cells['prev_type'].dropna()))
+        self.pitch_types = types
+        type_code = {t: i for i, t in enumerate(types)}
+        # START only for a plate appearance's first pitch; a NULL predecessor
+        # later in the plate appearance is unknown, so the cell is dropped
+        prev = cells['prev_type'].map(type_code).to_numpy(dtype=np.float64, copy=True)
+        prev[cells['is_first'].to_numpy(dtype=bool)] = len(types)
+        known = ~np.isnan(prev)
+        cells, group_ids, prev = cells[known], group_ids[known], prev[known].astype(np.int64)
+        nxt = cells['pitch_type'].map(type_code).to_numpy(dtype=np.int64)
+        cnt = cells['count_idx'].to_numpy(dtype=np.int64)
+
+        shape = (len(self.groups), N_COUNTS, len(types) + 1, len(types))
+        flat = np.ravel_multi_index((group_ids, cnt, prev, nxt), shape)
+        size = int(np.prod(shape))
+        self.pitches, self.swings, self.whiffs = (
+            np.bincount(flat, weights=cells[c].to_numpy(dtype=np.float64), minlength=size)
+            .astype(np.int32).reshape(shape)
+            for c in ('pitches', 'swings', 'whiffs'))
+
+    @classmethod
+    def from_pitches(cls, con, pitches, by=('pitcher', 'period')):
+        """Single windowed pass over raw pitches.
+
+        Uses the pitches' count_idx column (added by ``add_count_columns``
+        at load); it is added to a shallow copy if missing.
+        """
+        by = list(by)
+        keys = ', '.join(by)
+        if 'count_idx' not in pitches.columns:
+            pitches = add_count_columns(pitches.copy(deep=False))
+        con.register('_seq_src', pitches)
+        try:
+            cells = con.execute(f"""
+                WITH seq AS (
+                    SELECT
+                        {keys},
+                        pitch_type,
+                        count_idx,
+                        LAG(pitch_type) OVER(
+                            PARTITION BY game_pk, at_bat_number ORDER BY pitch_number
+                        ) as prev_type,
+                        ROW_NUMBER() OVER(
+                            PARTITION BY game_pk, at_bat_number ORDER BY pitch_number
+                        ) = 1 as is_first,
+                        {IS_SWING} as is_swing,
+                        {IS_WHIFF} as is_whiff
+                    FROM _seq_src
+                )
+                SELECT {keys}, count_idx, prev_type, is_first, pitch_type,
+                       COUNT(*) as pitches,
+                       SUM(is_swing) as swings,
+                       SUM(is_whiff) as whiffs
+                FROM seq
+                -- filter after the window, so a dropped pitch cannot shift prev_type / is_first
+                WHERE pitch_type IS NOT NULL AND count_idx >= 0
+                GROUP BY ALL
+            """).df()
+        finally:
+            con.unregister('_seq_src')
+        return cls(cells, by)
+
+    def _slice(self, counts=None, **where):
+        """Sum over the selected groups and counts -> (prev, next) arrays."""
+        mask = np.ones(len(self.groups), dtype=bool)
+        for col, value in where.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask &= self.groups[col].isin(values).to_numpy()
+        count_mask = np.ones(N_COUNTS, dtype=bool)
+        if counts is not None:
+            count_mask[:] = False
+            count_mask[[count_index(b, s) for b, s in counts]] = True
+        sel = np.ix_(mask, count_mask)
+        return tuple(a[sel].sum(axis=(0, 1)) for a in (self.pitches, self.swings, self.whiffs))
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=pd.Index(self.pitch_types + [START], name='prev'),
+                            columns=pd.Index(self.pitch_types, name='next'))
+
+    def matrix(self, counts=None, normalize=True, **where):
+        """Previous-pitch -> pitch matrix (row shares by default).
+
+        Args:
+            counts: iterable of (balls, strikes) to keep, e.g. [(0, 2), (1, 2)]
+            normalize: divide each row by its total
+            where: group filters, e.g. period='2025-Post'
+        """
+        pitches, _, _ = self._slice(counts, **where)
+        if normalize:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pitches = pitches / pitches.sum(axis=1, keepdims=True)
+        return self._frame(pitches)
+
+    def whiff_after(self, counts=None, min_swings=1, **where):
+        """Whiff rate (whiffs / swings) of each pitch type given the previous pitch."""
+        _, swings, whiffs = self._slice(counts, **where)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = np.where(swings >= min_swings, whiffs / swings, np.nan)
+        return self._frame(rate)
@@ -0,0 +1,150 @@
+"""Shared-memory dataset: one copy of the pitches for many concurrent analyses.
+
+Each analysis script otherwise loads and holds its own copy of the data,
+so ten reports in parallel hold ten copies. ``publish`` writes the data
+once as an uncompressed Arrow IPC file, ideally on a tmpfs such as
+/dev/shm so it lives in shared memory. ``SharedDataset`` attaches to it
+with ``pyarrow.memory_map``. The Arrow buffers are the mapped pages
+themselves, so every process that attaches shares the same physical
+memory through the OS page cache, and attaching costs no copy and no
+parse.
+
+Queries run in DuckDB directly over the mapped Arrow table. Only what a
+query returns (e.g. one pitcher's regular-season pitches) becomes a
+private pandas DataFrame. A process's own memory therefore follows its
+slice, not the league.
+
+    python -m statcast_tools.shared --store data/statcast --out /dev/shm/statcast.arrow
+
+publishes a PitchStore (optionally limited to some seasons / game types).
+The scripts read from it when SHARED_PATH is set. The file is replaced
+atomically, so attached readers keep their mapping until they re-attach.
+"""
+
+import argparse
+import json
+import os
+
+import duckdb
+
+from statcast_tools.store import PitchStore, filter_clauses
+
+META_KEY = b'statcast_tools.shared'
+
+
+def publish(data, path, key='pitcher'):
+    """Write ``data`` (DataFrame or Arrow table) as a shareable Arrow IPC file.
+
+    The file is uncompressed so it can be memory-mapped without decoding.
+    Rows are sorted by ``key`` so one player's pitches sit in adjacent pages.
+    Returns the number of rows written.
+    """
+    import pyarrow as pa  # optional: only needed for the shared dataset
+    import pyarrow.ipc
+
+    table = data if isinstance(data, pa.Table) else pa.Table.from_pandas(data, preserve_index=False)
+    if key in table.column_names:
+        table = table.sort_by([(key, 'ascending')])
+    meta = dict(table.schema.metadata or {})
+    meta[META_KEY] = json.dumps({'key': key}).encode()
+    table = table.replace_schema_metadata(meta)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f'{path}.tmp{os.getpid()}'
+    with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=1 << 20)
+    os.replace(tmp, path)
+    return table.num_rows
+
+
+def publish_store(store, path, seasons=None, game_types=None):
+    """Publish (part of) a PitchStore as a shared Arrow file."""
+    files = store.files(seasons, game_types)
+    arrow = store.con.execute(f"""
+        SELECT * EXCLUDE ({store.bucket_col}) FROM {store.source_sql(files)}
+    """).arrow() if files else None
+    if arrow is None:
+        raise ValueError(f'no stored pitches in {store.root} for seasons={seasons}, game_types={game_types}')
+    if hasattr(arrow, 'read_all'):  # RecordBatchReader on newer DuckDB
+        arrow = arrow.read_all()
+    return publish(arrow, path, key=store.key)
+
+
+class SharedDataset:
+    """Read-only, zero-copy attachment to a published Arrow file.
+
+    Offers the same ``has`` / ``scan`` lookups as PitchStore, so the
+    scripts can use either as their data source.
+
+    Args:
+        path: file written by ``publish``
+        key: player column that ``players`` filters on; defaults to the
+            published key (any column works: there are no buckets here)
+        con: DuckDB connection to query with (a private one by default)
+    """
+
+    def __init__(self, path, key=None, con=None):
+        import pyarrow as pa  # optional: only needed for the shared dataset
+        import pyarrow.ipc
+
+        self.path = path
+        self._source = pa.memory_map(path, 'r')
+        self.table = pa.ipc.open_file(self._source).read_all()  # views into the mapping
+        meta = json.loads((self.table.schema.metadata or {}).get(META_KEY, b'{}'))
+        self.key = key or meta.get('key', 'pitcher')
+        self.con = con if con is not None else duckdb.connect()
+        self._name = f'_shared_{id(self)}'
+        self.con.register(self._name, self.table)
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def nbytes(self):
+        """Size of the shared buffers (not private to this process)."""
+        return self.table.nbytes
+
+    def where_sql(self, seasons=None, game_types=None, players=None):
+        return ' AND '.join(filter_clauses(self.key, seasons, game_types, players)) or 'true'
+
+    def scan(self, seasons=None, game_types=None, players=None, columns=None):
+        """Matching pitches as a (private) DataFrame."""
+        select = ', '.join(columns) if columns else '*'
+        return self.con.execute(f"""
+            SELECT {select} FROM {self._name}
+            WHERE {self.where_sql(seasons, game_types, players)}
+        """).df()
+
+    def has(self, season, player):
+        """Whether any pitches of ``player`` in ``season`` are published."""
+        return self.con.execute(f"""
+            SELECT COUNT(*) > 0 FROM {self._name}
+            WHERE {self.where_sql([season], None, [player])}
+        """).fetchone()[0]
+
+    def close(self):
+        self.con.unregister(self._name)
+        self.table = None
+        self._source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Publish a PitchStore as a shared-memory Arrow file.')
+    parser.add_argument('--store', required=True, help='PitchStore root')
+    parser.add_argument('--out', default='/dev/shm/statcast.arrow', help='Arrow IPC file (tmpfs for shared memory)')
+    parser.add_argument('--seasons', type=int, nargs='+', default=None)
+    parser.add_argument('--game-types', nargs='+', default=None)
+    args = parser.parse_args(argv)
+    rows = publish_store(PitchStore(args.store), args.out, args.seasons, args.game_types)
+    size = os.path.getsize(args.out) / 2 ** 20
+    print(f'Published {rows:,} pitches to {args.out} ({size:,.0f} MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Nearest-neighbour search over pitch-type arsenal profiles.
+
+One profile per (pitcher, season, pitch_type): mean velocity, spin,
+movement, release point and extension plus usage share. Left-handers are
+mirrored (pfx_x and release_pos_x change sign), so arm-side run means the
+same thing for both hands. Features are z-scored over the whole index.
+
+``ArsenalIndex`` is a brute-force index. Squared distances come from
+``|q|^2 + |x|^2 - 2 q.x``, so a batch of queries is one BLAS matrix
+product. A few thousand pitcher-seasons times ~8 pitch types is small
+enough that this beats building a tree, and "every pitcher against every
+pitcher" runs as chunked matrix products.
+"""
+
+import numpy as np
+import pandas as pd
+
+PROFILE_FEATURES = ('velo', 'spin', 'pfx_x', 'pfx_z', 'release_x', 'release_z',
+                    'extension', 'usage')
+PROFILE_KEYS = ('pitcher', 'season', 'pitch_type')
+
+# Labels that describe the same pitch shape; neighbours are searched within a family
+TYPE_FAMILIES = {
+    'FF': 'FF', 'SI': 'SI', 'FC': 'FC',
+    'SL': 'SL', 'ST': 'SL', 'SV': 'CU', 'CU': 'CU', 'KC': 'CU', 'CS': 'CU',
+    'CH': 'CH', 'FS': 'FS', 'FO': 'FS', 'SC': 'CH', 'KN': 'KN',
+}
+QUERY_CHUNK = 2048  # query rows per matrix product
+
+
+def arsenal_profiles(con, pitches, keys=PROFILE_KEYS, min_pitches=50):
+    """Per-(keys) arsenal profile rows from raw pitches.
+
+    keys must include 'pitcher' and 'pitch_type'; usage is the pitch type's
+    share within the remaining keys (e.g. within the pitcher-season).
+    """
+    keys = list(keys)
+    owner = [k for k in keys if k != 'pitch_type']
+    con.register('_arsenal_src', pitches)
+    try:
+        return con.execute(f"""
+            SELECT
+                {', '.join(keys)},
+                ANY_VALUE(p_throws) as p_throws,
+                COUNT(*) as pitches,
+                COUNT(*) * 1.0 / SUM(COUNT(*)) OVER(PARTITION BY {', '.join(owner)}) as usage,
+                AVG(release_speed) as velo,
+                AVG(release_spin_rate) as spin,
+                AVG(CASE WHEN p_throws = 'L' THEN -pfx_x ELSE pfx_x END) * 12 as pfx_x,
+                AVG(pfx_z) * 12 as pfx_z,
+                AVG(CASE WHEN p_throws = 'L' THEN -release_pos_x ELSE release_pos_x END) as release_x,
+                AVG(release_pos_z) as release_z,
+                AVG(release_extension) as extension
+            FROM _arsenal_src
+            WHERE pitch_type IS NOT NULL
+            GROUP BY {', '.join(keys)}
+            QUALIFY COUNT(*) >= {min_pitches}
+            ORDER BY {', '.join(keys)}
+        """).df()
+    finally:
+        con.unregister('_arsenal_src')
+
+
+class ArsenalIndex:
+    """Brute-force k-NN index over arsenal profiles.
+
+    Args:
+        profiles: rows from ``arsenal_profiles`` (any table with the
+            feature columns and a pitch_type column)
+        features: profile columns used in the distance
+        weights: optional {feature: weight} applied after z-scoring
+        by_family: only match pitch types of the same TYPE_FAMILIES family
+    """
+
+    def __init__(self, profiles, features=PROFILE_FEATURES, weights=None, by_family=True):
+        self.profiles = profiles.reset_index(drop=True)
+        self.features = [f for f in features if f in profiles.columns]
+        X = self.profiles[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        self.mean = np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0)
+        self.std = np.where(std > 0, std, 1.0)
+        w = np.array([(weights or {}).get(f, 1.0) for f in self.features])
+        self.weights = w
+        self._X = self._transform(X)
+        self._norm = (self._X ** 2).sum(axis=1)
+        types = self.profiles['pitch_type'].map(lambda t: TYPE_FAMILIES.get(t, t)) if by_family \
+            else pd.Series('', index=self.profiles.index)
+        self._family, self.families = pd.factorize(types)
+        self.by_family = by_family
+
+    def _transform(self, X):
+        # missing features sit at the mean (contribute nothing to the distance)
+        return np.nan_to_num((X - self.mean) / self.std) * self.weights
+
+    def _family_codes(self, pitch_types):
+        if not self.by_family:
+            return np.zeros(len(pitch_types), dtype=np.int64)
+        fam = pd.Index(self.families).get_indexer(
+            [TYPE_FAMILIES.get(t, t) for t in pitch_types])
+        return fam  # -1 where the family is not in the index
+
+    def _search(self, Q, fam, k, exclude=None):
+        n = len(self._X)
+        k = min(k, n)
+        idx = np.empty((len(Q), k), dtype=np.int64)
+        dist = np.empty((len(Q), k))
+        for lo in range(0, len(Q), QUERY_CHUNK):
+            q = Q[lo:lo + QUERY_CHUNK]
+            d2 = (q ** 2).sum(axis=1)[:, None] + self._norm[None, :] - 2.0 * (q @ self._X.T)
+            d2 = np.maximum(d2, 0)
+            d2[fam[lo:lo + QUERY_CHUNK, None] != self._family[None, :]] = np.inf
+            if exclude is not None:
+                rows = np.arange(len(q))
+                ex = exclude[lo:lo + QUERY_CHUNK]
+                valid = ex >= 0
+                d2[rows[valid], ex[valid]] = np.inf
+            part = np.argpartition(d2, k - 1, axis=1)[:, :k] if k < n else \
+                np.tile(np.arange(n), (len(q), 1))
+            pd2 = np.take_along_axis(d2, part, axis=1)
+            order = np.argsort(pd2, axis=1, kind='stable')
+            idx[lo:lo + len(q)] = np.take_along_axis(part, order, axis=1)
+            dist[lo:lo + len(q)] = np.sqrt(np.take_along_axis(pd2, order, axis=1))
+        return idx, dist
+
+    def _result(self, query_ids, idx, dist):
+        found = np.isfinite(dist)
+        q = np.repeat(query_ids, idx.shape[1])[found.ravel()]
+        out = self.profiles.iloc[idx[found]].reset_index(drop=True)
+        out.insert(0, 'rank', np.tile(np.arange(1, idx.shape[1] + 1), len(idx))[found.ravel()])
+        out.insert(0, 'query', q)
+        out['distance'] = dist[found]
+        return out
+
+    def query(self, profiles, k=10):
+        """Neighbours of external profile rows (same columns as the index).
+
+        Returns a long DataFrame: query (row position in ``profiles``),
+        rank, the neighbour's profile columns and distance.
+        """
+        X = profiles[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        fam = self._family_codes(profiles['pitch_type'].tolist())
+        idx, dist = self._search(self._transform(X), fam, k)
+        return self._result(np.arange(len(profiles)), idx, dist)
+
+    def neighbors(self, rows=None, k=10):
+        """Neighbours of indexed rows (all rows by default), excluding the row itself.
+
+        Neighbours from the same pitcher are kept; filter on the result if
+        only other pitchers are wanted.
+        """
+        rows = np.arange(len(self._X)) if rows is None else np.asarray(rows)
+        idx, dist = self._search(self._X[rows], self._family[rows], k, exclude=rows)
+        return self._result(rows, idx, dist)
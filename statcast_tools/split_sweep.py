@@ -0,0 +1,80 @@
+"""Split-date sensitivity sweep.
+
+Every pre/post comparison hinges on one hand-picked boundary. ``split_sweep``
+evaluates the comparison for every candidate date at once. The per-pitch
+numerators and denominators (whiffs, swings, xwOBA, fastball velocity,
+pitch-type counts) are summed per game date, and cumulative sums over the
+sorted dates give the "before" totals for every split. The "after" totals
+are the grand total minus the before totals. Scanning 180 candidate dates
+therefore costs one cumsum plus one ``searchsorted``, about the same as
+evaluating a single split.
+"""
+
+import numpy as np
+import pandas as pd
+
+from statcast_tools.bootstrap import rate_columns
+
+
+def split_sweep(df, candidates=None, velo_types=('FF',), min_pitches=100, date_col='game_date'):
+    """Pre/post metrics for every candidate split date.
+
+    Args:
+        df: raw pitches, usually one season
+        candidates: split dates (pitches on a split date count as "post");
+            defaults to every game date in ``df``
+        velo_types: pitch types averaged for the velocity metric
+        min_pitches: drop splits leaving fewer pitches on either side
+        date_col: game date column
+
+    Returns:
+        DataFrame, one row per split_date: pre/post pitches, whiff_rate,
+        xwOBA and velo with their deltas (post - pre), mix_shift (total
+        variation distance between the pitch mixes, 0-1) and one
+        ``<pitch_type>_usage_delta`` column per pitch type.
+    """
+    frame, _ = rate_columns(df)
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    is_velo = df['pitch_type'].isin(velo_types) & df['release_speed'].notna()
+    frame['velo_sum'] = df['release_speed'].where(is_velo, 0.0).astype(np.float64)
+    frame['velo_n'] = is_velo.astype(np.float64)
+    frame['pitches'] = 1.0
+    mix = pd.get_dummies(df['pitch_type'], dtype=np.float64)
+    mix = mix[mix.sum().sort_values(ascending=False).index]
+
+    # one row per game date, then prefix sums
+    daily = pd.concat([frame, mix], axis=1).groupby(dates.to_numpy()).sum().sort_index()
+    day_index = daily.index.to_numpy()
+    before = np.vstack([np.zeros(daily.shape[1]), np.cumsum(daily.to_numpy(), axis=0)])
+    col = {c: i for i, c in enumerate(daily.columns)}
+
+    if candidates is None:
+        candidates = day_index
+    split = pd.to_datetime(pd.Index(candidates)).normalize().to_numpy()
+    pre = before[np.searchsorted(day_index, split, side='left')]
+    post = before[-1] - pre
+
+    def ratio(side, num, den):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return side[:, col[num]] / side[:, col[den]]
+
+    out = pd.DataFrame({'split_date': split,
+                        'pre_pitches': pre[:, col['pitches']].astype(int),
+                        'post_pitches': post[:, col['pitches']].astype(int)})
+    for name, num, den in (('whiff_rate', 'whiffs', 'swings'),
+                           ('xwOBA', 'xwoba_sum', 'batted'),
+                           ('velo', 'velo_sum', 'velo_n')):
+        out[f'pre_{name}'] = ratio(pre, num, den)
+        out[f'post_{name}'] = ratio(post, num, den)
+        out[f'{name}_delta'] = out[f'post_{name}'] - out[f'pre_{name}']
+
+    mix_idx = [col[c] for c in mix.columns]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pre_mix = pre[:, mix_idx] / pre[:, [col['pitches']]]
+        post_mix = post[:, mix_idx] / post[:, [col['pitches']]]
+    out['mix_shift'] = 0.5 * np.abs(post_mix - pre_mix).sum(axis=1)
+    for j, pt in enumerate(mix.columns):
+        out[f'{pt}_usage_delta'] = post_mix[:, j] - pre_mix[:, j]
+
+    keep = (out['pre_pitches'] >= min_pitches) & (out['post_pitches'] >= min_pitches)
+    return out[keep].reset_index(drop=True)
@@ -0,0 +1,16 @@
+"""SQL fragments shared by the DuckDB queries in the analysis scripts."""
+
+WHIFF_DESCRIPTIONS = ('swinging_strike', 'swinging_strike_blocked')
+SWING_DESCRIPTIONS = WHIFF_DESCRIPTIONS + (
+    'foul', 'foul_tip', 'foul_bunt',
+    'hit_into_play', 'hit_into_play_no_out', 'hit_into_play_score',
+)
+
+
+def _in_list(values):
+    return ', '.join(f"'{v}'" for v in values)
+
+
+# 1/0 indicators, usable inside SUM(...) in any query over raw pitches
+IS_WHIFF = f"CASE WHEN description IN ({_in_list(WHIFF_DESCRIPTIONS)}) THEN 1 ELSE 0 END"
+IS_SWING = f"CASE WHEN description IN ({_in_list(SWING_DESCRIPTIONS)}) THEN 1 ELSE 0 END"
@@ -0,0 +1,206 @@
+"""Hive-partitioned local Statcast store with partition pruning.
+
+Fetched pitches are written once as zstd-compressed Parquet laid out as
+
+    <root>/season=2024/game_type=R/pitcher_bucket=7/part_<uuid>.parquet
+
+where the bucket is ``player_id % buckets``. A "regular season, 2024-2025,
+pitcher X" scan only lists the matching partition directories, so it
+opens 2 files out of ~100 per season and never touches postseason or
+spring training rows. Queries written against the whole store
+(``source_sql()`` plus ``where_sql()``) get the same pruning from
+DuckDB's hive-partition filters (EXPLAIN ANALYZE shows "Scanning Files:
+2/130"). That path still has to read every file's schema first, so it is
+slower per lookup.
+
+Inside each file DuckDB's Parquet writer dictionary-encodes columns by
+default, which keeps the repetitive text columns (pitch_type,
+description, events, stand) small. Partition columns are stored in the
+path, not in the files.
+
+Rows are written sorted by (player, game_date) in row groups of
+``ROW_GROUP_SIZE`` rows. Parquet keeps min/max statistics per row group
+(zone maps), and a ``pitcher IN (...)`` filter is checked against them,
+so a one-player scan decodes only the one or two row groups holding that
+player instead of the whole bucket file. Appends add new sorted files.
+``compact()`` rewrites the store as one sorted file per partition once
+many small appends have accumulated. After that, per-player scan time
+stays flat as the league-wide store grows (see bench/player_scan.py).
+
+A store is keyed by one player column (``pitcher`` for the pitcher
+scripts, ``batter`` for batter/league stores); the key and the bucket
+count are recorded in ``<root>/_store.json`` so readers and writers
+agree. New fetches are appended as new files (nothing is rewritten).
+"""
+
+import glob
+import json
+import os
+import shutil
+
+import duckdb
+import pandas as pd
+
+STORE_META = '_store.json'
+DEFAULT_BUCKETS = 32
+ROW_GROUP_SIZE = 16_384  # rows per Parquet row group: the unit skipped by the min/max stats
+PARTITIONS = ('season', 'game_type')
+
+
+def _sql_list(values):
+    return ', '.join(f"'{v}'" if isinstance(v, str) else str(int(v)) for v in values)
+
+
+def filter_clauses(key, seasons=None, game_types=None, players=None):
+    """SQL conditions for the season / game type / player filters (None = no filter)."""
+    clauses = []
+    if seasons is not None:
+        clauses.append(f'season IN ({_sql_list(seasons)})')
+    if game_types is not None:
+        clauses.append(f'game_type IN ({_sql_list(game_types)})')
+    if players is not None:
+        clauses.append(f'{key} IN ({_sql_list(players)})')
+    return clauses
+
+
+class PitchStore:
+    """Local Statcast store under ``root``.
+
+    Args:
+        root: store directory (created on first write)
+        key: player column used for the bucket partition ('pitcher' or 'batter');
+            an existing store's key wins
+        buckets: number of player buckets for a new store
+        con: DuckDB connection to use (a private one by default)
+    """
+
+    def __init__(self, root, key='pitcher', buckets=DEFAULT_BUCKETS, con=None):
+        self.root = root
+        self.con = con if con is not None else duckdb.connect()
+        meta_path = os.path.join(root, STORE_META)
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding='utf-8') as fh:
+                meta = json.load(fh)
+            key, buckets = meta['key'], meta['buckets']
+        self.key = key
+        self.buckets = int(buckets)
+        self.bucket_col = f'{key}_bucket'
+
+    def _write_meta(self):
+        os.makedirs(self.root, exist_ok=True)
+        meta_path = os.path.join(self.root, STORE_META)
+        if not os.path.exists(meta_path):
+            with open(meta_path, 'w', encoding='utf-8') as fh:
+                json.dump({'key': self.key, 'buckets': self.buckets,
+                           'partitions': list(PARTITIONS) + [self.bucket_col]}, fh)
+
+    def write(self, pitches):
+        """Append raw pitches (a pybaseball frame) to the store.
+
+        ``season`` is taken from the frame if present, otherwise from
+        game_date. Returns the number of rows written.
+        """
+        if len(pitches) == 0:
+            return 0
+        self._write_meta()
+        season = 'season' if 'season' in pitches.columns else 'year(CAST(game_date AS DATE))'
+        columns = ', '.join(f'"{c}"' for c in pitches.columns if c not in ('season', self.bucket_col))
+        self.con.register('_store_src', pitches)
+        try:
+            self._copy(f"""
+                SELECT {columns},
+                    {season} as season,
+                    {self.key} % {self.buckets} as {self.bucket_col}
+                FROM _store_src
+            """, self.root, append=True)
+        finally:
+            self.con.unregister('_store_src')
+        return len(pitches)
+
+    def _copy(self, select, target, append):
+        # sorted by player then date inside every partition file, so each
+        # row group covers a narrow player range
+        self.con.execute(f"""
+            COPY (
+                {select}
+                ORDER BY season, game_type, {self.bucket_col}, {self.key}, game_date
+            ) TO '{target}' (
+                FORMAT parquet,
+                PARTITION_BY (season, game_type, {self.bucket_col}),
+                COMPRESSION zstd,
+                ROW_GROUP_SIZE {ROW_GROUP_SIZE},
+                {'APPEND,' if append else ''}
+                FILENAME_PATTERN 'part_{{uuid}}'
+            )
+        """)
+
+    def compact(self):
+        """Rewrite the store as one sorted file per partition (merges appended files)."""
+        if not self.files():
+            return
+        staging = self.root.rstrip('/\\') + '.compact'
+        previous = self.root.rstrip('/\\') + '.previous'
+        shutil.rmtree(staging, ignore_errors=True)
+        self._copy(f'SELECT * FROM {self.source_sql()}', staging, append=False)
+        shutil.copy(os.path.join(self.root, STORE_META), os.path.join(staging, STORE_META))
+        os.rename(self.root, previous)
+        os.rename(staging, self.root)
+        shutil.rmtree(previous)
+
+    def files(self, seasons=None, game_types=None, players=None):
+        """Parquet files of the partitions matching the filters."""
+        def level(name, values):
+            return [f'{name}={v}' for v in values] if values is not None else ['*']
+
+        buckets = None if players is None else sorted({int(p) % self.buckets for p in players})
+        paths = []
+        for s in level('season', seasons):
+            for g in level('game_type', game_types):
+                for b in level(self.bucket_col, buckets):
+                    paths.extend(glob.glob(os.path.join(self.root, s, g, b, '*.parquet')))
+        return sorted(paths)
+
+    def where_sql(self, seasons=None, game_types=None, players=None):
+        """WHERE clause over the partition columns (plus the player filter)."""
+        if players is not None:
+            players = [int(p) for p in players]
+        clauses = filter_clauses(self.key, seasons, game_types, players)
+        if players is not None:
+            clauses.append(f'{self.bucket_col} IN ({_sql_list(sorted({p % self.buckets for p in players}))})')
+        return ' AND '.join(clauses) or 'true'
+
+    def source_sql(self, files=None):
+        """``read_parquet`` call for a FROM clause, over ``files`` or the whole store."""
+        source = (repr(files) if files is not None
+                  else f"'{os.path.join(self.root, '*', '*', '*', '*.parquet')}'")
+        return (f"read_parquet({source}, hive_partitioning = true, union_by_name = true, "
+                f"hive_types = {{'season': INTEGER, 'game_type': VARCHAR, '{self.bucket_col}': INTEGER}})")
+
+    def scan(self, seasons=None, game_types=None, players=None, columns=None):
+        """Pitches matching the filters as a DataFrame (only matching files are read).
+
+        Args:
+            seasons: e.g. [2024, 2025]; None = all
+            game_types: e.g. ['R']; None = all
+            players: ids of the store key column, e.g. [673540]; None = all
+            columns: columns to return; None = all (without the bucket column)
+        """
+        files = self.files(seasons, game_types, players)
+        if not files:
+            return pd.DataFrame()
+        select = ', '.join(columns) if columns else f'* EXCLUDE ({self.bucket_col})'
+        return self.con.execute(f"""
+            SELECT {select}
+            FROM {self.source_sql(files)}
+            WHERE {self.where_sql(seasons, game_types, players)}
+        """).df()
+
+    def has(self, season, player):
+        """Whether any pitches of ``player`` in ``season`` are stored."""
+        files = self.files([int(season)], None, [player])
+        if not files:
+            return False
+        return self.con.execute(f"""
+            SELECT COUNT(*) > 0 FROM {self.source_sql(files)}
+            WHERE {self.where_sql([season], None, [player])}
+        """).fetchone()[0]
@@ -0,0 +1,88 @@
+"""Pitch trajectory reconstruction and tunneling metrics.
+
+Statcast publishes a constant-acceleration fit of every pitch: velocity
+(vx0, vy0, vz0) and acceleration (ax, ay, az) at y = 50 ft, where y is the
+distance from the back tip of home plate. Solving y(t) for t gives the
+time at any distance, and x(t), z(t) follow; the lateral/vertical offsets
+are anchored on the measured plate location (plate_x, plate_z) at the
+front of the plate. Everything is plain array arithmetic, so millions of
+pitches reconstruct without Python loops.
+
+Tunneling (consecutive pitches of the same plate appearance):
+
+- tunnel_dist: separation of the two pitches at the commit point
+- plate_sep: separation at the plate
+- release_dist: separation of the release points
+
+A good tunnel pairs a small tunnel_dist with a large plate_sep.
+"""
+
+import numpy as np
+import pandas as pd
+
+Y0 = 50.0                # ft, reference distance of the Statcast fit
+PLATE_Y = 17.0 / 12.0    # ft, front of home plate (where plate_x/z are measured)
+COMMIT_Y = 23.8          # ft, approximate batter commit point
+
+KINEMATIC_COLUMNS = ('vx0', 'vy0', 'vz0', 'ax', 'ay', 'az', 'plate_x', 'plate_z')
+
+
+def time_at_y(vy0, ay, y):
+    """Flight time from y = Y0 to distance ``y`` (negative for y > Y0)."""
+    vy0 = np.asarray(vy0, dtype=np.float64)
+    ay = np.asarray(ay, dtype=np.float64)
+    disc = np.sqrt(np.maximum(vy0 ** 2 - 2 * ay * (Y0 - y), 0))
+    # vy0 < 0 (towards the plate): take the root reached first
+    return (-vy0 - disc) / ay
+
+
+def position_at(pitches, y):
+    """(x, z) of every pitch when it crosses distance ``y`` (feet).
+
+    Args:
+        pitches: DataFrame (or mapping of arrays) with KINEMATIC_COLUMNS
+        y: distance from the back of home plate, scalar or per-pitch array
+    """
+    col = {c: np.asarray(pitches[c], dtype=np.float64) for c in KINEMATIC_COLUMNS}
+    t_plate = time_at_y(col['vy0'], col['ay'], PLATE_Y)
+    t = time_at_y(col['vy0'], col['ay'], y)
+    x = col['plate_x'] + col['vx0'] * (t - t_plate) + 0.5 * col['ax'] * (t ** 2 - t_plate ** 2)
+    z = col['plate_z'] + col['vz0'] * (t - t_plate) + 0.5 * col['az'] * (t ** 2 - t_plate ** 2)
+    return x, z
+
+
+def tunnel_pairs(pitches, commit_y=COMMIT_Y):
+    """Tunneling metrics for every consecutive pitch pair within a plate appearance.
+
+    Args:
+        pitches: raw pitches with KINEMATIC_COLUMNS, release_pos_x/z,
+            game_pk, at_bat_number, pitch_number and pitch_type
+        commit_y: distance of the commit point from the plate (feet)
+
+    Returns:
+        DataFrame indexed like the second pitch of each pair with
+        prev_pitch_type, pitch_type and tunnel_dist / plate_sep /
+        release_dist in inches.
+    """
+    seq = pitches.sort_values(['game_pk', 'at_bat_number', 'pitch_number'])
+    cx, cz = position_at(seq, commit_y)
+    px = seq['plate_x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    pz = seq['plate_z'].to_numpy(dtype=np.float64, na_value=np.nan)
+    rx = seq['release_pos_x'].to_numpy(dtype=np.float64, na_value=np.nan)
+    rz = seq['release_pos_z'].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    game = seq['game_pk'].to_numpy()
+    ab = seq['at_bat_number'].to_numpy()
+    same_pa = (game[1:] == game[:-1]) & (ab[1:] == ab[:-1])
+    cur = np.flatnonzero(same_pa) + 1
+    prev = cur - 1
+
+    pitch_type = seq['pitch_type'].to_numpy()
+    out = pd.DataFrame({
+        'prev_pitch_type': pitch_type[prev],
+        'pitch_type': pitch_type[cur],
+        'tunnel_dist': 12 * np.hypot(cx[cur] - cx[prev], cz[cur] - cz[prev]),
+        'plate_sep': 12 * np.hypot(px[cur] - px[prev], pz[cur] - pz[prev]),
+        'release_dist': 12 * np.hypot(rx[cur] - rx[prev], rz[cur] - rz[prev]),
+    }, index=seq.index[cur])
+    return out.dropna(subset=['tunnel_dist', 'plate_sep'])